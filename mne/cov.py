@@ -474,7 +474,9 @@ def compute_raw_covariance(raw, tmin=0, tmax=None, tstep=0.2, reject=None,
         mu = 0
         # Read data in chunks
         for raw_segment in epochs:
-            raw_segment = raw_segment[pick_mask]
+            # accumulate in double precision even for single precision data
+            raw_segment = raw_segment[pick_mask].astype(np.float64,
+                                                         copy=False)
             mu += raw_segment.sum(axis=1)
             data += np.dot(raw_segment, raw_segment.T)
             n_samples += raw_segment.shape[1]
@@ -780,7 +782,7 @@ def compute_covariance(epochs, keep_sample_mean=True, tmin=None, tmax=None,
 
             tslice = _get_tslice(epochs_t, tmin, tmax)
             for e in epochs_t:
-                e = e[picks_meeg, tslice]
+                e = e[picks_meeg, tslice].astype(np.float64, copy=False)
                 if not keep_sample_mean:
                     data_mean[ii] += e
                 n_samples[ii] += e.shape[1]
@@ -805,7 +807,8 @@ def compute_covariance(epochs, keep_sample_mean=True, tmin=None, tmax=None,
     else:
         epochs = epochs[0]
 
-    epochs = np.hstack(epochs)
+    # compute in double precision even for single precision data
+    epochs = np.hstack(epochs).astype(np.float64, copy=False)
     n_samples_tot = epochs.shape[-1]
     _check_n_samples(n_samples_tot, len(picks_meeg))
 
@@ -2,8 +2,10 @@
 #
 # License: BSD (3-clause)
 
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
-from scipy.fftpack import fft, ifft, rfft, irfft
 
 from .utils import sizeof_fmt, logger, get_config, warn
 
@@ -198,7 +200,7 @@ def fft_multiply_repeated(h_fft, x, cuda_dict=dict(use_cuda=False)):
     """
     if not cuda_dict['use_cuda']:
         # do the fourier-domain operations
-        x = np.real(ifft(h_fft * fft(x), overwrite_x=True)).ravel()
+        x = np.real(_ifft(h_fft * _fft(x))).ravel()
     else:
         cudafft = _get_cudafft()
         # do the fourier-domain operations, results in second param
@@ -336,15 +338,17 @@ def fft_resample(x, W, new_len, npads, to_removes,
         # sl_2 = slice(-(N - 1) // 2, None)
         # y_fft[sl_2] = x_fft[sl_2]
         # y = np.real(ifft(y_fft, overwrite_x=True)).ravel()
-        x_fft = rfft(x).ravel()
-        x_fft *= W[np.arange(1, len(x) + 1) // 2].real
-        y_fft = np.zeros(new_len, np.float64)
-        sl_1 = slice(N)
+        x_fft = _rfft(x).ravel()
+        x_fft *= W[:len(x_fft)].real
+        y_fft = np.zeros(new_len // 2 + 1, np.complex128)
+        sl_1 = slice((N + 1) // 2)
         y_fft[sl_1] = x_fft[sl_1]
-        if min(new_len, old_len) % 2 == 0:
+        if N % 2 == 0:
+            # only the real part of the Nyquist component is kept
+            y_fft[N // 2] = x_fft[N // 2].real
             if new_len > old_len:
-                y_fft[N - 1] /= 2.
-        y = irfft(y_fft, overwrite_x=True).ravel()
+                y_fft[N // 2] /= 2.
+        y = _irfft(y_fft, new_len).ravel()
     else:
         cudafft = _get_cudafft()
         cuda_dict['x'].set(np.concatenate((x, np.zeros(max(new_len - old_len,
@@ -376,6 +380,176 @@ def fft_resample(x, W, new_len, npads, to_removes,
     return y
 
 
+###############################################################################
+# CPU FFT backends
+
+_fft_backend = None
+
+
+def _get_fft_funcs(backend, workers):
+    """Helper to get the transforms of a backend and their extra arguments"""
+    names = ('fft', 'ifft', 'rfft', 'irfft')
+    if backend == 'numpy':
+        module, kwargs = np.fft, dict()
+    elif backend == 'scipy':
+        try:
+            import scipy.fft as module
+        except ImportError:  # scipy < 1.4, fftpack is not multithreaded
+            from scipy import fftpack
+            return dict(fft=fftpack.fft, ifft=fftpack.ifft,
+                        rfft=np.fft.rfft, irfft=np.fft.irfft), dict()
+        kwargs = dict(workers=workers)
+    else:
+        try:
+            from pyfftw.interfaces import numpy_fft as module
+        except ImportError:
+            raise ImportError('pyfftw is required to use the "pyfftw" FFT '
+                              'backend')
+        kwargs = dict(threads=workers)
+    return dict((name, getattr(module, name)) for name in names), kwargs
+
+
+def set_fft_backend(backend='scipy', workers=1, plan_cache=False):
+    """Set the backend used to compute FFTs on the CPU
+
+    The FFTs used for FIR filtering, resampling, Morlet wavelet and
+    multitaper time-frequency transforms, multitaper PSDs, Stockwell
+    transforms and short-time Fourier transforms are computed by this
+    backend, unless CUDA is used (``n_jobs='cuda'``). The backend used
+    before this function is called is read from the ``MNE_FFT_BACKEND``
+    and ``MNE_FFT_WORKERS`` config values (see :func:`mne.set_config`),
+    by default SciPy with one worker.
+
+    Parameters
+    ----------
+    backend : str
+        The FFT implementation, can be ``'numpy'`` (:mod:`numpy.fft`),
+        ``'scipy'`` (:mod:`scipy.fft` if available, :mod:`scipy.fftpack`
+        otherwise) or ``'pyfftw'`` (requires pyFFTW).
+    workers : int
+        The number of threads used to compute each transform. Negative
+        values count from the number of CPU cores, like ``n_jobs``.
+        With backends that are not multithreaded themselves, the signals
+        transformed together are split across the threads.
+    plan_cache : bool
+        If True, keep the FFTW plans between calls so that repeated
+        transforms of the same size are planned only once. Only used by
+        the ``'pyfftw'`` backend.
+
+    See Also
+    --------
+    get_fft_backend
+
+    Notes
+    -----
+    .. versionadded:: 0.13
+    """
+    global _fft_backend
+    if backend not in ('numpy', 'scipy', 'pyfftw'):
+        raise ValueError('backend must be "numpy", "scipy" or "pyfftw", got '
+                         '%r' % (backend,))
+    if not isinstance(workers, (int, np.integer)):
+        raise ValueError('workers must be an integer, got %r' % (workers,))
+    workers = int(workers)
+    if workers < 0:
+        workers += cpu_count() + 1  # e.g., -1 uses all cores
+    if workers < 1:
+        raise ValueError('workers must be positive, or negative to count '
+                         'from the number of CPU cores (%s)' % cpu_count())
+    funcs, kwargs = _get_fft_funcs(backend, workers)
+    if backend == 'pyfftw':
+        from pyfftw.interfaces import cache
+        if plan_cache:
+            cache.enable()
+        else:
+            cache.disable()
+    # backends that are not multithreaded share a pool of threads
+    pool = None
+    if workers > 1 and len(kwargs) == 0:
+        pool = ThreadPool(workers)
+    if _fft_backend is not None and _fft_backend['pool'] is not None:
+        _fft_backend['pool'].close()
+    _fft_backend = dict(backend=backend, workers=workers,
+                        plan_cache=bool(plan_cache), funcs=funcs,
+                        kwargs=kwargs, pool=pool)
+    logger.debug('Using the %s FFT backend with %d worker%s'
+                 % (backend, workers, '' if workers == 1 else 's'))
+
+
+def get_fft_backend():
+    """Get the backend used to compute FFTs on the CPU
+
+    Returns
+    -------
+    backend : dict
+        The ``backend`` name, the number of ``workers`` and whether
+        ``plan_cache`` is enabled, as passed to :func:`set_fft_backend`.
+
+    See Also
+    --------
+    set_fft_backend
+
+    Notes
+    -----
+    .. versionadded:: 0.13
+    """
+    backend = _get_fft_backend()
+    return dict((key, backend[key])
+                for key in ('backend', 'workers', 'plan_cache'))
+
+
+def _get_fft_backend():
+    """Helper to get the FFT backend, set from the config on first use"""
+    if _fft_backend is None:
+        set_fft_backend(get_config('MNE_FFT_BACKEND', 'scipy'),
+                        int(get_config('MNE_FFT_WORKERS', '1')))
+    return _fft_backend
+
+
+def _fft_apply(name, x, n, axis):
+    """Helper to compute a transform with the current backend"""
+    backend = _get_fft_backend()
+    func, pool = backend['funcs'][name], backend['pool']
+    x = np.asarray(x)
+    axis = axis % x.ndim
+    others = [ii for ii in range(x.ndim) if ii != axis]
+    if pool is None or len(others) == 0 or x.shape[others[0]] < 2:
+        return func(x, n=n, axis=axis, **backend['kwargs'])
+    # transform groups of signals in the threads
+    split = others[0]
+    n_groups = min(backend['workers'], x.shape[split])
+    bounds = np.linspace(0, x.shape[split], n_groups + 1).astype(int)
+
+    def _transform(start, stop):
+        sl = [slice(None)] * x.ndim
+        sl[split] = slice(start, stop)
+        return func(x[tuple(sl)], n=n, axis=axis)
+
+    out = pool.map(lambda ii: _transform(bounds[ii], bounds[ii + 1]),
+                   range(n_groups))
+    return np.concatenate(out, axis=split)
+
+
+def _fft(x, n=None, axis=-1):
+    """Compute the FFT with the current backend"""
+    return _fft_apply('fft', x, n, axis)
+
+
+def _ifft(x, n=None, axis=-1):
+    """Compute the inverse FFT with the current backend"""
+    return _fft_apply('ifft', x, n, axis)
+
+
+def _rfft(x, n=None, axis=-1):
+    """Compute the FFT of a real signal (half spectrum) with the backend"""
+    return _fft_apply('rfft', x, n, axis)
+
+
+def _irfft(x, n=None, axis=-1):
+    """Compute the inverse of _rfft with the current backend"""
+    return _fft_apply('irfft', x, n, axis)
+
+
 ###############################################################################
 # Misc
 
@@ -12,7 +12,9 @@
 
 from copy import deepcopy
 import json
+import os
 import os.path as op
+import tempfile
 from distutils.version import LooseVersion
 
 import numpy as np
@@ -22,7 +24,7 @@ from .io.write import (start_file, start_block, end_file, end_block,
                        write_int, write_float_matrix, write_float,
                        write_id, write_string, _get_split_size)
 from .io.meas_info import read_meas_info, write_meas_info, _merge_info
-from .io.open import fiff_open, _get_next_fname
+from .io.open import fiff_open, _get_next_fname, _fiff_get_fid
 from .io.tree import dir_tree_find
 from .io.tag import read_tag, read_tag_info
 from .io.constants import FIFF
@@ -31,6 +33,7 @@ from .io.pick import (pick_types, channel_indices_by_type, channel_type,
                       _pick_aux_channels, _DATA_CH_TYPES_SPLIT)
 from .io.proj import setup_proj, ProjMixin, _proj_equal
 from .io.base import _BaseRaw, ToDataFrameMixin, TimeMixin
+from .io.utils import _SegmentedArray
 from .bem import _check_origin
 from .evoked import EvokedArray, _check_decim
 from .baseline import rescale, _log_rescale
@@ -38,12 +41,15 @@ from .channels.channels import (ContainsMixin, UpdateChannelsMixin,
                                 SetChannelsMixin, InterpolationMixin)
 from .filter import resample, detrend, FilterMixin
 from .event import _read_events_fif, make_fixed_length_events
+from .annotations import _onset_to_seconds
 from .fixes import in1d, _get_args
+from .parallel import parallel_func, check_n_jobs
 from .viz import (plot_epochs, plot_epochs_psd, plot_epochs_psd_topomap,
                   plot_epochs_image, plot_topo_image_epochs)
 from .utils import (check_fname, logger, verbose, _check_type_picks,
                     _time_mask, check_random_state, warn, _check_copy_dep,
-                    sizeof_fmt, SizeMixin)
+                    sizeof_fmt, SizeMixin, _check_float_dtype,
+                    _match_precision, get_config)
 from .externals.six import iteritems, string_types
 from .externals.six.moves import zip
 
@@ -153,10 +159,11 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                  decim=1, reject_tmin=None, reject_tmax=None, detrend=None,
                  add_eeg_ref=True, proj=True, on_missing='error',
                  preload_at_end=False, selection=None, drop_log=None,
-                 verbose=None):
+                 dtype=None, verbose=None):
 
         self.verbose = verbose
         self.name = name
+        self._dtype = _check_float_dtype(dtype)
 
         if on_missing not in ['error', 'warning', 'ignore']:
             raise ValueError('on_missing must be one of: error, '
@@ -313,9 +320,19 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             for ii, epoch in enumerate(self._data):
                 self._data[ii] = np.dot(self._projector, epoch)
 
-    def load_data(self):
+    def load_data(self, n_jobs=1):
         """Load the data if not already preloaded
 
+        Parameters
+        ----------
+        n_jobs : int
+            The number of jobs to read (and process) the epochs from disk
+            in parallel. Each job reads a consecutive block of the epochs.
+            The epochs are read in rounds of about 100 MB, which are kept in
+            memory in addition to the data until they are copied.
+
+            .. versionadded:: 0.13
+
         Returns
         -------
         epochs : instance of Epochs
@@ -327,9 +344,14 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
         .. versionadded:: 0.10.0
         """
+        return self._preload_data(True, n_jobs)
+
+    def _preload_data(self, preload, n_jobs=1):
+        """Helper to load the data in memory or in a memory map (str)"""
         if self.preload:
             return self
-        self._data = self._get_data()
+        data_buffer = preload if isinstance(preload, string_types) else None
+        self._data = self._get_data(n_jobs=n_jobs, data_buffer=data_buffer)
         self.preload = True
         self._decim_slice = slice(None, None, None)
         self._decim = 1
@@ -381,7 +403,9 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         decim_slice = slice(i_start, None, self._decim)
         self.info['sfreq'] = new_sfreq
         if self.preload:
-            self._data = self._data[:, :, decim_slice].copy()
+            self._data = self._data[:, :, decim_slice]
+            if not _is_memmap(self._data):  # memmaps stay on disk
+                self._data = self._data.copy()
             self._raw_times = self._raw_times[decim_slice].copy()
             self._decim_slice = slice(None)
             self._decim = 1
@@ -528,11 +552,63 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                             self.reject, self.flat, full_report=True,
                             ignore_chs=self.info['bads'])
 
+    def _is_good_epochs(self, data):
+        """Determine which epochs of a stack are good
+
+        This gives the same results as ``_is_good_epoch`` for each epoch,
+        but computes the peak-to-peak amplitudes of all epochs at once.
+        """
+        n_epochs = len(data)
+        if self.reject is None and self.flat is None:
+            return [(True, None)] * n_epochs
+        # rejection uses the projected data
+        proj = self._do_delayed_proj and self._projector is not None
+        checkable = ~in1d(self.ch_names, self.info['bads'])
+        bad_lists = [list() for _ in range(n_epochs)]
+        messages = [None] * n_epochs
+        for refl, f, t in zip([self.reject, self.flat], [np.greater, np.less],
+                              ['', 'flat']):
+            if refl is None:
+                continue
+            for key, thresh in iteritems(refl):
+                idx = self._channel_type_idx[key]
+                if len(idx) == 0:
+                    continue
+                deltas = np.empty((n_epochs, len(idx)))
+                # in blocks of epochs to bound the temporary memory
+                for start in range(0, n_epochs, 100):
+                    e_idx = data[start:start + 100]
+                    if proj:
+                        e_idx = np.dot(self._projector[idx],
+                                       e_idx).swapaxes(0, 1)
+                    else:
+                        e_idx = e_idx[:, idx]
+                    if self._reject_time is not None:
+                        e_idx = e_idx[..., self._reject_time]
+                    deltas[start:start + 100] = (np.max(e_idx, axis=-1) -
+                                                 np.min(e_idx, axis=-1))
+                bad = f(deltas, thresh) & checkable[idx]
+                for ei in np.where(bad.any(axis=1))[0]:
+                    ch_name = [self.ch_names[idx[i]]
+                               for i in np.where(bad[ei])[0]]
+                    if messages[ei] is None:
+                        messages[ei] = (t, key.upper(), ch_name)
+                    bad_lists[ei].extend(ch_name)
+        out = list()
+        for message, bad_list in zip(messages, bad_lists):
+            if message is None:
+                out.append((True, None))
+            else:
+                logger.info('    Rejecting %s epoch based on %s : %s'
+                            % message)
+                out.append((False, bad_list))
+        return out
+
     @verbose
     def _detrend_offset_decim(self, epoch, verbose=None):
         """Aux Function: detrend, baseline correct, offset, decim
 
-        Note: operates inplace
+        Note: operates inplace, on one epoch or on a stack of epochs
         """
         if (epoch is None) or isinstance(epoch, string_types):
             return epoch
@@ -540,21 +616,23 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         # Detrend
         if self.detrend is not None:
             picks = _pick_data_channels(self.info, exclude=[])
-            epoch[picks] = detrend(epoch[picks], self.detrend, axis=1)
+            epoch[..., picks, :] = detrend(epoch[..., picks, :],
+                                           self.detrend, axis=-1)
 
         # Baseline correct
         picks = pick_types(self.info, meg=True, eeg=True, stim=False,
                            ref_meg=True, eog=True, ecg=True, seeg=True,
                            emg=True, bio=True, ecog=True, exclude=[])
-        epoch[picks] = rescale(epoch[picks], self._raw_times, self.baseline,
-                               copy=False, verbose=False)
+        epoch[..., picks, :] = rescale(epoch[..., picks, :], self._raw_times,
+                                       self.baseline, copy=False,
+                                       verbose=False)
 
         # handle offset
         if self._offset is not None:
             epoch += self._offset
 
         # Decimate if necessary (i.e., epoch not preloaded)
-        epoch = epoch[:, self._decim_slice]
+        epoch = epoch[..., self._decim_slice]
         return epoch
 
     def iter_evoked(self):
@@ -669,7 +747,8 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         -----
         Computes an average of all epochs in the instance, even if
         they correspond to different conditions. To average by condition,
-        do ``epochs[condition].average()`` for each condition separately.
+        use :meth:`Epochs.average_by` (or ``epochs[condition].average()``
+        for each condition separately).
         """
         return self._compute_mean_or_stderr(picks, 'ave')
 
@@ -689,6 +768,109 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         """
         return self._compute_mean_or_stderr(picks, 'stderr')
 
+    def average_by(self, event_ids='all', with_stderr=False, picks=None):
+        """Compute the average of epochs for each condition at once
+
+        The data are read (or, if preloaded, traversed) only once for all
+        conditions, which is faster than ``epochs[condition].average()``
+        for each condition separately.
+
+        Parameters
+        ----------
+        event_ids : 'all' | str | list of str
+            The conditions to average. With 'all' (default), the epochs of
+            each key of ``epochs.event_id`` are averaged. Conditions tagged
+            by names separated by '/' are matched as in ``epochs[name]``.
+        with_stderr : bool
+            If True, also compute the standard error over epochs of each
+            condition.
+        picks : array-like of int | None
+            If None only MEG, EEG, SEEG, and ECoG channels are kept
+            otherwise the channels indices in picks are kept.
+
+        Returns
+        -------
+        evokeds : dict of Evoked
+            The averaged epochs of each condition.
+        stderrs : dict of Evoked
+            The standard error over epochs of each condition. Only returned
+            if ``with_stderr`` is True.
+
+        Notes
+        -----
+        .. versionadded:: 0.13
+        """
+        if isinstance(event_ids, string_types):
+            event_ids = (sorted(self.event_id.keys()) if event_ids == 'all'
+                         else [event_ids])
+        conditions = dict()
+        for name in event_ids:
+            keys = _hid_match(self.event_id, [name])
+            for key in keys:
+                if key not in self.event_id:
+                    raise KeyError('Event "%s" is not in Epochs.' % key)
+            conditions[name] = [self.event_id[key] for key in keys]
+
+        # the sums are shifted by the first epoch of each condition, which
+        # avoids losing precision when the variance is small
+        sums, sqs, shifts, counts = dict(), dict(), dict(), dict()
+        for name in conditions:
+            counts[name] = 0
+
+        def _accumulate(block, codes):
+            for name, cond_codes in conditions.items():
+                mask = in1d(codes, cond_codes)
+                if not mask.any():
+                    continue
+                data = block[mask]
+                if counts[name] == 0:
+                    acc_dtype = np.promote_types(data.dtype, np.float64)
+                    shifts[name] = data[0].astype(acc_dtype)
+                    sums[name] = np.zeros(data.shape[1:], acc_dtype)
+                    sqs[name] = np.zeros(data.shape[1:])
+                data = data - shifts[name]
+                sums[name] += data.sum(axis=0)
+                if with_stderr:
+                    sqs[name] += (data * data.conj()).real.sum(axis=0)
+                counts[name] += len(data)
+
+        if self.preload:
+            dtype = self._data.dtype
+            for start in range(0, len(self._data), 100):
+                _accumulate(self._data[start:start + 100],
+                            self.events[start:start + 100, 2])
+        else:
+            dtype = np.dtype(np.float64)
+            self._current = 0
+            while True:
+                out = self.next(True)
+                if out is None:
+                    break
+                epoch, event_id = out
+                dtype = self._get_dtype(epoch)
+                _accumulate(epoch[np.newaxis], [event_id])
+
+        evokeds, stderrs = dict(), dict()
+        for name in conditions:
+            n_events = counts[name]
+            if n_events == 0:
+                mean = np.empty((len(self.ch_names), len(self.times)))
+                mean.fill(np.nan)
+                stderr = mean.copy()
+            else:
+                mean = shifts[name] + sums[name] / n_events
+                var = sqs[name] / n_events - np.abs(sums[name] / n_events) ** 2
+                stderr = np.sqrt(np.maximum(var, 0.) / n_events)
+            evokeds[name] = self._evoked_from_epoch_data(
+                mean, self.info, picks, n_events, 'average', dtype)
+            evokeds[name].comment = name
+            if with_stderr:
+                stderrs[name] = self._evoked_from_epoch_data(
+                    stderr, self.info, picks, n_events, 'standard_error',
+                    dtype)
+                stderrs[name].comment = name
+        return (evokeds, stderrs) if with_stderr else evokeds
+
     def _compute_mean_or_stderr(self, picks, mode='ave'):
         """Compute the mean or std over epochs and return Evoked"""
 
@@ -697,17 +879,34 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         n_channels = len(self.ch_names)
         n_times = len(self.times)
 
-        if self.preload:
+        if self.preload and _do_std and _is_memmap(self._data):
+            # accumulate blocks of epochs instead of making a full-size
+            # temporary array of the deviations from the mean
+            n_events = len(self.events)
+            dtype = self._data.dtype
+            data_mean = self._data.mean(
+                axis=0, dtype=np.promote_types(dtype, np.float64))
+            data = np.zeros(data_mean.shape)
+            for start in range(0, n_events, 100):
+                block = self._data[start:start + 100] - data_mean
+                data += (block * block.conj()).real.sum(axis=0)
+            data = np.sqrt(data / n_events)
+        elif self.preload:
             n_events = len(self.events)
             fun = np.std if _do_std else np.mean
-            data = fun(self._data, axis=0)
+            # accumulate in double precision even for single precision data
+            dtype = self._data.dtype
+            data = fun(self._data, axis=0,
+                       dtype=np.promote_types(dtype, np.float64))
             assert len(self.events) == len(self._data)
         else:
             data = np.zeros((n_channels, n_times))
             n_events = 0
+            dtype = data.dtype
             for e in self:
                 data += e
                 n_events += 1
+                dtype = self._get_dtype(e)
 
             if n_events > 0:
                 data /= n_events
@@ -729,14 +928,18 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             kind = 'standard_error'
             data /= np.sqrt(n_events)
         return self._evoked_from_epoch_data(data, self.info, picks, n_events,
-                                            kind)
+                                            kind, dtype)
 
-    def _evoked_from_epoch_data(self, data, info, picks, n_events, kind):
+    def _evoked_from_epoch_data(self, data, info, picks, n_events, kind,
+                                dtype=None):
         """Helper to create an evoked object from epoch data"""
         info = deepcopy(info)
         evoked = EvokedArray(data, info, tmin=self.times[0],
                              comment=self.name, nave=n_events, kind=kind,
                              verbose=self.verbose)
+        if dtype is not None:
+            # keep the precision of the epochs (e.g., single precision)
+            evoked.data = evoked.data.astype(dtype, copy=False)
         # XXX: above constructor doesn't recreate the times object precisely
         evoked.times = self.times.copy()
 
@@ -1287,7 +1490,14 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
         self.selection = np.delete(self.selection, indices)
         self.events = np.delete(self.events, indices, axis=0)
-        if self.preload:
+        if self.preload and _is_memmap(self._data):
+            # move the remaining epochs forward on disk
+            keep = np.setdiff1d(np.arange(len(self._data)), indices)
+            for start in range(0, len(keep), 100):
+                self._data[start:start + 100] = \
+                    self._data[keep[start:start + 100]]
+            self._data = self._data[:len(keep)]
+        elif self.preload:
             self._data = np.delete(self._data, indices, axis=0)
 
         count = len(indices)
@@ -1298,6 +1508,20 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         """Method to get a given epoch from disk"""
         raise NotImplementedError
 
+    def _get_epochs_from_raw_batch(self):
+        """Method to get all processed epochs at once (None if unsupported)
+
+        Returns
+        -------
+        data : array, shape (n_events, n_channels, n_times)
+            The detrended, baseline-corrected, decimated (and, unless
+            projection is delayed, projected) epochs.
+        epochs : list
+            For each event, the epoch in ``data``, or the reason why its
+            data are not available (see ``_get_epoch_from_raw``).
+        """
+        return None
+
     def _project_epoch(self, epoch):
         """Helper to process a raw epoch based on the delayed param"""
         # whenever requested, the first epoch is being projected.
@@ -1310,7 +1534,8 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         return epoch
 
     @verbose
-    def _get_data(self, out=True, verbose=None):
+    def _get_data(self, out=True, n_jobs=1, data_buffer=None,
+                  verbose=None):
         """Load all data, dropping bad epochs along the way
 
         Parameters
@@ -1318,6 +1543,14 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         out : bool
             Return the data. Setting this to False is used to reject bad
             epochs without caching all the data, which saves memory.
+        n_jobs : int
+            The number of jobs to read and process epochs from disk in
+            parallel. The jobs return the epochs of rounds of about 100 MB,
+            which are then copied into the data, so this needs up to 100 MB
+            of additional memory.
+        data_buffer : str | None
+            The name of a file to store the data in a memory map, if they
+            are loaded (None stores them in memory).
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
             Defaults to self.verbose.
@@ -1339,17 +1572,25 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 return data
 
             # we need to load from disk, drop, and return data
+            batch = self._get_epochs_from_raw_batch()
+            if batch is not None:
+                if data_buffer is None:
+                    return batch[0]
+                data = _allocate_epochs_data(batch[0].shape, batch[0].dtype,
+                                             data_buffer)
+                data[:] = batch[0]
+                return data
+            loaded = self._load_epochs_parallel(n_jobs, False, True)
             for idx in range(n_events):
                 # faster to pre-allocate memory here
-                epoch_noproj = self._get_epoch_from_raw(idx)
-                epoch_noproj = self._detrend_offset_decim(epoch_noproj)
-                if self._do_delayed_proj:
-                    epoch_out = epoch_noproj
+                if loaded is not None:
+                    epoch_out = next(loaded)[2]
                 else:
-                    epoch_out = self._project_epoch(epoch_noproj)
+                    epoch_out = _load_epochs(self, [idx], False, True)[0][2]
                 if idx == 0:
-                    data = np.empty((n_events, len(self.ch_names),
-                                     len(self.times)), dtype=epoch_out.dtype)
+                    data = _allocate_epochs_data(
+                        (n_events, len(self.ch_names), len(self.times)),
+                        self._get_dtype(epoch_out), data_buffer)
                 data[idx] = epoch_out
         else:
             # bads need to be dropped, this might occur after a preload
@@ -1357,21 +1598,31 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             good_idx = []
             n_out = 0
             assert n_events == len(self.selection)
+            batch = None if self.preload else \
+                self._get_epochs_from_raw_batch()
+            # the epochs in memory are checked all at once
+            if self.preload:
+                checks = iter(self._is_good_epochs(self._data))
+            elif batch is not None:
+                checks = iter(self._is_good_epochs(batch[0]))
+            else:
+                loaded = self._load_epochs_parallel(n_jobs, True, out)
             for idx, sel in enumerate(self.selection):
                 if self.preload:  # from memory
-                    if self._do_delayed_proj:
-                        epoch_noproj = self._data[idx]
-                        epoch = self._project_epoch(epoch_noproj)
+                    epoch_out = self._data[idx]
+                    is_good, offending_reason = next(checks)
+                elif batch is not None:  # processed all at once
+                    epoch_out = batch[1][idx]
+                    if isinstance(epoch_out, np.ndarray):
+                        is_good, offending_reason = next(checks)
                     else:
-                        epoch_noproj = None
-                        epoch = self._data[idx]
+                        is_good, offending_reason = \
+                            self._is_good_epoch(epoch_out)
+                elif loaded is not None:  # from disk, in parallel
+                    is_good, offending_reason, epoch_out = next(loaded)
                 else:  # from disk
-                    epoch_noproj = self._get_epoch_from_raw(idx)
-                    epoch_noproj = self._detrend_offset_decim(epoch_noproj)
-                    epoch = self._project_epoch(epoch_noproj)
-
-                epoch_out = epoch_noproj if self._do_delayed_proj else epoch
-                is_good, offending_reason = self._is_good_epoch(epoch)
+                    is_good, offending_reason, epoch_out = _load_epochs(
+                        self, [idx], True, out)[0]
                 if not is_good:
                     self.drop_log[sel] += offending_reason
                     continue
@@ -1380,10 +1631,13 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 # store the epoch if there is a reason to (output or update)
                 if out or self.preload:
                     # faster to pre-allocate, then trim as necessary
-                    if n_out == 0 and not self.preload:
-                        data = np.empty((n_events, epoch_out.shape[0],
-                                         epoch_out.shape[1]),
-                                        dtype=epoch_out.dtype, order='C')
+                    if n_out == 0 and batch is not None and \
+                            data_buffer is None:
+                        data = batch[0]  # the good epochs are moved forward
+                    elif n_out == 0 and not self.preload:
+                        data = _allocate_epochs_data(
+                            (n_events,) + epoch_out.shape,
+                            self._get_dtype(epoch_out), data_buffer)
                     data[n_out] = epoch_out
                     n_out += 1
 
@@ -1400,10 +1654,52 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
             # adjust the data size if there is a reason to (output or update)
             if out or self.preload:
-                data.resize((n_out,) + data.shape[1:], refcheck=False)
+                if _is_memmap(data):
+                    data = data[:n_out]
+                else:
+                    data.resize((n_out,) + data.shape[1:], refcheck=False)
+                if self.preload:
+                    self._data = data
 
         return data if out else None
 
+    def _load_epochs_parallel(self, n_jobs, check, out):
+        """Read and process all epochs from disk in parallel jobs
+
+        Returns None if a single job is used. Otherwise, returns an iterator
+        over the results in the order of the events, as with a single job.
+        """
+        n_jobs = min(check_n_jobs(n_jobs), len(self.events))
+        if n_jobs <= 1:
+            return None
+        return self._iter_epochs_parallel(n_jobs, check, out)
+
+    def _iter_epochs_parallel(self, n_jobs, check, out):
+        """Helper to read and process the epochs in rounds of parallel jobs
+
+        The events of each round are split in consecutive blocks (one per
+        job). A round holds about 100 MB of epochs, so only these results are
+        kept in memory in addition to the array they are stored in.
+        """
+        parallel, p_fun, _ = parallel_func(_load_epochs, n_jobs)
+        n_bytes = 8 * len(self.ch_names) * len(self._raw_times)
+        n_round = max(int(1e8 // n_bytes), n_jobs)
+        idx = np.arange(len(self.events))
+        for start in range(0, len(idx), n_round):
+            this_idx = idx[start:start + n_round]
+            for loaded in parallel(
+                    p_fun(self, block, check, out)
+                    for block in np.array_split(this_idx, n_jobs)
+                    if len(block) > 0):
+                for this_loaded in loaded:
+                    yield this_loaded
+
+    def _get_dtype(self, epoch):
+        """Helper to get the dtype used to store the data of an epoch"""
+        if self._dtype is None:
+            return epoch.dtype
+        return _match_precision(self._dtype, epoch.dtype)
+
     def get_data(self):
         """Get all epochs as a 3D array
 
@@ -1593,17 +1889,7 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             key = [key]
 
         if isinstance(key, (list, tuple)) and isinstance(key[0], string_types):
-            if any('/' in k_i for k_i in epochs.event_id.keys()):
-                if any(k_e not in epochs.event_id for k_e in key):
-                    # Select a given key if the requested set of
-                    # '/'-separated types are a subset of the types in that key
-                    key = [k for k in epochs.event_id.keys()
-                           if all(set(k_i.split('/')).issubset(k.split('/'))
-                                  for k_i in key)]
-                    if len(key) == 0:
-                        raise KeyError('Attempting selection of events via '
-                                       'multiple/partial matching, but no '
-                                       'event matches all criteria.')
+            key = _hid_match(epochs.event_id, key)
             select = np.any(np.atleast_2d([epochs._key_match(k)
                                            for k in key]), axis=0)
             epochs.name = '+'.join(key)
@@ -1615,7 +1901,10 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             epochs.drop_log[k] = ['IGNORED']
         epochs.selection = key_selection
         epochs.events = np.atleast_2d(epochs.events[select])
-        if epochs.preload:
+        if epochs.preload and _is_memmap(epochs._data):
+            # the selected epochs are copied to a new file on disk
+            epochs._data = _copy_to_memmap(epochs, epochs._data, select)
+        elif epochs.preload:
             # ensure that each Epochs instance owns its own data so we can
             # resize later if necessary
             epochs._data = np.require(epochs._data[select], requirements=['O'])
@@ -1667,7 +1956,12 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         tmask = _time_mask(self.times, tmin, tmax, sfreq=self.info['sfreq'])
         self.times = self.times[tmask]
         self._raw_times = self._raw_times[tmask]
-        self._data = self._data[:, :, tmask]
+        if _is_memmap(self._data):
+            # a slice is a view of a memory map on disk
+            tmask = np.where(tmask)[0]
+            self._data = self._data[:, :, tmask[0]:tmask[-1] + 1]
+        else:
+            self._data = self._data[:, :, tmask]
         return self
 
     @verbose
@@ -1723,11 +2017,30 @@ class _BaseEpochs(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         """Return copy of Epochs instance"""
         raw = self._raw
         del self._raw
+        data = getattr(self, '_data', None)
+        if _is_memmap(data):
+            del self._data
         new = deepcopy(self)
+        new.__dict__.pop('_data_tempfile', None)  # not shared
         self._raw = raw
         new._raw = raw
+        if _is_memmap(data):
+            # the data of the copy are copied to a new file on disk
+            self._data = data
+            new._data = _copy_to_memmap(new, data, slice(None))
         return new
 
+    def __del__(self):
+        # remove the temporary file the data were copied to (the file given
+        # as preload belongs to the user)
+        fname = getattr(self, '_data_tempfile', None)
+        if fname is not None:
+            self.__dict__.pop('_data', None)
+            try:
+                os.remove(fname)
+            except OSError:
+                pass  # ignore file that no longer exists or is still used
+
     def save(self, fname, split_size='2GB'):
         """Save epochs in a fif file
 
@@ -1972,10 +2285,20 @@ class Epochs(_BaseEpochs):
         Indices of channels to include (if None, all channels are used).
     name : string
         Comment that describes the Epochs data created.
-    preload : boolean
+    preload : bool | str
         Load all epochs from disk when creating the object
         or wait before accessing each epoch (more memory
-        efficient but can be slower).
+        efficient but can be slower). If preload is a string, preload is
+        the file name of a memory-mapped file which is used to store the
+        data on the hard drive (slower, requires less memory). The file is
+        not removed. Selecting epochs (e.g., ``epochs['cond']``) and copying
+        write the data to new temporary files in the directory set with
+        :func:`mne.set_cache_dir` (or the default temporary directory),
+        which are removed with the new instances.
+
+        .. versionchanged:: 0.13
+           Support for a memory-mapped file.
+
     reject : dict | None
         Rejection parameters based on peak-to-peak amplitude.
         Valid keys are 'grad' | 'mag' | 'eeg' | 'eog' | 'ecg'.
@@ -2035,6 +2358,21 @@ class Epochs(_BaseEpochs):
         Whether to reject based on annotations. If True (default), epochs
         overlapping with segments whose description begins with ``'bad'`` are
         rejected. If False, no rejection based on annotations is performed.
+    dtype : None | np.float32 | np.float64
+        The precision used to store the data of the epochs in memory. Single
+        precision (``np.float32``) halves the memory needed. If None
+        (default), the precision of the raw data is used (see
+        :meth:`mne.io.Raw.load_data`).
+
+        .. versionadded:: 0.13
+
+    n_jobs : int
+        The number of jobs to read and process the epochs in parallel if
+        ``preload=True`` and the raw data are not preloaded (see
+        :meth:`mne.Epochs.load_data`).
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
         Defaults to raw.verbose.
@@ -2085,11 +2423,17 @@ class Epochs(_BaseEpochs):
                  baseline=(None, 0), picks=None, name='Unknown', preload=False,
                  reject=None, flat=None, proj=True, decim=1, reject_tmin=None,
                  reject_tmax=None, detrend=None, add_eeg_ref=True,
-                 on_missing='error', reject_by_annotation=True, verbose=None):
+                 on_missing='error', reject_by_annotation=True, dtype=None,
+                 n_jobs=1, verbose=None):
         if not isinstance(raw, _BaseRaw):
             raise ValueError('The first argument to `Epochs` must be an '
                              'instance of `mne.io.Raw`')
         info = deepcopy(raw.info)
+        if dtype is None:
+            # use the precision of the raw data
+            raw_dtype = raw._data.dtype if raw.preload else raw._dtype
+            dtype = (np.float32 if raw_dtype in (np.float32, np.complex64)
+                     else np.float64)
 
         # proj is on when applied in Raw
         proj = proj or raw.proj
@@ -2101,7 +2445,11 @@ class Epochs(_BaseEpochs):
             raw=raw, picks=picks, name=name, reject=reject, flat=flat,
             decim=decim, reject_tmin=reject_tmin, reject_tmax=reject_tmax,
             detrend=detrend, add_eeg_ref=add_eeg_ref, proj=proj,
-            on_missing=on_missing, preload_at_end=preload, verbose=verbose)
+            on_missing=on_missing, preload_at_end=False, dtype=dtype,
+            verbose=verbose)
+        if preload:
+            # this will do the projection
+            self._preload_data(preload, n_jobs=n_jobs)
 
     @verbose
     def _get_epoch_from_raw(self, idx, verbose=None):
@@ -2129,6 +2477,149 @@ class Epochs(_BaseEpochs):
                                             self.reject_by_annotation)
         return data
 
+    def _get_epochs_from_raw_batch(self):
+        """Get all processed epochs at once from preloaded raw data"""
+        raw = self._raw
+        if raw is None or not raw.preload or len(self.events) == 0:
+            return None
+        sfreq = raw.info['sfreq']
+        n_times = len(self._raw_times)
+        starts = np.round(self.events[:, 0] +
+                          self._raw_times[0] * sfreq).astype(int)
+        starts -= raw.first_samp
+        # the same reasons as _check_bad_segment and _is_good_epoch give
+        reasons = np.empty(len(starts), object)
+        reasons[starts + n_times > raw.n_times] = 'TOO_SHORT'
+        if self.reject_by_annotation and raw.annotations is not None:
+            annot = raw.annotations
+            onset = _onset_to_seconds(raw, annot.onset)
+            is_bad = np.array([desc.lower().startswith('bad')
+                               for desc in annot.description], bool)
+            overlaps = ((onset < (starts + n_times)[:, np.newaxis] / sfreq) &
+                        (onset + annot.duration >
+                         starts[:, np.newaxis] / sfreq) & is_bad)
+            has_bad = overlaps.any(axis=1)
+            reasons[has_bad] = annot.description[
+                np.argmax(overlaps[has_bad], axis=1)]
+        reasons[starts < 0] = None
+        good = np.array([reason is None for reason in reasons]) & \
+            (starts >= 0)
+        if not good.any():
+            return None
+
+        data = _gather_epochs(raw._data, self.picks, starts[good], n_times,
+                              np.empty((good.sum(), len(self.picks),
+                                        n_times), raw._data.dtype))
+        data = self._detrend_offset_decim(data)
+        if self._projector is not None and self.proj is True and \
+                not self._do_delayed_proj:
+            data = np.dot(self._projector, data).swapaxes(0, 1)
+        data = data.astype(self._get_dtype(data), order='C', copy=False)
+        base = data.base
+        if base is not None:  # own the memory so the array can be resized
+            data = base if (isinstance(base, np.ndarray) and
+                            base.flags.owndata and base.flags.c_contiguous and
+                            base.shape == data.shape) else data.copy()
+        epochs = list(reasons)
+        for ii, idx in enumerate(np.where(good)[0]):
+            epochs[idx] = data[ii]
+        return data, epochs
+
+
+def _hid_match(event_id, keys):
+    """Helper to match the event names of a list of (tagged) conditions"""
+    if any('/' in k_i for k_i in event_id.keys()):
+        if any(k_e not in event_id for k_e in keys):
+            # Select a given key if the requested set of
+            # '/'-separated types are a subset of the types in that key
+            keys = [k for k in event_id.keys()
+                    if all(set(k_i.split('/')).issubset(k.split('/'))
+                           for k_i in keys)]
+            if len(keys) == 0:
+                raise KeyError('Attempting selection of events via '
+                               'multiple/partial matching, but no '
+                               'event matches all criteria.')
+    return keys
+
+
+def _is_memmap(data):
+    """Helper to check whether data are stored in a memory-mapped file"""
+    # arrays derived from a memory map (e.g., with take) are of the np.memmap
+    # type, but they are in memory
+    return getattr(data, 'filename', None) is not None
+
+
+def _copy_to_memmap(epochs, data, select):
+    """Helper to copy a selection of epochs to a new temporary file
+
+    The file is created in the "MNE_CACHE_DIR" or the default temporary
+    directory and removed with the epochs.
+    """
+    idx = np.arange(len(data))[select]
+    if len(idx) == 0:  # empty files cannot be memory-mapped
+        return np.empty((0,) + data.shape[1:], data.dtype)
+    fid, fname = tempfile.mkstemp(
+        suffix='.dat', prefix=op.splitext(op.basename(data.filename))[0],
+        dir=get_config('MNE_CACHE_DIR', None))
+    os.close(fid)
+    out = _allocate_epochs_data((len(idx),) + data.shape[1:], data.dtype,
+                                fname)
+    for start in range(0, len(idx), 100):
+        out[start:start + 100] = data[idx[start:start + 100]]
+    epochs._data_tempfile = fname
+    return out
+
+
+def _allocate_epochs_data(shape, dtype, data_buffer):
+    """Helper to allocate the data of epochs in memory or in a memmap"""
+    if isinstance(data_buffer, string_types) and shape[0] > 0:
+        return np.memmap(data_buffer, mode='w+', dtype=dtype, shape=shape)
+    return np.empty(shape, dtype=dtype)
+
+
+def _load_epochs(epochs, idx, check, out):
+    """Helper to read, process and (optionally) check epochs from disk
+
+    Returns a list of (is_good, reason, epoch) with the epoch as stored in
+    the data (None if it is bad or not requested with out=False).
+    """
+    loaded = list()
+    for ii in idx:
+        epoch_noproj = epochs._get_epoch_from_raw(ii)
+        epoch_noproj = epochs._detrend_offset_decim(epoch_noproj)
+        epoch = epochs._project_epoch(epoch_noproj)
+        epoch_out = epoch_noproj if epochs._do_delayed_proj else epoch
+        is_good, offending_reason = True, None
+        if check:
+            is_good, offending_reason = epochs._is_good_epoch(epoch)
+        loaded.append((is_good, offending_reason,
+                       epoch_out if is_good and out else None))
+    return loaded
+
+
+def _gather_epochs(data, picks, starts, n_times, out):
+    """Helper to gather the windows of all epochs from raw data"""
+    if isinstance(data, _SegmentedArray):
+        segments, offsets = data._segments, data._offsets
+    else:
+        segments, offsets = [data], [0, data.shape[1]]
+    picks = np.asarray(picks)[np.newaxis, :, np.newaxis]
+    done = np.zeros(len(starts), bool)
+    for seg, first, last in zip(segments, offsets[:-1], offsets[1:]):
+        mask = (starts >= first) & (starts + n_times <= last)
+        done |= mask
+        # one fancy-indexing operation per group of epochs, which bounds
+        # the size of the temporary array
+        mask = np.where(mask)[0]
+        for ii in range(0, len(mask), 100):
+            idx = mask[ii:ii + 100]
+            out[idx] = seg[picks, (starts[idx] - first)[:, np.newaxis,
+                                                        np.newaxis] +
+                           np.arange(n_times)]
+    for ii in np.where(~done)[0]:  # epochs that span several segments
+        out[ii] = data[picks[0, :, 0], starts[ii]:starts[ii] + n_times]
+    return out
+
 
 class EpochsArray(_BaseEpochs):
     """Epochs object from numpy array
@@ -2136,7 +2627,13 @@ class EpochsArray(_BaseEpochs):
     Parameters
     ----------
     data : array, shape (n_epochs, n_channels, n_times)
-        The channels' time series for each epoch.
+        The channels' time series for each epoch. If data is a
+        ``np.memmap`` of double precision, the data stay in the memory-mapped
+        file on the hard drive (and are modified in place).
+
+        .. versionchanged:: 0.13
+           Support for a memory-mapped file.
+
     info : instance of Info
         Info dictionary. Consider using ``create_info`` to populate
         this structure.
@@ -2201,7 +2698,9 @@ class EpochsArray(_BaseEpochs):
     def __init__(self, data, info, events=None, tmin=0, event_id=None,
                  reject=None, flat=None, reject_tmin=None,
                  reject_tmax=None, baseline=None, proj=True, verbose=None):
-        dtype = np.complex128 if np.any(np.iscomplex(data)) else np.float64
+        # check the type first so that a memory map is not read for nothing
+        dtype = (np.complex128 if np.iscomplexobj(data) and
+                 np.any(np.iscomplex(data)) else np.float64)
         data = np.asanyarray(data, dtype=dtype)
         if data.ndim != 3:
             raise ValueError('Data must be a 3D array of shape (n_epochs, '
@@ -2437,7 +2936,7 @@ def _is_good(e, ch_names, channel_type_idx, reject, flat, full_report=False,
             return False, bad_list
 
 
-def _read_one_epoch_file(f, tree, fname, preload):
+def _read_one_epoch_file(f, tree, fname, preload, dtype):
     """Helper to read a single FIF file"""
 
     with f as fid:
@@ -2532,9 +3031,13 @@ def _read_one_epoch_file(f, tree, fname, preload):
 
         # Read the data
         if preload:
-            data = read_tag(fid, data_tag.pos).data.astype(np.float64)
+            data = read_tag(fid, data_tag.pos).data.astype(dtype)
             data *= cals[np.newaxis, :, :]
 
+        # Map the event samples to the epochs in the file
+        epoch_idx = dict((samp, k)
+                         for k, samp in enumerate(events[:, 0].tolist()))
+
         # Put it all together
         tmin = first / info['sfreq']
         tmax = last / info['sfreq']
@@ -2548,12 +3051,12 @@ def _read_one_epoch_file(f, tree, fname, preload):
             drop_log = [[] for _ in range(len(events))]
 
     return (info, data, data_tag, events, event_id, tmin, tmax, baseline, name,
-            selection, drop_log, epoch_shape, cals)
+            selection, drop_log, epoch_shape, cals, epoch_idx)
 
 
 @verbose
 def read_epochs(fname, proj=True, add_eeg_ref=False, preload=True,
-                verbose=None):
+                dtype=None, verbose=None):
     """Read epochs from a fif file
 
     Parameters
@@ -2574,9 +3077,27 @@ def read_epochs(fname, proj=True, add_eeg_ref=False, preload=True,
     add_eeg_ref : bool
         If True, an EEG average reference will be added (unless one
         already exists).
-    preload : bool
+    preload : bool | str
         If True, read all epochs from disk immediately. If False, epochs will
-        be read on demand.
+        be read on demand. If preload is a string, the epochs are read into
+        a memory-mapped file with this name, which is used to store the data
+        on the hard drive (requires less memory). The file is not removed.
+        Selecting epochs (e.g., ``epochs['cond']``) and copying write the
+        data to new temporary files in the directory set with
+        :func:`mne.set_cache_dir` (or the default temporary directory),
+        which are removed with the new instances.
+
+        .. versionchanged:: 0.13
+           Support for a memory-mapped file.
+
+    dtype : None | np.float32 | np.float64
+        The precision used to store the data in memory. The data are stored
+        in single precision on disk, so ``np.float32`` avoids converting
+        them and halves the memory needed. If None (default), double
+        precision is used.
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
         Defaults to raw.verbose.
@@ -2586,17 +3107,61 @@ def read_epochs(fname, proj=True, add_eeg_ref=False, preload=True,
     epochs : instance of Epochs
         The epochs
     """
-    return EpochsFIF(fname, proj, add_eeg_ref, preload, verbose)
+    return EpochsFIF(fname, proj, add_eeg_ref, preload, dtype, verbose)
 
 
 class _RawContainer(object):
-    def __init__(self, fid, data_tag, event_samps, epoch_shape, cals):
-        self.fid = fid
+    def __init__(self, fname, data_tag, epoch_idx, epoch_shape, cals):
+        self.fname = fname
+        self.fid = _fiff_get_fid(fname)
         self.data_tag = data_tag
-        self.event_samps = event_samps
+        self.epoch_idx = epoch_idx  # event sample -> index of epoch in file
         self.epoch_shape = epoch_shape
         self.cals = cals
         self.proj = False
+        self._open_memmap()
+
+    def _open_memmap(self):
+        """Map the epochs data of uncompressed files in memory"""
+        self.data = None
+        if not self.fname.endswith('.gz') and len(self.epoch_idx) > 0:
+            self.data = np.memmap(
+                self.fname, dtype='>f4', mode='r',
+                offset=self.data_tag.pos + 16,  # 16 = Tag header
+                shape=(len(self.epoch_idx),) + tuple(self.epoch_shape))
+
+    def read_epoch(self, event_samp, dtype):
+        """Read and calibrate one epoch, or return None if it is not here"""
+        idx = self.epoch_idx.get(event_samp)
+        if idx is None:
+            return None
+        # the following is equivalent to this, but faster:
+        #
+        # >>> data = read_tag(self.fid, self.data_tag.pos).data.astype(float)
+        # >>> data *= self.cals[np.newaxis, :, :]
+        # >>> data = data[idx]
+        if self.data is not None:
+            epoch = self.data[idx]
+        else:
+            size = int(np.prod(self.epoch_shape)) * 4
+            self.fid.seek(self.data_tag.pos + 16 + idx * size, 0)
+            epoch = np.frombuffer(self.fid.read(size), '>f4')
+            epoch = epoch.reshape(self.epoch_shape)
+        # calibrate and convert to native byte order in a single copy
+        data = np.empty(self.epoch_shape, dtype)
+        np.multiply(epoch, self.cals, out=data, casting='unsafe')
+        return data
+
+    def __getstate__(self):
+        # the file is opened again when unpickled (e.g., in parallel jobs)
+        state = self.__dict__.copy()
+        del state['fid'], state['data']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.fid = _fiff_get_fid(self.fname)
+        self._open_memmap()
 
     def __del__(self):
         self.fid.close()
@@ -2623,9 +3188,27 @@ class EpochsFIF(_BaseEpochs):
     add_eeg_ref : bool
         If True, an EEG average reference will be added (unless one
         already exists).
-    preload : bool
+    preload : bool | str
         If True, read all epochs from disk immediately. If False, epochs will
-        be read on demand.
+        be read on demand. If preload is a string, the epochs are read into
+        a memory-mapped file with this name, which is used to store the data
+        on the hard drive (requires less memory). The file is not removed.
+        Selecting epochs (e.g., ``epochs['cond']``) and copying write the
+        data to new temporary files in the directory set with
+        :func:`mne.set_cache_dir` (or the default temporary directory),
+        which are removed with the new instances.
+
+        .. versionchanged:: 0.13
+           Support for a memory-mapped file.
+
+    dtype : None | np.float32 | np.float64
+        The precision used to store the data in memory. The data are stored
+        in single precision on disk, so ``np.float32`` avoids converting
+        them and halves the memory needed. If None (default), double
+        precision is used.
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
         Defaults to raw.verbose.
@@ -2638,9 +3221,15 @@ class EpochsFIF(_BaseEpochs):
     """
     @verbose
     def __init__(self, fname, proj=True, add_eeg_ref=True, preload=True,
-                 verbose=None):
+                 dtype=None, verbose=None):
         check_fname(fname, 'epochs', ('-epo.fif', '-epo.fif.gz'))
+        dtype = _check_float_dtype(dtype)
+        if dtype is None:
+            dtype = np.dtype(np.float64)
 
+        # a memory map is filled like non-preloaded data are loaded
+        data_buffer = preload if isinstance(preload, string_types) else None
+        preload = preload and data_buffer is None
         fnames = [fname]
         ep_list = list()
         raw = list()
@@ -2649,20 +3238,19 @@ class EpochsFIF(_BaseEpochs):
             fid, tree, _ = fiff_open(fname)
             next_fname = _get_next_fname(fid, fname, tree)
             (info, data, data_tag, events, event_id, tmin, tmax, baseline,
-             name, selection, drop_log, epoch_shape, cals) = \
-                _read_one_epoch_file(fid, tree, fname, preload)
+             name, selection, drop_log, epoch_shape, cals, epoch_idx) = \
+                _read_one_epoch_file(fid, tree, fname, preload, dtype)
             # here we ignore missing events, since users should already be
             # aware of missing events if they have saved data that way
             epoch = _BaseEpochs(
                 info, data, events, event_id, tmin, tmax, baseline,
                 on_missing='ignore', selection=selection, drop_log=drop_log,
-                add_eeg_ref=False, proj=False, verbose=False)
+                add_eeg_ref=False, proj=False, dtype=dtype, verbose=False)
             ep_list.append(epoch)
             if not preload:
                 # store everything we need to index back to the original data
-                raw.append(_RawContainer(fiff_open(fname)[0], data_tag,
-                                         events[:, 0].copy(), epoch_shape,
-                                         cals))
+                raw.append(_RawContainer(fname, data_tag, epoch_idx,
+                                         epoch_shape, cals))
 
             if next_fname is not None:
                 fnames.append(next_fname)
@@ -2689,41 +3277,24 @@ class EpochsFIF(_BaseEpochs):
             info, data, events, event_id, tmin, tmax, baseline, raw=raw,
             name=name, proj=proj, add_eeg_ref=add_eeg_ref,
             preload_at_end=False, on_missing='ignore', selection=selection,
-            drop_log=drop_log, verbose=verbose)
+            drop_log=drop_log, dtype=dtype, verbose=verbose)
         # use the private property instead of drop_bad so that epochs
         # are not all read from disk for preload=False
         self._bad_dropped = True
+        if data_buffer is not None:
+            self._preload_data(data_buffer)
 
     @verbose
     def _get_epoch_from_raw(self, idx, verbose=None):
         """Load one epoch from disk"""
         # Find the right file and offset to use
-        event_samp = self.events[idx, 0]
+        event_samp = int(self.events[idx, 0])
         for raw in self._raw:
-            idx = np.where(raw.event_samps == event_samp)[0]
-            if len(idx) == 1:
-                idx = idx[0]
-                size = np.prod(raw.epoch_shape) * 4
-                offset = idx * size
-                break
-        else:
-            # read the correct subset of the data
-            raise RuntimeError('Correct epoch could not be found, please '
-                               'contact mne-python developers')
-        # the following is equivalent to this, but faster:
-        #
-        # >>> data = read_tag(raw.fid, raw.data_tag.pos).data.astype(float)
-        # >>> data *= raw.cals[np.newaxis, :, :]
-        # >>> data = data[idx]
-        #
-        # Eventually this could be refactored in io/tag.py if other functions
-        # could make use of it
-
-        raw.fid.seek(raw.data_tag.pos + offset + 16, 0)  # 16 = Tag header
-        data = np.fromstring(raw.fid.read(size), '>f4').astype(np.float64)
-        data.shape = raw.epoch_shape
-        data *= raw.cals
-        return data
+            data = raw.read_epoch(event_samp, self._dtype)
+            if data is not None:
+                return data
+        raise RuntimeError('Correct epoch could not be found, please '
+                           'contact mne-python developers')
 
 
 def bootstrap(epochs, random_state=None):
@@ -1,18 +1,25 @@
 """IIR and FIR filtering functions"""
 
 from copy import deepcopy
+from fractions import Fraction
+import hashlib
 import math
+from multiprocessing.pool import ThreadPool
+import threading
 
 import numpy as np
-from scipy.fftpack import fft, ifftshift, fftfreq, ifft
+from scipy.fftpack import ifftshift, fftfreq, ifft
 
 from .cuda import (setup_cuda_fft_multiply_repeated, fft_multiply_repeated,
-                   setup_cuda_fft_resample, fft_resample, _smart_pad)
+                   setup_cuda_fft_resample, fft_resample, _smart_pad,
+                   _fft, _ifft)
 from .externals.six import string_types, integer_types
-from .fixes import get_firwin2, get_filtfilt, get_sosfiltfilt, partial
+from .fixes import (get_firwin2, get_filtfilt, get_sosfiltfilt, partial,
+                    sosfilt, sosfilt_zi, OrderedDict)
 from .parallel import parallel_func, check_n_jobs
 from .time_frequency.multitaper import dpss_windows, _mt_spectra
-from .utils import logger, verbose, sum_squared, check_version, warn
+from .utils import (logger, verbose, sum_squared, check_version, warn,
+                    get_config)
 
 
 # These values are *double* what is given in Ifeachor and Jervis.
@@ -124,6 +131,120 @@ def next_fast_len(target):
     return match
 
 
+class _FilterCache(object):
+    """Size-bounded LRU cache of designed FIR filters and their spectra
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum size of the cached arrays in bytes.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = int(max_size)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Remove all filters and reset the counters"""
+        with self._lock:
+            self._items.clear()
+            self.size = self.hits = self.misses = 0
+
+    def get(self, key):
+        """Get the tuple stored for key (or None)"""
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items[key] = item  # most recently used
+            self.hits += 1
+            return item[1]
+
+    def add(self, key, value):
+        """Add a tuple, the arrays of which are made read-only"""
+        arrays = [v for v in value if isinstance(v, np.ndarray)]
+        n_bytes = sum(v.nbytes for v in arrays)
+        if n_bytes > self.max_size:
+            return
+        for v in arrays:
+            v.flags.writeable = False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[0]
+            self._items[key] = (n_bytes, value)
+            self.size += n_bytes
+            while self.size > self.max_size:  # evict the least recently used
+                self.size -= self._items.popitem(last=False)[1][0]
+
+    def __len__(self):
+        return len(self._items)
+
+
+_filter_cache = None
+
+
+def _get_filter_cache():
+    """Helper to get the cache of FIR filters"""
+    global _filter_cache
+    if _filter_cache is None:
+        _filter_cache = _FilterCache(get_config('MNE_FILTER_CACHE_SIZE',
+                                                str(64 * 1024 ** 2)))
+    return _filter_cache
+
+
+def filter_cache_info():
+    """Get information about the cache of FIR filters
+
+    The FIR filters designed by the filtering functions (e.g.,
+    :func:`filter_data` or :meth:`mne.io.Raw.filter`) and their spectra
+    used for overlap-add filtering are kept in a least recently used cache,
+    so that filtering many times with the same parameters (e.g., epochs
+    or cross-validation folds) designs each filter only once. The maximum
+    size of the cache in bytes is the ``MNE_FILTER_CACHE_SIZE`` config
+    value (see :func:`mne.set_config`), 64 MB by default (0 disables the
+    cache).
+
+    Returns
+    -------
+    cache_info : dict
+        The numbers of ``hits`` and ``misses``, the number of cached
+        filters and spectra (``n_entries``), and the ``size`` and
+        ``max_size`` of the cache in bytes.
+
+    See Also
+    --------
+    clear_filter_cache
+
+    Notes
+    -----
+    .. versionadded:: 0.13
+    """
+    cache = _get_filter_cache()
+    return dict(hits=cache.hits, misses=cache.misses, n_entries=len(cache),
+                size=cache.size, max_size=cache.max_size)
+
+
+def clear_filter_cache():
+    """Remove the FIR filters from the cache and reset its counters
+
+    The maximum size of the cache is read again from the config.
+
+    See Also
+    --------
+    filter_cache_info
+
+    Notes
+    -----
+    .. versionadded:: 0.13
+    """
+    global _filter_cache
+    _filter_cache = None
+
+
 def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
                         n_jobs=1):
     """Filter the signal x using h with overlap-add FFTs.
@@ -147,13 +268,20 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
     picks : array-like of int | None
         Indices to filter. If None all indices will be filtered.
     n_jobs : int | str
-        Number of jobs to run in parallel. Can be 'cuda' if scikits.cuda
+        Number of threads to run in parallel. Can be 'cuda' if scikits.cuda
         is installed properly and CUDA is initialized.
 
     Returns
     -------
     xf : 2d array
         x filtered.
+
+    Notes
+    -----
+    The rows are filtered together in blocks, whose segments are
+    transformed in groups of at most ``_MAX_FFT_BLOCK_SIZE`` bytes of
+    spectra (at least one segment of one row). The blocks are filtered in
+    threads, which run in parallel where NumPy and the FFT release the GIL.
     """
     if picks is None:
         picks = np.arange(x.shape[0])
@@ -167,6 +295,101 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
     logger.debug('Smart-padding with:  %s samples on each edge' % n_edge)
     n_x = x.shape[1] + 2 * n_edge
 
+    # the spectrum of the filter is the same for signals of the same length
+    cache = _get_filter_cache()
+    key = ('fft', hashlib.md5(np.ascontiguousarray(h)).hexdigest(),
+           h.dtype.str, len(h), phase, n_x, n_fft)
+    cached = cache.get(key)
+    if cached is not None:
+        n_h, n_fft, h_fft = cached
+    else:
+        n_h, n_fft, h_fft = _overlap_add_design(h, n_x, n_fft, phase)
+        cache.add(key, (n_h, n_fft, h_fft))
+
+    # Figure out if we should use CUDA
+    n_jobs, cuda_dict, h_fft = setup_cuda_fft_multiply_repeated(n_jobs, h_fft)
+
+    if cuda_dict['use_cuda']:
+        # Process each row separately
+        for p in picks:
+            x[p] = _1d_overlap_filter(x[p], h_fft, n_h, n_edge, phase,
+                                      cuda_dict)
+        return x
+
+    # Process the rows in blocks, bounded by the size of their spectra
+    picks = np.asarray(picks, int)
+    n_segments = int(np.ceil(n_x / float(n_fft - n_h + 1)))
+    n_rows = max(_MAX_FFT_BLOCK_SIZE // (n_segments * n_fft * 16), 1)
+    n_rows = min(n_rows, int(np.ceil(len(picks) / float(n_jobs))))
+    blocks = [picks[start:start + n_rows]
+              for start in range(0, len(picks), max(n_rows, 1))]
+
+    def _filter_block(rows):
+        x[rows] = _overlap_add_block(x[rows], h_fft, n_h, n_edge, phase)
+
+    if n_jobs == 1 or len(blocks) <= 1:
+        for rows in blocks:
+            _filter_block(rows)
+    else:
+        pool = ThreadPool(min(n_jobs, len(blocks)))
+        try:
+            pool.map(_filter_block, blocks)
+        finally:
+            pool.close()
+    return x
+
+
+def _overlap_add_block(x, h_fft, n_h, n_edge, phase):
+    """Do overlap-add FFT FIR filtering of the rows of a 2D array at once"""
+    n_fft = len(h_fft)
+    n_times = x.shape[1]
+    # pad to reduce ringing, like _smart_pad for each row
+    x_ext = np.concatenate([2 * x[:, :1] - x[:, n_edge:0:-1], x,
+                            2 * x[:, -1:] - x[:, -2:-n_edge - 2:-1]], axis=1)
+    n_x = x_ext.shape[1]
+    n_seg = n_fft - n_h + 1
+    n_segments = int(np.ceil(n_x / float(n_seg)))
+    shift = ((n_h - 1) // 2 if phase.startswith('zero') else 0) + n_edge
+
+    # the segments of all rows are transformed in groups bounded by the size
+    # of their spectra, the overlapping ends of the filtered segments
+    # (n_h - 1 < n_seg) are carried over to the next group
+    n_group = max(_MAX_FFT_BLOCK_SIZE // (len(x) * n_fft * 16), 1)
+    x_filtered = np.empty((len(x), n_times))
+    carry = np.zeros((len(x), n_h - 1))
+    for first in range(0, n_segments, n_group):
+        n_this = min(n_group, n_segments - first)
+        offset = first * n_seg
+        segs = np.zeros((len(x), n_this * n_seg))
+        piece = x_ext[:, offset:offset + n_this * n_seg]
+        segs[:, :piece.shape[1]] = piece
+        segs.shape = (len(x), n_this, n_seg)
+        prod = np.real(_ifft(h_fft * _fft(segs, n_fft, axis=-1), axis=-1))
+        del segs
+
+        y = np.zeros((len(x), n_this + 1, n_seg))
+        y[:, :-1] = prod[:, :, :n_seg]
+        y[:, 1:, :n_h - 1] += prod[:, :, n_seg:]
+        del prod
+        y.shape = (len(x), (n_this + 1) * n_seg)
+        y[:, :n_h - 1] += carry
+        n_done = n_this * n_seg
+        if first + n_this < n_segments:
+            carry = y[:, n_done:n_done + n_h - 1].copy()
+        else:  # the end of the last segment is complete
+            n_done = y.shape[1]
+
+        # compensate the delay and remove the mirrored edges
+        start = max(offset, shift)
+        stop = min(offset + n_done, shift + n_times)
+        if stop > start:
+            x_filtered[:, start - shift:stop - shift] = \
+                y[:, start - offset:stop - offset]
+    return x_filtered
+
+
+def _overlap_add_design(h, n_x, n_fft, phase):
+    """Helper to get the FFT length and the spectrum of an FIR filter"""
     if phase == 'zero-double':
         h = np.convolve(h, h[::-1])
 
@@ -195,24 +418,12 @@ def _overlap_add_filter(x, h, n_fft=None, phase='zero', picks=None,
                          '2 * len(h) - 1 (%s), got %s' % (min_fft, n_fft))
 
     # Filter in frequency domain
-    h_fft = fft(np.concatenate([h, np.zeros(n_fft - len(h), dtype=h.dtype)]))
+    h_fft = _fft(np.concatenate([h, np.zeros(n_fft - len(h), h.dtype)]))
+    return len(h), n_fft, h_fft
 
-    # Figure out if we should use CUDA
-    n_jobs, cuda_dict, h_fft = setup_cuda_fft_multiply_repeated(n_jobs, h_fft)
-
-    # Process each row separately
-    if n_jobs == 1:
-        for p in picks:
-            x[p] = _1d_overlap_filter(x[p], h_fft, len(h), n_edge, phase,
-                                      cuda_dict)
-    else:
-        parallel, p_fun, _ = parallel_func(_1d_overlap_filter, n_jobs)
-        data_new = parallel(p_fun(x[p], h_fft, len(h), n_edge, phase,
-                                  cuda_dict) for p in picks)
-        for pp, p in enumerate(picks):
-            x[p] = data_new[pp]
 
-    return x
+# maximum number of bytes of the spectra of the segments transformed at once
+_MAX_FFT_BLOCK_SIZE = 64 * 1024 ** 2
 
 
 def _1d_overlap_filter(x, h_fft, n_h, n_edge, phase, cuda_dict):
@@ -265,9 +476,9 @@ def _filter_attenuation(h, freq, gain):
 
 def _prep_for_filtering(x, copy, picks=None):
     """Set up array as 2D for filtering ease"""
-    if x.dtype != np.float64:
+    if x.dtype not in (np.float32, np.float64):
         raise TypeError("Arrays passed for filtering must have a dtype of "
-                        "np.float64")
+                        "np.float64 or np.float32")
     if copy is True:
         x = x.copy()
     orig_shape = x.shape
@@ -287,20 +498,16 @@ def _prep_for_filtering(x, copy, picks=None):
     return x, orig_shape, picks
 
 
-def _filter(x, Fs, freq, gain, filter_length, picks=None, n_jobs=1,
-            copy=True, phase='zero', fir_window='hamming'):
-    """Filter signal using gain control points in the frequency domain.
+def _design_fir(Fs, freq, gain, filter_length, phase='zero',
+                fir_window='hamming'):
+    """Design a FIR filter using gain control points in the frequency domain.
 
     The filter impulse response is constructed from a Hann window (window
     used in "firwin2" function) to avoid ripples in the frequency response
     (windowing is a smoothing in frequency domain).
 
-    If x is multi-dimensional, this operates along the last dimension.
-
     Parameters
     ----------
-    x : array
-        Signal to filter.
     Fs : float
         Sampling rate in Hz.
     freq : 1d array
@@ -309,14 +516,6 @@ def _filter(x, Fs, freq, gain, filter_length, picks=None, n_jobs=1,
         Filter gain at frequency sampling points.
     filter_length : int
         Length of the filter to use. Must be odd length if phase == "zero".
-    picks : array-like of int | None
-        Indices to filter. If None all indices will be filtered.
-    n_jobs : int | str
-        Number of jobs to run in parallel. Can be 'cuda' if scikits.cuda
-        is installed properly and CUDA is initialized.
-    copy : bool
-        If True, a copy of x, filtered, is returned. Otherwise, it operates
-        on x in place.
     phase : str
         If 'zero', the delay for the filter is compensated (and it must be
         an odd-length symmetric filter). If 'linear', the response is
@@ -328,12 +527,10 @@ def _filter(x, Fs, freq, gain, filter_length, picks=None, n_jobs=1,
 
     Returns
     -------
-    xf : array
-        x filtered.
+    filt : dict
+        The filter coefficients ``h`` and the ``phase``.
     """
     firwin2 = get_firwin2()
-    # set up array for filtering, reshape to 2D, operate on last axis
-    x, orig_shape, picks = _prep_for_filtering(x, copy, picks)
 
     # issue a warning if attenuation is less than this
     min_att_db = 20
@@ -344,25 +541,81 @@ def _filter(x, Fs, freq, gain, filter_length, picks=None, n_jobs=1,
         raise ValueError('freq must start at 0 and end an Nyquist (%s), got %s'
                          % (Fs / 2., freq))
     gain = np.array(gain)
-    n_jobs = check_n_jobs(n_jobs, allow_cuda=True)
 
     # Use overlap-add filter with a fixed length
     N = _check_zero_phase_length(filter_length, phase, gain[-1])
-    # construct symmetric (linear phase) filter
-    h = firwin2(N, freq, gain, window=fir_window)
-    att_db, att_freq = _filter_attenuation(h, freq, gain)
-    if phase == 'zero-double':
-        att_db += 6
-    if att_db < min_att_db:
-        att_freq *= Fs / 2.
-        warn('Attenuation at stop frequency %0.1fHz is only %0.1fdB. '
-             'Increase filter_length for higher attenuation.'
-             % (att_freq, att_db))
-    x = _overlap_add_filter(x, h, phase=phase, picks=picks, n_jobs=n_jobs)
-    x.shape = orig_shape
+    # the same filter is often designed many times (e.g., for each epoch)
+    cache = _get_filter_cache()
+    key = ('design', float(Fs), tuple(freq.tolist()), tuple(gain.tolist()),
+           N, phase, fir_window)
+    cached = cache.get(key)
+    if cached is not None:
+        h, msg = cached
+    else:
+        # construct symmetric (linear phase) filter
+        h = firwin2(N, freq, gain, window=fir_window)
+        att_db, att_freq = _filter_attenuation(h, freq, gain)
+        if phase == 'zero-double':
+            att_db += 6
+        msg = None
+        if att_db < min_att_db:
+            att_freq *= Fs / 2.
+            msg = ('Attenuation at stop frequency %0.1fHz is only %0.1fdB. '
+                   'Increase filter_length for higher attenuation.'
+                   % (att_freq, att_db))
+        cache.add(key, (h, msg))
+    if msg is not None:
+        warn(msg)
+    return dict(h=h, phase=phase)
+
+
+def _apply_filters(x, filters, picks=None, n_jobs=1, copy=True):
+    """Apply designed FIR and IIR filters one after the other.
+
+    If x is multi-dimensional, this operates along the last dimension.
+
+    Parameters
+    ----------
+    x : array
+        Signal to filter.
+    filters : list of dict
+        The FIR filters (see :func:`_design_fir`) and IIR filters (see
+        :func:`construct_iir_filter`) to apply.
+    picks : array-like of int | None
+        Indices to filter. If None all indices will be filtered.
+    n_jobs : int | str
+        Number of jobs to run in parallel. Can be 'cuda' if scikits.cuda
+        is installed properly and CUDA is initialized (FIR filters only).
+    copy : bool
+        If True, a copy of x, filtered, is returned. Otherwise, it operates
+        on x in place.
+
+    Returns
+    -------
+    xf : array
+        x filtered.
+    """
+    for filt in filters:
+        if 'h' in filt:
+            # set up array for filtering, reshape to 2D, operate on last axis
+            x, orig_shape, use_picks = _prep_for_filtering(x, copy, picks)
+            x = _overlap_add_filter(x, filt['h'], phase=filt['phase'],
+                                    picks=use_picks,
+                                    n_jobs=check_n_jobs(n_jobs,
+                                                        allow_cuda=True))
+            x.shape = orig_shape
+        else:
+            x = _filtfilt(x, filt, picks, n_jobs, copy)
+        copy = False
     return x
 
 
+def _filters_reach(filters):
+    """Get the number of samples beyond which the filters have no effect"""
+    return sum(len(filt['h']) if 'h' in filt else filt['padlen']
+               for filt in filters)
+
+
 def _check_zero_phase_length(N, phase, gain_nyq=0):
     N = int(N)
     if N % 2 == 0:
@@ -794,6 +1047,16 @@ def filter_data(data, sfreq, l_freq, h_freq, picks=None, filter_length='auto',
     """
     if not isinstance(data, np.ndarray) or data.ndim != 2:
         raise ValueError('data must be an array with two dimensions')
+    filters = _filter_data_design(data, sfreq, l_freq, h_freq, filter_length,
+                                  l_trans_bandwidth, h_trans_bandwidth,
+                                  method, iir_params, phase, fir_window)
+    return _apply_filters(data, filters, picks, n_jobs, copy)
+
+
+def _filter_data_design(data, sfreq, l_freq, h_freq, filter_length,
+                        l_trans_bandwidth, h_trans_bandwidth, method,
+                        iir_params, phase, fir_window):
+    """Helper to design the filters used by filter_data"""
     sfreq = float(sfreq)
     if sfreq < 0:
         raise ValueError('sfreq must be positive')
@@ -806,42 +1069,318 @@ def filter_data(data, sfreq, l_freq, h_freq, picks=None, filter_length='auto',
         l_freq = float(l_freq)
         if l_freq == 0:
             l_freq = None
+    filters = list()
     if l_freq is None and h_freq is not None:
         logger.info('Low-pass filtering at %0.2g Hz' % h_freq)
-        low_pass_filter(data, sfreq, h_freq,
-                        filter_length=filter_length,
-                        trans_bandwidth=h_trans_bandwidth, method=method,
-                        iir_params=iir_params, picks=picks, n_jobs=n_jobs,
-                        copy=copy, phase=phase, fir_window=fir_window)
+        filters = _low_pass_design(data, sfreq, h_freq, filter_length,
+                                   h_trans_bandwidth, method, iir_params,
+                                   phase, fir_window)
     if l_freq is not None and h_freq is None:
         logger.info('High-pass filtering at %0.2g Hz' % l_freq)
-        high_pass_filter(
-            data, sfreq, l_freq, filter_length=filter_length,
-            trans_bandwidth=l_trans_bandwidth, method=method,
-            iir_params=iir_params, picks=picks, n_jobs=n_jobs, copy=copy,
-            phase=phase, fir_window=fir_window)
+        filters = _high_pass_design(data, sfreq, l_freq, filter_length,
+                                    l_trans_bandwidth, method, iir_params,
+                                    phase, fir_window)
     if l_freq is not None and h_freq is not None:
         if l_freq < h_freq:
             logger.info('Band-pass filtering from %0.2g - %0.2g Hz'
                         % (l_freq, h_freq))
-            data = band_pass_filter(
-                data, sfreq, l_freq, h_freq,
-                filter_length=filter_length,
-                l_trans_bandwidth=l_trans_bandwidth,
-                h_trans_bandwidth=h_trans_bandwidth,
-                method=method, iir_params=iir_params, picks=picks,
-                n_jobs=n_jobs, copy=copy, phase=phase, fir_window=fir_window)
+            filters = _band_pass_design(
+                data, sfreq, l_freq, h_freq, filter_length,
+                l_trans_bandwidth, h_trans_bandwidth, method, iir_params,
+                phase, fir_window)
         else:
             logger.info('Band-stop filtering from %0.2g - %0.2g Hz'
                         % (h_freq, l_freq))
-            data = band_stop_filter(
-                data, sfreq, h_freq, l_freq,
-                filter_length=filter_length,
-                l_trans_bandwidth=h_trans_bandwidth,
-                h_trans_bandwidth=l_trans_bandwidth, method=method,
-                iir_params=iir_params, picks=picks, n_jobs=n_jobs,
-                copy=copy, phase=phase, fir_window=fir_window)
-    return data
+            filters = _band_stop_design(
+                data, sfreq, h_freq, l_freq, filter_length,
+                h_trans_bandwidth, l_trans_bandwidth, method, iir_params,
+                phase, fir_window)
+    return filters
+
+
+class _StreamingStage(object):
+    """Helper to apply one designed filter to consecutive chunks of data
+
+    The signal is extended at both ends with an odd extension of ``edge``
+    samples like in :func:`_overlap_add_filter` and ``filtfilt``, so the
+    first output is produced once ``edge + 1`` samples were received.
+    """
+
+    def __init__(self, edge, delay):
+        self.edge = edge
+        self.delay = delay
+        self._started = False
+        self._pending = None  # samples received before the first output
+        self._last = None  # last samples received, for the odd extension
+        self._n_in = 0
+        self._n_out = 0
+        self._n_skip = edge  # output of the extension at the start
+
+    def process(self, x):
+        """Filter a chunk and return the output samples that are ready"""
+        self._n_in += x.shape[1]
+        if self._last is None:
+            self._last = x[:, :0]
+        self._last = np.concatenate([self._last, x],
+                                    axis=1)[:, -(self.edge + 1):]
+        if not self._started:
+            if self._pending is not None:
+                x = np.concatenate([self._pending, x], axis=1)
+            if x.shape[1] <= self.edge:
+                self._pending = x
+                return x[:, :0]
+            self._started, self._pending = True, None
+            x = np.concatenate([2 * x[:, :1] - x[:, self.edge:0:-1], x],
+                               axis=1)
+        return self._output(self._feed(x, final=False))
+
+    def flush(self):
+        """Return the remaining output samples at the end of the signal"""
+        if not self._started:  # too short to be extended, filter at once
+            x = self._pending
+            return x if x.shape[1] == 0 else self._filter_short(x)
+        x = 2 * self._last[:, -1:] - self._last[:, -2:-self.edge - 2:-1]
+        return self._output(self._feed(x, final=True))
+
+    def _output(self, y):
+        n_skip = min(self._n_skip, y.shape[1])
+        self._n_skip -= n_skip
+        y = y[:, n_skip:self._n_in - self._n_out + n_skip]
+        self._n_out += y.shape[1]
+        return y
+
+
+class _StreamingFIR(_StreamingStage):
+    """Overlap-add FIR filtering of consecutive chunks"""
+
+    def __init__(self, filt):
+        h, phase = filt['h'], filt['phase']
+        _check_zero_phase_length(len(h), phase)
+        self.filt = filt
+        edge = len(h) - 1
+        if phase == 'zero-double':
+            h = np.convolve(h, h[::-1])
+        self.h = h
+        delay = (len(h) - 1) // 2 if phase.startswith('zero') else 0
+        super(_StreamingFIR, self).__init__(edge, delay)
+        self._n_skip += delay  # compensate the delay of zero-phase filters
+        self._tail = None  # the overlap of the last chunk with the next
+
+    def _feed(self, x, final):
+        from scipy.signal import fftconvolve
+        if self._tail is None:
+            self._tail = np.zeros((x.shape[0], len(self.h) - 1))
+        n_x = x.shape[1]
+        if n_x == 0:
+            y = x
+        else:
+            y = fftconvolve(x, self.h[np.newaxis])
+            y[:, :len(self.h) - 1] += self._tail
+            y, self._tail = y[:, :n_x], y[:, n_x:]
+        if final:
+            y = np.concatenate([y, self._tail], axis=1)
+        return y
+
+    def _filter_short(self, x):
+        return _overlap_add_filter(x.astype(np.float64), self.filt['h'],
+                                   phase=self.filt['phase'])
+
+
+class _StreamingIIR(_StreamingStage):
+    """Forward or forward-backward IIR filtering of consecutive chunks
+
+    The backward pass of zero-phase filters starts ``padlen`` samples after
+    the last output sample, from the steady state of the last input.
+    """
+
+    def __init__(self, filt, phase):
+        self.filt = filt
+        self.phase = phase
+        if phase == 'zero':
+            edge = delay = filt['padlen']
+        else:
+            edge = delay = 0
+        super(_StreamingIIR, self).__init__(edge, delay)
+        self._zi = None
+        self._y = None  # forward-filtered samples waiting for lookahead
+
+    def _apply(self, x, zi):
+        if 'sos' in self.filt:
+            return sosfilt(self.filt['sos'], x, axis=-1, zi=zi)
+        from scipy.signal import lfilter
+        return lfilter(self.filt['b'], self.filt['a'], x, axis=-1, zi=zi)
+
+    def _steady_zi(self, x0):
+        """Get the state of the filter for a constant input x0"""
+        if 'sos' in self.filt:
+            zi = sosfilt_zi(self.filt['sos'])
+            return zi[:, np.newaxis, :] * x0[np.newaxis, :, np.newaxis]
+        from scipy.signal import lfilter_zi
+        zi = lfilter_zi(self.filt['b'], self.filt['a'])
+        return zi[np.newaxis, :] * x0[:, np.newaxis]
+
+    def _feed(self, x, final):
+        if self._zi is None:
+            # zero-phase filters start like filtfilt, causal ones at rest
+            x0 = x[:, 0] if self.phase == 'zero' else np.zeros(x.shape[0])
+            self._zi = self._steady_zi(x0)
+        if x.shape[1] > 0:
+            x, self._zi = self._apply(x, self._zi)
+        if self.phase != 'zero':
+            return x
+        self._y = x if self._y is None else \
+            np.concatenate([self._y, x], axis=1)
+        n_out = self._y.shape[1] if final else self._y.shape[1] - self.delay
+        if n_out <= 0:
+            return x[:, :0]
+        y = self._y[:, ::-1]
+        y = self._apply(y, self._steady_zi(y[:, 0]))[0][:, ::-1]
+        self._y = self._y[:, n_out:]
+        return y[:, :n_out]
+
+    def _filter_short(self, x):
+        padlen = min(self.filt['padlen'], x.shape[1] - 1)
+        if 'sos' in self.filt:
+            return get_sosfiltfilt()(self.filt['sos'], x, padlen=padlen)
+        return get_filtfilt()(self.filt['b'], self.filt['a'], x,
+                              padlen=padlen)
+
+
+class StreamingFilter(object):
+    """Filter data that arrive in consecutive chunks
+
+    The filters are designed like in :func:`filter_data`, but the state of
+    the filters is kept between calls of :meth:`process`, so that data
+    can be filtered chunk by chunk (e.g., in real time or out of core).
+    Concatenating the outputs of :meth:`process` and :meth:`flush` gives
+    the data filtered at once by :func:`filter_data` (FIR filters) or by
+    a forward IIR filter (``method='iir'`` and ``phase='causal'``).
+    Zero-phase IIR filters are approximated with a lookahead of
+    ``iir_params['padlen']`` samples.
+
+    Parameters
+    ----------
+    sfreq : float
+        The sample frequency in Hz.
+    l_freq : float | None
+        Low cut-off frequency in Hz. If None the data are only low-passed.
+    h_freq : float | None
+        High cut-off frequency in Hz. If None the data are only
+        high-passed.
+    filter_length : str | int
+        Length of the FIR filter to use (if applicable). See
+        :func:`filter_data` for details.
+    l_trans_bandwidth : float | str
+        Width of the transition band at the low cut-off frequency in Hz.
+        See :func:`filter_data` for details.
+    h_trans_bandwidth : float | str
+        Width of the transition band at the high cut-off frequency in Hz.
+        See :func:`filter_data` for details.
+    method : str
+        'fir' will use overlap-add FIR filtering, 'iir' will use IIR
+        filtering.
+    iir_params : dict | None
+        Dictionary of parameters to use for IIR filtering.
+        See mne.filter.construct_iir_filter for details. If iir_params
+        is None and method="iir", 4th order Butterworth will be used.
+    phase : str
+        Phase of the filter. For ``method='fir'``, it can be 'zero',
+        'zero-double' or 'linear' (see :func:`filter_data`). For
+        ``method='iir'``, it can be 'zero' (forward-backward filtering)
+        or 'causal' (forward filtering only).
+    fir_window : str
+        The window to use in FIR design, can be "hamming" (default),
+        "hann", or "blackman".
+    verbose : bool, str, int, or None
+        If not None, override default verbose level (see mne.verbose).
+
+    Attributes
+    ----------
+    delay : int
+        The number of samples by which the output lags the input once
+        the filters have started (the lookahead of zero-phase filters).
+
+    See Also
+    --------
+    filter_data
+    construct_iir_filter
+
+    Notes
+    -----
+    The first output samples are returned once enough samples were
+    received to extend the signal at its start like :func:`filter_data`
+    does (the length of the FIR filters, or ``padlen`` for IIR filters).
+
+    .. versionadded:: 0.13
+    """
+
+    @verbose
+    def __init__(self, sfreq, l_freq, h_freq, filter_length='auto',
+                 l_trans_bandwidth='auto', h_trans_bandwidth='auto',
+                 method='fir', iir_params=None, phase='zero',
+                 fir_window='hamming', verbose=None):
+        phases = dict(fir=('zero', 'zero-double', 'linear'),
+                      iir=('zero', 'causal'))
+        if method in phases and phase not in phases[method]:
+            raise ValueError('phase must be one of %s for method="%s", got '
+                             '"%s"' % (phases[method], method, phase))
+        if filter_length is None:
+            raise ValueError('filter_length cannot be None for streamed '
+                             'data, the length of the data is unknown')
+        # the length of the data is unknown, assume they are long enough
+        x = np.empty((0, np.iinfo(np.int32).max))
+        filters = _filter_data_design(
+            x, sfreq, l_freq, h_freq, filter_length, l_trans_bandwidth,
+            h_trans_bandwidth, method, iir_params,
+            'zero' if method == 'iir' else phase, fir_window)
+        self._stages = [_StreamingFIR(filt) if 'h' in filt else
+                        _StreamingIIR(filt, phase) for filt in filters]
+        self.delay = sum(stage.delay for stage in self._stages)
+        self._dtype = None
+
+    def process(self, chunk):
+        """Filter the next chunk of data
+
+        Parameters
+        ----------
+        chunk : ndarray, shape (n_channels, n_times)
+            The next samples of the data.
+
+        Returns
+        -------
+        out : ndarray, shape (n_channels, n_out)
+            The filtered samples that are ready, which follow the ones
+            returned before. Fewer samples than given can be returned
+            (see ``delay``).
+        """
+        if not isinstance(chunk, np.ndarray) or chunk.ndim != 2:
+            raise ValueError('chunk must be an array with two dimensions')
+        if chunk.dtype not in (np.float32, np.float64):
+            raise TypeError("Arrays passed for filtering must have a dtype of "
+                            "np.float64 or np.float32")
+        self._dtype = chunk.dtype
+        out = chunk
+        for stage in self._stages:
+            out = stage.process(out)
+        return out.astype(self._dtype, copy=False)
+
+    def flush(self):
+        """Get the last filtered samples at the end of the data
+
+        Returns
+        -------
+        out : ndarray, shape (n_channels, n_out)
+            The filtered samples that were not returned yet.
+        """
+        if self._dtype is None:
+            raise RuntimeError('No data have been processed')
+        out = None
+        for stage in self._stages:
+            # the end of the output of a filter goes through the next ones
+            out = [stage.flush()] if out is None else \
+                [stage.process(out), stage.flush()]
+            out = np.concatenate(out, axis=1)
+        return out.astype(self._dtype, copy=False)
 
 
 @verbose
@@ -958,6 +1497,16 @@ def band_pass_filter(x, Fs, Fp1, Fp2, filter_length='',
         * Fs2 = Fp2 + h_trans_bandwidth in Hz
 
     """
+    filters = _band_pass_design(x, Fs, Fp1, Fp2, filter_length,
+                                l_trans_bandwidth, h_trans_bandwidth, method,
+                                iir_params, phase, fir_window)
+    return _apply_filters(x, filters, picks, n_jobs, copy)
+
+
+def _band_pass_design(x, Fs, Fp1, Fp2, filter_length, l_trans_bandwidth,
+                      h_trans_bandwidth, method, iir_params, phase,
+                      fir_window):
+    """Helper to design a bandpass filter"""
     iir_params, method = _check_method(method, iir_params, [])
     x, Fs, Fp1, Fp2, Fs1, Fs2, filter_length, phase, fir_window = \
         _triage_filter_params(
@@ -972,14 +1521,11 @@ def band_pass_filter(x, Fs, Fp1, Fp2, filter_length='',
         if Fs2 != Fs / 2:
             freq += [Fs / 2.]
             gain += [0.]
-        xf = _filter(x, Fs, freq, gain, filter_length, picks, n_jobs, copy,
-                     phase, fir_window)
+        return [_design_fir(Fs, freq, gain, filter_length, phase,
+                            fir_window)]
     else:
-        iir_params = construct_iir_filter(iir_params, [Fp1, Fp2],
-                                          [Fs1, Fs2], Fs, 'bandpass')
-        xf = _filtfilt(x, iir_params, picks, n_jobs, copy)
-
-    return xf
+        return [construct_iir_filter(iir_params, [Fp1, Fp2], [Fs1, Fs2], Fs,
+                                     'bandpass')]
 
 
 @verbose
@@ -1095,6 +1641,16 @@ def band_stop_filter(x, Fs, Fp1, Fp2, filter_length='',
 
     Multiple stop bands can be specified using arrays.
     """
+    filters = _band_stop_design(x, Fs, Fp1, Fp2, filter_length,
+                                l_trans_bandwidth, h_trans_bandwidth, method,
+                                iir_params, phase, fir_window)
+    return _apply_filters(x, filters, picks, n_jobs, copy)
+
+
+def _band_stop_design(x, Fs, Fp1, Fp2, filter_length, l_trans_bandwidth,
+                      h_trans_bandwidth, method, iir_params, phase,
+                      fir_window):
+    """Helper to design a bandstop filter"""
     iir_params, method = _check_method(method, iir_params, [])
     Fp1 = np.array(Fp1, float).ravel()
     Fp2 = np.array(Fp2, float).ravel()
@@ -1121,15 +1677,12 @@ def band_stop_filter(x, Fs, Fp1, Fp2, filter_length='',
             gain = np.r_[gain, [1.]]
         if np.any(np.abs(np.diff(gain, 2)) > 1):
             raise ValueError('Stop bands are not sufficiently separated.')
-        xf = _filter(x, Fs, freq, gain, filter_length, picks, n_jobs, copy,
-                     phase, fir_window)
+        return [_design_fir(Fs, freq, gain, filter_length, phase,
+                            fir_window)]
     else:
-        for fp_1, fp_2, fs_1, fs_2 in zip(Fp1, Fp2, Fs1, Fs2):
-            iir_params_new = construct_iir_filter(iir_params, [fp_1, fp_2],
-                                                  [fs_1, fs_2], Fs, 'bandstop')
-            xf = _filtfilt(x, iir_params_new, picks, n_jobs, copy)
-
-    return xf
+        return [construct_iir_filter(iir_params, [fp_1, fp_2], [fs_1, fs_2],
+                                     Fs, 'bandstop')
+                for fp_1, fp_2, fs_1, fs_2 in zip(Fp1, Fp2, Fs1, Fs2)]
 
 
 @verbose
@@ -1232,6 +1785,14 @@ def low_pass_filter(x, Fs, Fp, filter_length='', trans_bandwidth=None,
 
     Where ``Fstop = Fp + trans_bandwidth``.
     """
+    filters = _low_pass_design(x, Fs, Fp, filter_length, trans_bandwidth,
+                               method, iir_params, phase, fir_window)
+    return _apply_filters(x, filters, picks, n_jobs, copy)
+
+
+def _low_pass_design(x, Fs, Fp, filter_length, trans_bandwidth, method,
+                     iir_params, phase, fir_window):
+    """Helper to design a lowpass filter"""
     iir_params, method = _check_method(method, iir_params, [])
     x, Fs, _, Fp, _, Fstop, filter_length, phase, fir_window = \
         _triage_filter_params(
@@ -1243,13 +1804,10 @@ def low_pass_filter(x, Fs, Fp, filter_length='', trans_bandwidth=None,
         if Fstop != Fs / 2.:
             freq += [Fs / 2.]
             gain += [0]
-        xf = _filter(x, Fs, freq, gain, filter_length, picks, n_jobs, copy,
-                     phase, fir_window)
+        return [_design_fir(Fs, freq, gain, filter_length, phase,
+                            fir_window)]
     else:
-        iir_params = construct_iir_filter(iir_params, Fp, Fstop, Fs, 'low')
-        xf = _filtfilt(x, iir_params, picks, n_jobs, copy)
-
-    return xf
+        return [construct_iir_filter(iir_params, Fp, Fstop, Fs, 'low')]
 
 
 @verbose
@@ -1352,6 +1910,14 @@ def high_pass_filter(x, Fs, Fp, filter_length='', trans_bandwidth=None,
 
     Where ``Fstop = Fp - trans_bandwidth``.
     """
+    filters = _high_pass_design(x, Fs, Fp, filter_length, trans_bandwidth,
+                                method, iir_params, phase, fir_window)
+    return _apply_filters(x, filters, picks, n_jobs, copy)
+
+
+def _high_pass_design(x, Fs, Fp, filter_length, trans_bandwidth, method,
+                      iir_params, phase, fir_window):
+    """Helper to design a highpass filter"""
     iir_params, method = _check_method(method, iir_params, [])
     x, Fs, Fp, _, Fstop, _, filter_length, phase, fir_window = \
         _triage_filter_params(
@@ -1363,12 +1929,10 @@ def high_pass_filter(x, Fs, Fp, filter_length='', trans_bandwidth=None,
         if Fstop != 0:
             freq = [0] + freq
             gain = [0] + gain
-        xf = _filter(x, Fs, freq, gain, filter_length, picks, n_jobs, copy,
-                     phase, fir_window)
+        return [_design_fir(Fs, freq, gain, filter_length, phase,
+                            fir_window)]
     else:
-        iir_params = construct_iir_filter(iir_params, Fp, Fstop, Fs, 'high')
-        xf = _filtfilt(x, iir_params, picks, n_jobs, copy)
-    return xf
+        return [construct_iir_filter(iir_params, Fp, Fstop, Fs, 'high')]
 
 
 @verbose
@@ -1493,7 +2057,21 @@ def notch_filter(x, Fs, freqs, filter_length='', notch_widths=None,
     cite this in publications if method 'spectrum_fit' is used.
     """
     iir_params, method = _check_method(method, iir_params, ['spectrum_fit'])
+    freqs, notch_widths = _check_notch_params(freqs, notch_widths, method)
+    if method in ['fir', 'iir']:
+        filters = _notch_design(x, Fs, freqs, filter_length, notch_widths,
+                                trans_bandwidth, method, iir_params, phase,
+                                fir_window)
+        xf = _apply_filters(x, filters, picks, n_jobs, copy)
+    elif method == 'spectrum_fit':
+        xf = _mt_spectrum_proc(x, Fs, freqs, notch_widths, mt_bandwidth,
+                               p_value, picks, n_jobs, copy)
+
+    return xf
+
 
+def _check_notch_params(freqs, notch_widths, method):
+    """Helper to check the notch frequencies and widths"""
     if freqs is not None:
         freqs = np.atleast_1d(freqs)
     elif method != 'spectrum_fit':
@@ -1513,22 +2091,18 @@ def notch_filter(x, Fs, freqs, filter_length='', notch_widths=None,
             elif len(notch_widths) != len(freqs):
                 raise ValueError('notch_widths must be None, scalar, or the '
                                  'same length as freqs')
+    return freqs, notch_widths
 
-    if method in ['fir', 'iir']:
-        # Speed this up by computing the fourier coefficients once
-        tb_2 = trans_bandwidth / 2.0
-        lows = [freq - nw / 2.0 - tb_2
-                for freq, nw in zip(freqs, notch_widths)]
-        highs = [freq + nw / 2.0 + tb_2
-                 for freq, nw in zip(freqs, notch_widths)]
-        xf = band_stop_filter(x, Fs, lows, highs, filter_length, tb_2, tb_2,
-                              method, iir_params, picks, n_jobs, copy,
-                              phase=phase, fir_window=fir_window)
-    elif method == 'spectrum_fit':
-        xf = _mt_spectrum_proc(x, Fs, freqs, notch_widths, mt_bandwidth,
-                               p_value, picks, n_jobs, copy)
 
-    return xf
+def _notch_design(x, Fs, freqs, filter_length, notch_widths, trans_bandwidth,
+                  method, iir_params, phase, fir_window):
+    """Helper to design the band-stop filters of a FIR or IIR notch filter"""
+    # Speed this up by computing the fourier coefficients once
+    tb_2 = trans_bandwidth / 2.0
+    lows = [freq - nw / 2.0 - tb_2 for freq, nw in zip(freqs, notch_widths)]
+    highs = [freq + nw / 2.0 + tb_2 for freq, nw in zip(freqs, notch_widths)]
+    return _band_stop_design(x, Fs, lows, highs, filter_length, tb_2, tb_2,
+                             method, iir_params, phase, fir_window)
 
 
 def _mt_spectrum_proc(x, sfreq, line_freqs, notch_widths, mt_bandwidth,
@@ -1670,11 +2244,11 @@ def _mt_spectrum_remove(x, sfreq, line_freqs, notch_widths,
 
 
 @verbose
-def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
-             verbose=None):
+def resample(x, up, down, npad=100, axis=-1, window='auto', n_jobs=1,
+             method='fft', verbose=None):
     """Resample the array x
 
-    Operates along the last dimension of the array.
+    Operates along the given axis of the array (by default the last one).
 
     Parameters
     ----------
@@ -1686,14 +2260,35 @@ def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
         Factor to downsample by.
     npad : int | str
         Number of samples to use at the beginning and end for padding.
-        Can be "auto" to pad to the next highest power of 2.
+        Can be "auto" to pad to the next highest power of 2. Only used
+        for ``method='fft'``.
     axis : int
         Axis along which to resample (default is the last axis).
     window : string or tuple
-        See :func:`scipy.signal.resample` for description.
+        For ``method='fft'``, the frequency-domain window (see
+        :func:`scipy.signal.resample`). For ``method='polyphase'``, the
+        window used to design the anti-aliasing FIR filter (see
+        :func:`scipy.signal.firwin`). "auto" (default) uses "boxcar" and
+        ``('kaiser', 5.0)``, respectively.
+
+        .. versionchanged:: 0.13
+           The default changed from "boxcar" to "auto".
+
     n_jobs : int | str
         Number of jobs to run in parallel. Can be 'cuda' if scikits.cuda
-        is installed properly and CUDA is initialized.
+        is installed properly and CUDA is initialized (CUDA is only used
+        for ``method='fft'``).
+    method : str
+        Can be "fft" (default) to resample the whole signal at once in the
+        frequency domain, or "polyphase" to upsample, filter with an
+        anti-aliasing FIR filter and downsample with a polyphase
+        implementation (see :class:`StreamingResampler`), which takes
+        memory and time proportional to the length of the signal. For
+        "polyphase", ``up / down`` must be a fraction with a denominator
+        of at most 10000.
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -1702,18 +2297,23 @@ def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
     xf : array
         x resampled.
 
+    See Also
+    --------
+    StreamingResampler
+
     Notes
     -----
-    This uses (hopefully) intelligent edge padding and frequency-domain
-    windowing improve scipy.signal.resample's resampling method, which
-    we have adapted for our use here. Choices of npad and window have
-    important consequences, and the default choices should work well
-    for most natural signals.
-
-    Resampling arguments are broken into "up" and "down" components for future
-    compatibility in case we decide to use an upfirdn implementation. The
-    current implementation is functionally equivalent to passing
-    up=up/down and down=1.
+    For ``method='fft'``, this uses (hopefully) intelligent edge padding and
+    frequency-domain windowing improve scipy.signal.resample's resampling
+    method, which we have adapted for our use here. Choices of npad and
+    window have important consequences, and the default choices should work
+    well for most natural signals. This method is functionally equivalent
+    to passing up=up/down and down=1.
+
+    For ``method='polyphase'``, the signal is extended at both ends with an
+    odd extension of the length of the filter (``npad`` is not used) and
+    only the output samples are computed, so the result of resampling
+    consecutive chunks with :class:`StreamingResampler` is the same.
     """
     from scipy.signal import get_window
     # check explicitly for backwards compatibility
@@ -1724,6 +2324,11 @@ def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
                "subsequent window parameter." % repr(axis))
         raise TypeError(err)
 
+    if method not in ('fft', 'polyphase'):
+        raise ValueError('method must be "fft" or "polyphase", got %r'
+                         % (method,))
+    auto_window = isinstance(window, string_types) and window == 'auto'
+
     # make sure our arithmetic will work
     x = np.asanyarray(x)
     ratio = float(up) / down
@@ -1737,6 +2342,16 @@ def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
     if x_len == 0:
         warn('x has zero length along last axis, returning a copy of x')
         return x.copy()
+    if method == 'polyphase':
+        y = _resample_polyphase(x.reshape((-1, x_len)), ratio,
+                                ('kaiser', 5.0) if auto_window else window,
+                                n_jobs)
+        y.shape = orig_shape[:-1] + (y.shape[1],)
+        if axis != orig_last_axis:
+            y = y.swapaxes(axis, orig_last_axis)
+        return y
+    if auto_window:
+        window = 'boxcar'
     bad_msg = 'npad must be "auto" or an integer'
     if isinstance(npad, string_types):
         if npad != 'auto':
@@ -1801,6 +2416,201 @@ def resample(x, up, down, npad=100, axis=-1, window='boxcar', n_jobs=1,
     return y
 
 
+def _get_up_down(ratio, max_denominator=10000):
+    """Helper to get the up and down factors of a rational resampling"""
+    frac = Fraction.from_float(float(ratio)).limit_denominator(max_denominator)
+    if abs(float(frac) - ratio) > 1e-10 * ratio:
+        raise ValueError('The ratio of the sampling rates (%s) must be a '
+                         'fraction with a denominator of at most %s'
+                         % (ratio, max_denominator))
+    return frac.numerator, frac.denominator
+
+
+def _odd_extend(x, n_start, n_end):
+    """Helper to extend the rows of x like _smart_pad"""
+    n_x = x.shape[1]
+    z_start = np.zeros((len(x), max(n_start - n_x + 1, 0)), x.dtype)
+    z_end = np.zeros((len(x), max(n_end - n_x + 1, 0)), x.dtype)
+    return np.concatenate([z_start, 2 * x[:, :1] - x[:, n_start:0:-1], x,
+                           2 * x[:, -1:] - x[:, -2:-n_end - 2:-1], z_end],
+                          axis=1)
+
+
+def _resample_polyphase(x, ratio, window, n_jobs=1):
+    """Helper to resample the rows of x in chunks with a polyphase filter"""
+    up, down = _get_up_down(ratio)
+    n_jobs = check_n_jobs(n_jobs, allow_cuda=True)
+    if n_jobs == 'cuda':
+        n_jobs = 1
+    if n_jobs > 1 and len(x) > 1:
+        parallel, p_fun, _ = parallel_func(_resample_polyphase, n_jobs)
+        return np.concatenate(parallel(
+            p_fun(x_, ratio, window) for x_ in
+            np.array_split(x, min(n_jobs, len(x)))), axis=0)
+    resampler = StreamingResampler(up, down, window)
+    dtype = np.promote_types(x.dtype, np.float32)
+    # keep the chunks (and their copies) small
+    n_chunk = max(_MAX_FFT_BLOCK_SIZE // (8 * max(len(x), 1)), 1024)
+    y = [resampler.process(x[:, start:start + n_chunk].astype(dtype))
+         for start in range(0, x.shape[1], n_chunk)]
+    y.append(resampler.flush())
+    return np.concatenate(y, axis=1)
+
+
+class StreamingResampler(object):
+    """Resample data that arrive in consecutive chunks
+
+    The data are upsampled by ``up``, low-pass filtered with an
+    anti-aliasing FIR filter, and downsampled by ``down`` with a polyphase
+    implementation that only computes the output samples, i.e. with
+    ``n_times * n_taps / up`` operations for each channel. The state of the
+    filter is kept between calls of :meth:`process`, so concatenating the
+    outputs of :meth:`process` and :meth:`flush` gives the data resampled
+    at once by :func:`resample` with ``method='polyphase'``.
+
+    Parameters
+    ----------
+    up : float
+        Factor to upsample by.
+    down : float
+        Factor to downsample by. ``up / down`` must be a fraction with a
+        denominator of at most 10000 (e.g., 256 / 1000 is 32 / 125).
+    window : str | tuple
+        The window used to design the FIR filter (see
+        :func:`scipy.signal.firwin`). The filter has
+        ``20 * max(up, down) + 1`` taps (with ``up / down`` reduced) and
+        its cut-off frequency is the lower of the two Nyquist frequencies.
+
+    Attributes
+    ----------
+    delay : int
+        The number of input samples by which the output lags the input at
+        most (half the length of the filter at the input sampling rate).
+
+    See Also
+    --------
+    resample
+    StreamingFilter
+
+    Notes
+    -----
+    Like :func:`resample`, the signal is extended at both ends with an odd
+    extension of ``delay`` samples, so the first output samples are
+    returned once ``delay + 1`` samples were received. The signal
+    resampled from ``n_times`` samples has
+    ``int(round(n_times * up / down))`` samples.
+
+    .. versionadded:: 0.13
+    """
+
+    def __init__(self, up, down, window=('kaiser', 5.0)):
+        from scipy.signal import firwin
+        self.up, self.down = _get_up_down(float(up) / down)
+        max_rate = max(self.up, self.down)
+        if max_rate == 1:
+            self._h = np.ones(1)
+        else:
+            self._h = firwin(20 * max_rate + 1, 1. / max_rate,
+                             window=window) * self.up
+        self._half = (len(self._h) - 1) // 2
+        self.delay = -(-self._half // self.up)
+        self._started = False
+        self._pending = None  # samples received before the first output
+        self._last = None  # last samples received, for the odd extension
+        self._buf = None  # extended samples needed for the next outputs
+        self._buf_start = 0  # index of the first one in the extended signal
+        self._n_in = 0
+        self._n_out = 0
+        self._dtype = None
+
+    def process(self, chunk):
+        """Resample the next chunk of data
+
+        Parameters
+        ----------
+        chunk : ndarray, shape (n_channels, n_times)
+            The next samples of the data.
+
+        Returns
+        -------
+        out : ndarray, shape (n_channels, n_out)
+            The resampled samples that are ready, which follow the ones
+            returned before (see ``delay``).
+        """
+        if not isinstance(chunk, np.ndarray) or chunk.ndim != 2:
+            raise ValueError('chunk must be an array with two dimensions')
+        if chunk.dtype not in (np.float32, np.float64):
+            raise TypeError("Arrays passed for resampling must have a dtype "
+                            "of np.float64 or np.float32")
+        self._dtype = chunk.dtype
+        self._n_in += chunk.shape[1]
+        x = chunk.astype(np.float64)
+        self._last = x if self._last is None else \
+            np.concatenate([self._last, x], axis=1)
+        self._last = self._last[:, -(self.delay + 1):]
+        if not self._started:
+            if self._pending is not None:
+                x = np.concatenate([self._pending, x], axis=1)
+            if x.shape[1] <= self.delay:
+                self._pending = x
+                return chunk[:, :0]
+            self._started, self._pending = True, None
+            x = _odd_extend(x, self.delay, 0)
+        return self._resample(x, final=False)
+
+    def flush(self):
+        """Get the last resampled samples at the end of the data
+
+        Returns
+        -------
+        out : ndarray, shape (n_channels, n_out)
+            The resampled samples that were not returned yet.
+        """
+        if self._dtype is None:
+            raise RuntimeError('No data have been processed')
+        if not self._started:  # too short to be extended, resample at once
+            x = self._pending
+            if x.shape[1] == 0:
+                return x.astype(self._dtype)
+            self._started, self._pending = True, None
+            x = _odd_extend(x, self.delay, self.delay)
+        else:
+            x = _odd_extend(self._last, 0, self.delay)
+            x = x[:, self._last.shape[1]:]
+        return self._resample(x, final=True)
+
+    def _resample(self, x, final):
+        up, down = self.up, self.down
+        self._buf = x if self._buf is None else \
+            np.concatenate([self._buf, x], axis=1)
+        buf_stop = self._buf_start + self._buf.shape[1]
+        # output m is at m * down + offset in the upsampled extended signal
+        offset = self._half + self.delay * up
+        n_stop = int(round(self._n_in * up / float(down)))
+        if not final:  # the last input sample of each output must be here
+            n_stop = min(n_stop, -(-(up * buf_stop - offset) // down))
+        n_new = max(n_stop - self._n_out, 0)
+        y = np.zeros((len(self._buf), n_new))
+        # the outputs that are up samples apart use the same filter phase
+        # and inputs that are down samples apart
+        for first in range(min(up, n_new)):
+            pos = (self._n_out + first) * down + offset
+            n_use = (n_new - first - 1) // up + 1
+            start = pos // up - self._buf_start
+            for coef in self._h[pos % up::up]:
+                y[:, first::up] += coef * self._buf[
+                    :, start:start + (n_use - 1) * down + 1:down]
+                start -= 1
+        self._n_out += n_new
+        # drop the samples that the next outputs do not need
+        n_drop = ((self._n_out * down + offset - len(self._h) + 1) // up -
+                  self._buf_start)
+        n_drop = min(max(n_drop, 0), self._buf.shape[1])
+        self._buf = self._buf[:, n_drop:]
+        self._buf_start += n_drop
+        return y.astype(self._dtype, copy=False)
+
+
 def _resample_stim_channels(stim_data, up, down):
     """Resample stim channels, carefully.
 
@@ -97,6 +97,54 @@ except AttributeError:
     Counter = _Counter
 
 
+class _OrderedDict(dict):
+    """Partial replacement for Python 2.7 collections.OrderedDict."""
+    def __init__(self):
+        super(_OrderedDict, self).__init__()
+        self._keys = list()
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._keys.append(key)
+        super(_OrderedDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super(_OrderedDict, self).__delitem__(key)
+        self._keys.remove(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def values(self):
+        return [self[key] for key in self._keys]
+
+    def items(self):
+        return [(key, self[key]) for key in self._keys]
+
+    def pop(self, key, *default):
+        if key in self:
+            self._keys.remove(key)
+        return super(_OrderedDict, self).pop(key, *default)
+
+    def popitem(self, last=True):
+        if len(self._keys) == 0:
+            raise KeyError('dictionary is empty')
+        key = self._keys[-1] if last else self._keys[0]
+        return key, self.pop(key)
+
+    def clear(self):
+        super(_OrderedDict, self).clear()
+        self._keys = list()
+
+try:
+    OrderedDict = collections.OrderedDict
+except AttributeError:
+    OrderedDict = _OrderedDict
+
+
 def _unique(ar, return_index=False, return_inverse=False):
     """A replacement for the np.unique that appeared in numpy 1.4.
 
@@ -11,6 +11,8 @@ import copy
 from copy import deepcopy
 import os
 import os.path as op
+import threading
+import time
 
 import numpy as np
 
@@ -23,22 +25,29 @@ from ..channels.channels import (ContainsMixin, UpdateChannelsMixin,
                                  SetChannelsMixin, InterpolationMixin)
 from ..channels.montage import read_montage, _set_montage, Montage
 from .compensator import set_current_comp, make_compensator
+from .utils import _ChunkCache, _SegmentedArray
 from .write import (start_file, end_file, start_block, end_block,
                     write_dau_pack16, write_float, write_double,
                     write_complex64, write_complex128, write_int,
-                    write_id, write_string, write_name_list, _get_split_size)
+                    write_id, write_string, write_name_list, _get_split_size,
+                    _ThreadedWriter)
 
 from ..filter import (filter_data, notch_filter, resample, next_fast_len,
-                      _resample_stim_channels)
+                      _resample_stim_channels, _filter_data_design,
+                      _check_method, _check_notch_params, _notch_design,
+                      _apply_filters, _filters_reach, _get_up_down,
+                      StreamingResampler)
 from ..fixes import in1d
 from ..parallel import parallel_func
 from ..utils import (_check_fname, _check_pandas_installed, sizeof_fmt,
                      _check_pandas_index_arguments, _check_copy_dep,
-                     check_fname, _get_stim_channel,
-                     logger, verbose, _time_mask, warn, SizeMixin)
+                     check_fname, _get_stim_channel, _check_float_dtype,
+                     _match_precision, logger, verbose, _time_mask, warn,
+                     SizeMixin)
 from ..viz import plot_raw, plot_raw_psd, plot_raw_psd_topo
 from ..defaults import _handle_default
 from ..externals.six import string_types
+from ..externals.six.moves import queue
 from ..event import find_events, concatenate_events
 from ..annotations import _combine_annotations, _onset_to_seconds
 
@@ -262,10 +271,12 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                  orig_format='double', dtype=np.float64, verbose=None):
         # wait until the end to preload data, but triage here
         if isinstance(preload, np.ndarray):
-            # some functions (e.g., filtering) only work w/64-bit data
-            if preload.dtype not in (np.float64, np.complex128):
-                raise RuntimeError('datatype must be float64 or complex128, '
-                                   'not %s' % preload.dtype)
+            # some functions (e.g., filtering) only work w/floating point data
+            if preload.dtype not in (np.float32, np.float64, np.complex64,
+                                     np.complex128):
+                raise RuntimeError('datatype must be float32, float64, '
+                                   'complex64 or complex128, not %s'
+                                   % preload.dtype)
             if preload.dtype != dtype:
                 raise ValueError('preload and dtype must match')
             self._data = preload
@@ -308,6 +319,7 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         self._projectors = list()
         self._projector = None
         self._dtype_ = dtype
+        self._cache = None
         self.annotations = None
         # If we have True or a string, actually do the preloading
         self._update_times()
@@ -444,6 +456,16 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         else:
             mult = None
         cals = cals.T[idx]
+        if self._cache is not None:
+            # the cached chunks are calibrated, so only the compensation and
+            # projection remain to be applied
+            if self._comp is not None:
+                cache_mult = self._comp[idx] if projector is None else \
+                    np.dot(projector[idx], self._comp)
+            elif projector is not None:
+                cache_mult = projector[idx]
+            else:
+                cache_mult = None
 
         # read from necessary files
         offset = 0
@@ -458,12 +480,260 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 raise ValueError('Bad array indexing, could be a bug')
             n_read = stop_file - start_file
             this_sl = slice(offset, offset + n_read)
-            self._read_segment_file(data[:, this_sl], idx, fi,
-                                    int(start_file), int(stop_file),
-                                    cals, mult)
+            if self._cache is None:
+                self._read_segment_file(data[:, this_sl], idx, fi,
+                                        int(start_file), int(stop_file),
+                                        cals, mult)
+            else:
+                self._read_segment_file_cached(data[:, this_sl], idx, fi,
+                                               int(start_file),
+                                               int(stop_file), cache_mult)
             offset += n_read
         return data
 
+    def _read_segment_file_cached(self, data, idx, fi, start, stop, mult):
+        """Read a segment of data from a file using the chunk cache"""
+        cache = self._cache
+        chunk_size = cache.chunk_size
+        cals = self._cals[:, np.newaxis]
+        for ci in range(start // chunk_size, (stop - 1) // chunk_size + 1):
+            this_start = max(start, ci * chunk_size)
+            this_stop = min(stop, (ci + 1) * chunk_size)
+            key = (self._filenames[fi], ci)
+            chunk = cache.get(key, this_start, this_stop)
+            if chunk is None:
+                # read all the channels of the whole chunk
+                first = max(ci * chunk_size, self._first_samps[fi])
+                last = min((ci + 1) * chunk_size, self._last_samps[fi] + 1)
+                chunk = (first, np.empty((self.info['nchan'], last - first),
+                                         dtype=self._dtype))
+                self._read_segment_file(chunk[1], slice(None), fi,
+                                        int(first), int(last), cals, None)
+                cache.add(key, *chunk)
+            first, chunk = chunk
+            chunk = chunk[:, this_start - first:this_stop - first]
+            data_view = data[:, this_start - start:this_stop - start]
+            if mult is None:
+                data_view[:] = chunk[idx]
+            else:
+                data_view[:] = np.dot(mult, chunk)
+
+    def set_cache(self, max_size, chunk_duration=1.):
+        """Cache the data read from disk in memory
+
+        Data that are not preloaded are then read from disk in chunks of all
+        channels, which are kept in a least recently used cache. Reading
+        overlapping segments (e.g., for overlapping epochs or when scrolling
+        through the data with :meth:`plot`) then does not read the same data
+        from disk again.
+
+        Parameters
+        ----------
+        max_size : int | str | None
+            The maximum amount of memory used by the cache in bytes, or a
+            string with a unit ('K', 'M' or 'G', e.g. ``'500M'``). If None,
+            the cache is disabled.
+        chunk_duration : float
+            The duration of the chunks in seconds.
+
+        Returns
+        -------
+        raw : instance of Raw
+            The raw object. Operates in place.
+
+        See Also
+        --------
+        cache_info
+
+        Notes
+        -----
+        The cache is not used when data are preloaded, and copies of the raw
+        object start with an empty cache.
+
+        .. versionadded:: 0.13
+        """
+        if max_size is None:
+            self._cache = None
+        else:
+            chunk_size = max(int(round(chunk_duration * self.info['sfreq'])),
+                             1)
+            self._cache = _ChunkCache(max_size, chunk_size)
+        return self
+
+    def cache_info(self):
+        """Get information about the cache of data read from disk
+
+        Returns
+        -------
+        cache_info : dict | None
+            The numbers of ``hits`` and ``misses``, the number of cached
+            chunks (``n_chunks``), and the ``size`` and ``max_size`` of the
+            cache in bytes. None if the cache is disabled.
+
+        See Also
+        --------
+        set_cache
+
+        Notes
+        -----
+        .. versionadded:: 0.13
+        """
+        cache = self._cache
+        if cache is None:
+            return None
+        return dict(hits=cache.hits, misses=cache.misses, n_chunks=len(cache),
+                    size=cache.size, max_size=cache.max_size)
+
+    def _clear_cache(self):
+        """Remove the cached data (e.g., if a synthesized channel changed)"""
+        if getattr(self, '_cache', None) is not None:
+            self._cache.clear()
+
+    @property
+    def _cals(self):
+        """The calibrations of the data read from disk"""
+        return self._cals_
+
+    @_cals.setter
+    def _cals(self, cals):
+        # the cached chunks were calibrated with the previous values
+        self._cals_ = cals
+        self._clear_cache()
+
+    def iter_chunks(self, duration=10., picks=None, overlap=0., tmin=0.,
+                    tmax=None, prefetch=1):
+        """Iterate over consecutive chunks of data
+
+        While a chunk is processed, the next ones are read from disk in a
+        background thread, so that reading and processing overlap.
+
+        Parameters
+        ----------
+        duration : float
+            The duration of the chunks in seconds. The last chunk can be
+            shorter.
+        picks : array-like of int | None
+            Indices of channels to include. If None, all channels are used.
+        overlap : float
+            The overlap between consecutive chunks in seconds. Must be smaller
+            than ``duration``.
+        tmin : float
+            Time in seconds of the first sample.
+        tmax : float | None
+            Time in seconds of the last sample. If None, the end of the data
+            is used.
+        prefetch : int
+            The number of chunks to read ahead. If 0, the chunks are read
+            synchronously.
+
+        Yields
+        ------
+        data : ndarray, shape (n_channels, n_times)
+            The data of the chunk. The arrays are reused for later chunks,
+            so they must not be modified and should be copied to be kept
+            beyond the current iteration.
+        times : ndarray, shape (n_times,)
+            The times of the chunk.
+
+        Notes
+        -----
+        The raw object should not be modified, and its data not be accessed
+        in other ways, while iterating over it.
+
+        .. versionadded:: 0.13
+        """
+        sfreq = self.info['sfreq']
+        n_samp = int(round(duration * sfreq))
+        n_overlap = int(round(overlap * sfreq))
+        if n_samp < 1:
+            raise ValueError('duration must be at least one sample long, got '
+                             '%s' % duration)
+        if not 0 <= n_overlap < n_samp:
+            raise ValueError('overlap must be non-negative and smaller than '
+                             'duration, got %s' % overlap)
+        prefetch = int(prefetch)
+        if prefetch < 0:
+            raise ValueError('prefetch must be non-negative, got %s'
+                             % prefetch)
+        start = int(np.floor(tmin * sfreq))
+        if tmax is None:
+            stop = self.n_times
+        else:
+            stop = min(self.time_as_index(float(tmax),
+                                          use_rounding=True)[0] + 1,
+                       self.n_times)
+        if start < 0 or start >= stop:
+            raise ValueError('No data between tmin=%s and tmax=%s'
+                             % (tmin, tmax))
+        bounds = list()
+        for first in range(start, stop, n_samp - n_overlap):
+            bounds.append((first, min(first + n_samp, stop)))
+            if bounds[-1][1] == stop:
+                break
+        sel = None if picks is None else np.atleast_1d(picks).astype(int)
+        for data, first, last in self._iter_chunks(sel, bounds, prefetch):
+            yield data, self.times[first:last]
+
+    def _iter_chunks(self, sel, bounds, prefetch):
+        """Helper to read chunks of data given by (start, stop) samples"""
+        n_channels = self.info['nchan'] if sel is None else len(sel)
+        n_max = max(stop - start for start, stop in bounds)
+        dtype = self._data.dtype if self.preload else self._dtype
+        # the chunk being used, the queued ones, and the one being read
+        buffers = [np.empty((n_channels, n_max), dtype)
+                   for _ in range(prefetch + 2 if prefetch > 0 else 1)]
+
+        def read(ii):
+            start, stop = bounds[ii]
+            data = buffers[ii % len(buffers)][:, :stop - start]
+            if self.preload:
+                data[:] = self._data[slice(None) if sel is None else sel,
+                                     start:stop]
+            else:
+                self._read_segment(start, stop, sel, data_buffer=data,
+                                   projector=self._projector,
+                                   verbose=self.verbose)
+            return data, start, stop
+
+        if prefetch == 0:
+            for ii in range(len(bounds)):
+                yield read(ii)
+            return
+        chunks = queue.Queue(prefetch)
+        done = threading.Event()
+
+        def put(item):
+            while not done.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        def run():
+            for ii in range(len(bounds)):
+                try:
+                    item = read(ii)
+                except Exception as exp:
+                    put(exp)
+                    return
+                if not put(item):
+                    return
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        try:
+            for _ in range(len(bounds)):
+                item = chunks.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            done.set()
+            thread.join()
+
     def _read_segment_file(self, data, idx, fi, start, stop, cals, mult):
         """Read a segment of data from a file
 
@@ -530,11 +800,20 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         return self[picks, start:stop][0]
 
     @verbose
-    def load_data(self, verbose=None):
+    def load_data(self, dtype=None, verbose=None):
         """Load raw data
 
         Parameters
         ----------
+        dtype : None | np.float32 | np.float64
+            The precision used to store the data in memory. Single precision
+            (``np.float32``) halves the memory needed, and the data of most
+            files are stored in single precision on disk anyway. If the data
+            were already loaded, they are converted. If None (default), the
+            precision is not changed (by default, double precision is used).
+
+            .. versionadded:: 0.13
+
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
 
@@ -550,10 +829,22 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
         .. versionadded:: 0.10.0
         """
+        self._set_precision(dtype)
         if not self.preload:
             self._preload_data(True)
         return self
 
+    def _set_precision(self, dtype):
+        """Helper to set the precision used to store the data"""
+        dtype = _check_float_dtype(dtype)
+        if dtype is None:
+            return
+        if self.preload:
+            self._data = self._data.astype(
+                _match_precision(dtype, self._data.dtype), copy=False)
+        else:
+            self._dtype_ = _match_precision(dtype, self._dtype)
+
     @verbose
     def _preload_data(self, preload, verbose=None):
         """This function actually preloads the data"""
@@ -561,6 +852,7 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                                                       np.ndarray)) else None
         logger.info('Reading %d ... %d  =  %9.3f ... %9.3f secs...' %
                     (0, len(self.times) - 1, 0., self.times[-1]))
+        self._cache = None  # everything is read at once, no need for it
         self._data = self._read_segment(data_buffer=data_buffer)
         assert len(self._data) == self.info['nchan']
         self.preload = True
@@ -878,6 +1170,7 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
     def filter(self, l_freq, h_freq, picks=None, filter_length='',
                l_trans_bandwidth=None, h_trans_bandwidth=None, n_jobs=1,
                method='fir', iir_params=None, phase='', fir_window='',
+               fname=None, overwrite=False, fmt='single', split_size='2GB',
                verbose=None):
         """Filter a subset of channels.
 
@@ -969,6 +1262,36 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
             .. versionadded:: 0.13
 
+        fname : str | None
+            If not None, the data are not modified in place. Instead, they
+            are read in overlapping blocks (so they do not need to be
+            preloaded), filtered, and written to this FIF file (see ``fmt``
+            and ``split_size``), which is then returned as a new raw instance
+            without preloading. FIR filtering gives the same result as
+            filtering the preloaded data. For IIR filtering, the blocks
+            overlap by the estimated filter ringing (``iir_params['padlen']``),
+            so the results agree within the precision of this estimate.
+
+            .. versionadded:: 0.13
+
+        overwrite : bool
+            If True, overwrite ``fname`` if it exists. Only used if
+            ``fname`` is not None.
+
+            .. versionadded:: 0.13
+
+        fmt : str
+            Format to use to save the data if ``fname`` is not None, see
+            :meth:`save`.
+
+            .. versionadded:: 0.13
+
+        split_size : string | int
+            Maximum size of each piece of the file written if ``fname`` is
+            not None, see :meth:`save`.
+
+            .. versionadded:: 0.13
+
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
             Defaults to self.verbose.
@@ -976,7 +1299,8 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The raw instance with filtered data.
+            The raw instance with filtered data (read from ``fname`` if
+            given).
 
         See Also
         --------
@@ -990,7 +1314,8 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         For more information, see the tutorials :ref:`tut_background_filtering`
         and :ref:`tut_artifacts_filter`.
         """
-        _check_preload(self, 'raw.filter')
+        if fname is None:
+            _check_preload(self, 'raw.filter')
         data_picks = _pick_data_or_ica(self.info)
         update_info = False
         if picks is None:
@@ -1008,28 +1333,42 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 logger.info('Filtering a subset of channels. The highpass and '
                             'lowpass values in the measurement info will not '
                             'be updated.')
-        filter_data(self._data, self.info['sfreq'], l_freq, h_freq, picks,
-                    filter_length, l_trans_bandwidth, h_trans_bandwidth,
-                    n_jobs, method, iir_params, copy=False, phase=phase,
-                    fir_window=fir_window)
+        if fname is None and not isinstance(self._data, _SegmentedArray):
+            info = self.info
+            filter_data(self._data, info['sfreq'], l_freq, h_freq, picks,
+                        filter_length, l_trans_bandwidth, h_trans_bandwidth,
+                        n_jobs, method, iir_params, copy=False, phase=phase,
+                        fir_window=fir_window)
+        else:
+            # segmented data are filtered in place without joining them
+            info = self.info if fname is None else deepcopy(self.info)
+            filters = _filter_data_design(
+                np.empty((0, self.n_times)), info['sfreq'], l_freq, h_freq,
+                filter_length, l_trans_bandwidth, h_trans_bandwidth, method,
+                iir_params, phase, fir_window)
+            if fname is None:
+                self._filter_segmented(filters, picks, n_jobs)
         # update info if filter is applied to all data channels,
         # and it's not a band-stop filter
         if update_info:
             if h_freq is not None and (l_freq is None or l_freq < h_freq) and \
-                    (self.info["lowpass"] is None or
-                     h_freq < self.info['lowpass']):
-                self.info['lowpass'] = float(h_freq)
+                    (info["lowpass"] is None or h_freq < info['lowpass']):
+                info['lowpass'] = float(h_freq)
             if l_freq is not None and (h_freq is None or l_freq < h_freq) and \
-                    (self.info["highpass"] is None or
-                     l_freq > self.info['highpass']):
-                self.info['highpass'] = float(l_freq)
+                    (info["highpass"] is None or l_freq > info['highpass']):
+                info['highpass'] = float(l_freq)
+        if fname is not None:
+            return self._filter_stream(fname, overwrite, fmt, split_size,
+                                       info, filters, picks, n_jobs)
         return self
 
     @verbose
     def notch_filter(self, freqs, picks=None, filter_length='',
                      notch_widths=None, trans_bandwidth=1.0, n_jobs=1,
                      method='fft', iir_params=None, mt_bandwidth=None,
-                     p_value=0.05, phase='', fir_window='', verbose=None):
+                     p_value=0.05, phase='', fir_window='', fname=None,
+                     overwrite=False, fmt='single', split_size='2GB',
+                     verbose=None):
         """Notch filter a subset of channels.
 
         Applies a zero-phase notch filter to the channels selected by
@@ -1107,6 +1446,35 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
             .. versionadded:: 0.13
 
+        fname : str | None
+            If not None, the data are not modified in place. Instead, they
+            are read in overlapping blocks (so they do not need to be
+            preloaded), filtered, and written to this FIF file (see ``fmt``
+            and ``split_size``), which is then returned as a new raw instance
+            without preloading. This is not possible for
+            ``method='spectrum_fit'``. For the other methods, the results are
+            the same as for :meth:`filter`.
+
+            .. versionadded:: 0.13
+
+        overwrite : bool
+            If True, overwrite ``fname`` if it exists. Only used if
+            ``fname`` is not None.
+
+            .. versionadded:: 0.13
+
+        fmt : str
+            Format to use to save the data if ``fname`` is not None, see
+            :meth:`save`.
+
+            .. versionadded:: 0.13
+
+        split_size : string | int
+            Maximum size of each piece of the file written if ``fname`` is
+            not None, see :meth:`save`.
+
+            .. versionadded:: 0.13
+
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
             Defaults to self.verbose.
@@ -1114,7 +1482,8 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The raw instance with filtered data.
+            The raw instance with filtered data (read from ``fname`` if
+            given).
 
         See Also
         --------
@@ -1132,6 +1501,21 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 raise RuntimeError('Could not find any valid channels for '
                                    'your Raw object. Please contact the '
                                    'MNE-Python developers.')
+        if fname is not None:
+            iir_params, method = _check_method(method, iir_params,
+                                               ['spectrum_fit'])
+            if method == 'spectrum_fit':
+                raise ValueError('method="spectrum_fit" cannot be used with '
+                                 'fname')
+            freqs, notch_widths = _check_notch_params(freqs, notch_widths,
+                                                      method)
+            filters = _notch_design(
+                np.empty((0, self.n_times)), fs, freqs, filter_length,
+                notch_widths, trans_bandwidth, method, iir_params, phase,
+                fir_window)
+            return self._filter_stream(fname, overwrite, fmt, split_size,
+                                       deepcopy(self.info), filters, picks,
+                                       n_jobs)
         _check_preload(self, 'raw.notch_filter')
         self._data = notch_filter(
             self._data, fs, freqs, filter_length=filter_length,
@@ -1142,8 +1526,10 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         return self
 
     @verbose
-    def resample(self, sfreq, npad='auto', window='boxcar', stim_picks=None,
-                 n_jobs=1, events=None, copy=None, verbose=None):
+    def resample(self, sfreq, npad='auto', window='auto', stim_picks=None,
+                 n_jobs=1, events=None, copy=None, fname=None,
+                 overwrite=False, method='fft', fmt='single', split_size='2GB',
+                 verbose=None):
         """Resample all channels.
 
         The Raw object has to have the data loaded e.g. with ``preload=True``
@@ -1171,10 +1557,19 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         npad : int | str
             Amount to pad the start and end of the data.
             Can also be "auto" to use a padding that will result in
-            a power-of-two size (can be much faster).
+            a power-of-two size (can be much faster). Only used for
+            ``method='fft'``.
         window : string or tuple
-            Frequency-domain window to use in resampling.
-            See :func:`scipy.signal.resample`.
+            Frequency-domain window to use in resampling
+            (see :func:`scipy.signal.resample`) for ``method='fft'``, or
+            the window of the anti-aliasing FIR filter for
+            ``method='polyphase'`` (see :func:`mne.filter.resample`).
+            "auto" (default) uses "boxcar" and ``('kaiser', 5.0)``,
+            respectively.
+
+            .. versionchanged:: 0.13
+               The default changed from "boxcar" to "auto".
+
         stim_picks : array of int | None
             Stim channels. These channels are simply subsampled or
             supersampled (without applying any filtering). This reduces
@@ -1190,6 +1585,51 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         copy : bool
             Whether to operate on a copy of the data (True) or modify data
             in-place (False). Defaults to False.
+        fname : str | None
+            If not None, the data are not modified in place. Instead, they
+            are read in overlapping blocks (so they do not need to be
+            preloaded), resampled, and written to this FIF file (see
+            ``fmt`` and ``split_size``), which is then returned as a new raw
+            instance without preloading. The blocks overlap by a few
+            seconds, which makes the results agree with resampling the
+            preloaded data except for small differences close to the edges
+            of the data. The ratio of the sampling rates must be a fraction
+            with a denominator of at most 10000 (e.g., 1000 to 256 Hz, which
+            is 32 / 125).
+
+            .. versionadded:: 0.13
+
+        overwrite : bool
+            If True, overwrite ``fname`` if it exists. Only used if
+            ``fname`` is not None.
+
+            .. versionadded:: 0.13
+
+        method : str
+            Can be "fft" (default) to resample each file at once in the
+            frequency domain, or "polyphase" to filter with an
+            anti-aliasing FIR filter and compute only the new samples
+            (see :func:`mne.filter.resample`). "polyphase" takes time
+            proportional to the length of the data, and with ``fname``
+            the blocks only overlap by the length of the filter and the
+            results are the same as resampling the preloaded data. The
+            ratio of the sampling rates must be a fraction with a
+            denominator of at most 10000.
+
+            .. versionadded:: 0.13
+
+        fmt : str
+            Format to use to save the data if ``fname`` is not None, see
+            :meth:`save`.
+
+            .. versionadded:: 0.13
+
+        split_size : string | int
+            Maximum size of each piece of the file written if ``fname`` is
+            not None, see :meth:`save`.
+
+            .. versionadded:: 0.13
+
         verbose : bool, str, int, or None
             If not None, override default verbose level (see mne.verbose).
             Defaults to self.verbose.
@@ -1197,7 +1637,8 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         Returns
         -------
         raw : instance of Raw
-            The resampled version of the raw object.
+            The resampled version of the raw object (read from ``fname`` if
+            given).
 
         See Also
         --------
@@ -1209,8 +1650,11 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         For some data, it may be more accurate to use ``npad=0`` to reduce
         artifacts. This is dataset dependent -- check your data!
         """  # noqa
-        _check_preload(self, 'raw.resample')
-        inst = _check_copy_dep(self, copy)
+        if fname is None:
+            _check_preload(self, 'raw.resample')
+            inst = _check_copy_dep(self, copy)
+        else:
+            inst = self
 
         # When no event object is supplied, some basic detection of dropped
         # events is performed to generate a warning. Finding events can fail
@@ -1227,8 +1671,6 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         o_sfreq = float(inst.info['sfreq'])
 
         offsets = np.concatenate(([0], np.cumsum(inst._raw_lengths)))
-        new_data = list()
-
         ratio = sfreq / o_sfreq
 
         # set up stim channel processing
@@ -1237,31 +1679,38 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                                     stim=True, exclude=[])
         stim_picks = np.asanyarray(stim_picks)
 
-        for ri in range(len(inst._raw_lengths)):
-            data_chunk = inst._data[:, offsets[ri]:offsets[ri + 1]]
-            new_data.append(resample(data_chunk, sfreq, o_sfreq, npad,
-                                     window=window, n_jobs=n_jobs))
-            new_ntimes = new_data[ri].shape[1]
-
-            # In empirical testing, it was faster to resample all channels
-            # (above) and then replace the stim channels than it was to only
-            # resample the proper subset of channels and then use np.insert()
-            # to restore the stims.
-            if len(stim_picks) > 0:
-                stim_resampled = _resample_stim_channels(
-                    data_chunk[stim_picks], new_data[ri].shape[1],
-                    data_chunk.shape[1])
-                new_data[ri][stim_picks] = stim_resampled
-
-            inst._first_samps[ri] = int(inst._first_samps[ri] * ratio)
-            inst._last_samps[ri] = inst._first_samps[ri] + new_ntimes - 1
-            inst._raw_lengths[ri] = new_ntimes
-
-        inst._data = np.concatenate(new_data, axis=1)
-        inst.info['sfreq'] = sfreq
-        if inst.info.get('lowpass') is not None:
-            inst.info['lowpass'] = min(inst.info['lowpass'], sfreq / 2.)
-        inst._update_times()
+        if fname is None:
+            new_data = list()
+            for ri in range(len(inst._raw_lengths)):
+                data_chunk = inst._data[:, offsets[ri]:offsets[ri + 1]]
+                new_data.append(resample(data_chunk, sfreq, o_sfreq, npad,
+                                         window=window, n_jobs=n_jobs,
+                                         method=method))
+                new_ntimes = new_data[ri].shape[1]
+
+                # In empirical testing, it was faster to resample all
+                # channels (above) and then replace the stim channels than it
+                # was to only resample the proper subset of channels and then
+                # use np.insert() to restore the stims.
+                if len(stim_picks) > 0:
+                    stim_resampled = _resample_stim_channels(
+                        data_chunk[stim_picks], new_data[ri].shape[1],
+                        data_chunk.shape[1])
+                    new_data[ri][stim_picks] = stim_resampled
+
+                inst._first_samps[ri] = int(inst._first_samps[ri] * ratio)
+                inst._last_samps[ri] = inst._first_samps[ri] + new_ntimes - 1
+                inst._raw_lengths[ri] = new_ntimes
+
+            inst._data = np.concatenate(new_data, axis=1)
+            inst.info['sfreq'] = sfreq
+            if inst.info.get('lowpass') is not None:
+                inst.info['lowpass'] = min(inst.info['lowpass'], sfreq / 2.)
+            inst._update_times()
+        else:
+            inst = self._resample_stream(fname, overwrite, fmt, split_size,
+                                         sfreq, npad, window, stim_picks,
+                                         n_jobs, method)
 
         # See the comment above why we ignore all errors here.
         if events is None:
@@ -1283,10 +1732,114 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
 
             events[:, 0] = np.minimum(
                 np.round(events[:, 0] * ratio).astype(int),
-                inst._data.shape[1]
+                inst.n_times
             )
             return inst, events
 
+    def _filter_stream(self, fname, overwrite, fmt, split_size, info,
+                       filters, picks, n_jobs):
+        """Helper to filter the data block by block into a new file"""
+        blocks = _filter_blocks(self.n_times, info['sfreq'], filters)
+
+        def process(data):
+            return _apply_filters(data, filters, picks, n_jobs, copy=False)
+
+        return self._write_stream(fname, overwrite, fmt, split_size, info,
+                                  self.first_samp, self.n_times, blocks,
+                                  process)
+
+    def _filter_segmented(self, filters, picks, n_jobs):
+        """Helper to filter segmented data in place block by block"""
+        picks = np.arange(self.info['nchan']) if picks is None else picks
+        if any('h' not in filt for filt in filters):
+            # IIR filters are applied forward and backward across all data,
+            # which blocks could only approximate, so the contiguous data of
+            # one channel at a time are filtered instead
+            for pick in picks:
+                self._data[pick] = _apply_filters(
+                    self._data[pick][np.newaxis], filters, None, n_jobs,
+                    copy=False)[0]
+            return
+        # the input of each block is read before the output of the previous
+        # block overwrites the samples they share
+        blocks = _filter_blocks(self.n_times, self.info['sfreq'], filters)
+        data = self._data[picks, blocks[0][0]:blocks[0][1]]
+        for bi, (_, _, start, stop, offset) in enumerate(blocks):
+            data = _apply_filters(data, filters, None, n_jobs, copy=False)
+            data_out = data[:, offset:offset + stop - start]
+            if bi + 1 < len(blocks):
+                data = self._data[picks, blocks[bi + 1][0]:blocks[bi + 1][1]]
+            self._data[picks, start:stop] = data_out
+
+    def _resample_stream(self, fname, overwrite, fmt, split_size, sfreq,
+                         npad, window, stim_picks, n_jobs, method):
+        """Helper to resample the data block by block into a new file"""
+        o_sfreq = float(self.info['sfreq'])
+        ratio = sfreq / o_sfreq
+        up, down = _get_up_down(ratio)
+        # the blocks (and their overlap) start at samples that fall on the
+        # new sampling grid. The FIR filter of the polyphase method only
+        # needs the samples of its length, FFTs get at least 2 sec.
+        if method == 'polyphase':
+            n_margin = StreamingResampler(up, down).delay + 1
+        else:
+            n_margin = 2. * o_sfreq
+        n_margin = down * int(np.ceil(n_margin / float(down)))
+        n_block = down * int(np.ceil(max(10. * o_sfreq, 4 * n_margin) / down))
+        blocks = list()
+        in_offset = out_offset = 0
+        # the files of concatenated raw instances are resampled separately
+        for n_in in self._raw_lengths:
+            n_out = int(round(ratio * n_in))
+            for start in range(0, n_in, n_block):
+                stop = min(start + n_block, n_in)
+                in_start = max(start - n_margin, 0)
+                blocks.append((in_offset + in_start,
+                               in_offset + min(stop + n_margin, n_in),
+                               out_offset + start * up // down,
+                               out_offset + (n_out if stop == n_in
+                                             else stop * up // down),
+                               (start - in_start) * up // down))
+            in_offset += n_in
+            out_offset += n_out
+
+        def process(data):
+            data_new = resample(data, sfreq, o_sfreq, npad, window=window,
+                                n_jobs=n_jobs, method=method)
+            if len(stim_picks) > 0:
+                data_new[stim_picks] = _resample_stim_channels(
+                    data[stim_picks], up, down)
+            return data_new
+
+        info = deepcopy(self.info)
+        info['sfreq'] = sfreq
+        if info.get('lowpass') is not None:
+            info['lowpass'] = min(info['lowpass'], sfreq / 2.)
+        return self._write_stream(fname, overwrite, fmt, split_size, info,
+                                  int(self._first_samps[0] * ratio),
+                                  out_offset, blocks, process)
+
+    def _write_stream(self, fname, overwrite, fmt, split_size, info,
+                      first_samp, n_times, blocks, process):
+        """Helper to write data processed block by block to a new file"""
+        from .fiff.raw import read_raw_fif
+        check_fname(fname, 'raw', ('raw.fif', 'raw_sss.fif', 'raw_tsss.fif',
+                                   'raw.fif.gz', 'raw_sss.fif.gz',
+                                   'raw_tsss.fif.gz'))
+        fname = op.realpath(fname)
+        if fname in self._filenames:
+            raise ValueError('You cannot write the processed data to the file '
+                             'they are read from. Please use a different '
+                             'filename.')
+        data_type, reset_range = _get_fmt_type(fmt)
+        split_size = _get_split_size(split_size)
+        _check_fname(fname, overwrite)
+        stream = _RawStream(self, first_samp, n_times, blocks, process)
+        _write_raw(fname, stream, info, None, fmt, data_type, reset_range, 0,
+                   n_times, int(np.ceil(10. * info['sfreq'])), None, False,
+                   split_size, 0, None)
+        return read_raw_fif(fname, add_eeg_ref=False, verbose=self.verbose)
+
     def crop(self, tmin=0.0, tmax=None, copy=None):
         """Crop raw data file.
 
@@ -1359,7 +1912,10 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             File name of the new dataset. This has to be a new filename
             unless data have been preloaded. Filenames should end with
             raw.fif, raw.fif.gz, raw_sss.fif, raw_sss.fif.gz, raw_tsss.fif
-            or raw_tsss.fif.gz.
+            or raw_tsss.fif.gz. Files ending with .gz are compressed in
+            independent blocks, so that they can be read without
+            decompressing them from the beginning (they remain readable by
+            any gzip tool).
         picks : array-like of int | None
             Indices of channels to include. If None all channels are kept.
         tmin : float | None
@@ -1431,16 +1987,7 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
                 warn('Saving raw file with complex data. Loading with '
                      'command-line MNE tools will not work.')
 
-        type_dict = dict(short=FIFF.FIFFT_DAU_PACK16,
-                         int=FIFF.FIFFT_INT,
-                         single=FIFF.FIFFT_FLOAT,
-                         double=FIFF.FIFFT_DOUBLE)
-        if fmt not in type_dict.keys():
-            raise ValueError('fmt must be "short", "int", "single", '
-                             'or "double"')
-        reset_dict = dict(short=False, int=False, single=True, double=True)
-        reset_range = reset_dict[fmt]
-        data_type = type_dict[fmt]
+        data_type, reset_range = _get_fmt_type(fmt)
 
         data_test = self[0, 0][0]
         if fmt == 'short' and np.iscomplexobj(data_test):
@@ -1851,7 +2398,7 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         else:
             self.info['bads'] = []
 
-    def append(self, raws, preload=None):
+    def append(self, raws, preload=None, copy_data=True):
         """Concatenate raw instances as if they were continuous
 
         Parameters
@@ -1867,6 +2414,23 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             on the hard drive (slower, requires less memory). If preload is
             None, preload=True or False is inferred using the preload status
             of the raw files passed in.
+        copy_data : bool
+            If True (default), the data are copied into one new array. If
+            False and preload is True, the data of each instance are kept as
+            a segment of the data of the concatenated instance instead, so
+            appending needs no additional memory (see Notes).
+
+            .. versionadded:: 0.13
+
+        Notes
+        -----
+        With ``copy_data=False``, the data are shared with the instances in
+        ``raws``: modifying the data of the concatenated instance in place
+        (e.g. with ``filter`` or ``add_events``) also modifies the data of
+        the instances in ``raws``, and vice versa. Indexing the raw instance,
+        ``filter``, ``save`` and in-place arithmetic on ``raw._data`` work
+        across the segments, but indexing ``raw._data`` returns copies and
+        other operations on it work on a contiguous copy of the data.
         """
         if not isinstance(raws, list):
             raws = [raws]
@@ -1899,22 +2463,41 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
             else:
                 this_data = self._data
 
-            # allocate the buffer
-            if isinstance(preload, string_types):
-                _data = np.memmap(preload, mode='w+', dtype=this_data.dtype,
-                                  shape=(nchan, nsamp))
-            else:
-                _data = np.empty((nchan, nsamp), dtype=this_data.dtype)
+            if copy_data or isinstance(preload, string_types):
+                # allocate the buffer
+                if isinstance(preload, string_types):
+                    _data = np.memmap(preload, mode='w+',
+                                      dtype=this_data.dtype,
+                                      shape=(nchan, nsamp))
+                else:
+                    _data = np.empty((nchan, nsamp), dtype=this_data.dtype)
 
-            _data[:, 0:c_ns[0]] = this_data
+                _data[:, 0:c_ns[0]] = this_data
 
-            for ri in range(len(raws)):
-                if not raws[ri].preload:
-                    # read the data directly into the buffer
-                    data_buffer = _data[:, c_ns[ri]:c_ns[ri + 1]]
-                    raws[ri]._read_segment(data_buffer=data_buffer)
-                else:
-                    _data[:, c_ns[ri]:c_ns[ri + 1]] = raws[ri]._data
+                for ri in range(len(raws)):
+                    if not raws[ri].preload:
+                        # read the data directly into the buffer
+                        data_buffer = _data[:, c_ns[ri]:c_ns[ri + 1]]
+                        raws[ri]._read_segment(data_buffer=data_buffer)
+                    else:
+                        _data[:, c_ns[ri]:c_ns[ri + 1]] = raws[ri]._data
+            else:
+                # keep the data of each instance as a segment instead of
+                # copying them into one buffer
+                segments = list()
+                for ri, data in enumerate([this_data] + raws):
+                    if ri > 0:
+                        data = data._data if data.preload else \
+                            data._read_segment()
+                    for seg in (data._segments if isinstance(
+                            data, _SegmentedArray) else [data]):
+                        if seg.dtype != this_data.dtype:
+                            seg = seg.astype(this_data.dtype)
+                        elif any(np.may_share_memory(seg, s)
+                                 for s in segments):
+                            seg = seg.copy()  # e.g. appended to itself
+                        segments.append(seg)
+                _data = _SegmentedArray(segments)
             self._data = _data
             self.preload = True
 
@@ -2007,6 +2590,21 @@ class _BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin,
         return int(np.ceil(buffer_size_sec * self.info['sfreq']))
 
 
+def _filter_blocks(n_times, sfreq, filters):
+    """Get overlapping blocks of samples to filter one at a time"""
+    # the blocks overlap by the reach of the filters, so the filtered
+    # data we keep are not affected by the block edges
+    n_margin = _filters_reach(filters)
+    n_block = max(int(np.ceil(10. * sfreq)), 4 * n_margin)
+    blocks = list()
+    for start in range(0, n_times, n_block):
+        stop = min(start + n_block, n_times)
+        in_start = max(start - n_margin, 0)
+        blocks.append((in_start, min(stop + n_margin, n_times),
+                       start, stop, start - in_start))
+    return blocks
+
+
 def _check_preload(raw, msg):
     """Helper to ensure data are preloaded"""
     if not raw.preload:
@@ -2063,15 +2661,89 @@ class _RawShell():
         return self.last_samp - self.first_samp + 1
 
 
+class _RawStream(object):
+    """Used for writing the data of a raw object processed block by block
+
+    Parameters
+    ----------
+    raw : instance of Raw
+        The raw object to read from.
+    first_samp : int
+        The first sample of the processed data.
+    n_times : int
+        The number of processed samples.
+    blocks : list of tuple
+        The input start and stop samples, the output start and stop samples,
+        and the index of the output start in the processed block.
+    process : callable
+        Function that takes the data of a block and returns the processed
+        data. It can operate in place.
+    """
+
+    def __init__(self, raw, first_samp, n_times, blocks, process):
+        self._raw = raw
+        self.first_samp = first_samp
+        self.n_times = n_times
+        self.annotations = raw.annotations
+        self._blocks = blocks
+        self._process = process
+
+    def _iter_blocks(self, start):
+        """Yield the start and data of the processed blocks after start"""
+        blocks = [block for block in self._blocks if block[3] > start]
+        chunks = self._raw._iter_chunks(
+            None, [block[:2] for block in blocks], 1)
+        try:
+            for block, (data, _, _) in zip(blocks, chunks):
+                out_start, out_stop, offset = block[2:]
+                data = self._process(data)
+                yield out_start, data[:, offset:offset + out_stop - out_start]
+        finally:
+            chunks.close()
+
+    def _iter_chunks(self, sel, bounds, prefetch):
+        """Yield the processed data in chunks given by (start, stop)"""
+        blocks = self._iter_blocks(bounds[0][0])
+        n_channels = self._raw.info['nchan']
+        first, data = next(blocks)
+        try:
+            for start, stop in bounds:
+                out = np.empty((n_channels, stop - start))
+                pos = start
+                while pos < stop:
+                    while first + data.shape[1] <= pos:
+                        first, data = next(blocks)
+                    n_use = min(stop, first + data.shape[1]) - pos
+                    out[:, pos - start:pos - start + n_use] = \
+                        data[:, pos - first:pos - first + n_use]
+                    pos += n_use
+                yield out if sel is None else out[sel], start, stop
+        finally:
+            blocks.close()
+
+
 ###############################################################################
 # Writing
+def _get_fmt_type(fmt):
+    """Helper to get the FIF data type and range reset of a save format"""
+    type_dict = dict(short=FIFF.FIFFT_DAU_PACK16,
+                     int=FIFF.FIFFT_INT,
+                     single=FIFF.FIFFT_FLOAT,
+                     double=FIFF.FIFFT_DOUBLE)
+    if fmt not in type_dict.keys():
+        raise ValueError('fmt must be "short", "int", "single", '
+                         'or "double"')
+    reset_dict = dict(short=False, int=False, single=True, double=True)
+    return type_dict[fmt], reset_dict[fmt]
+
+
 def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                stop, buffer_size, projector, drop_small_buffer,
                split_size, part_idx, prev_fname):
     """Write raw file with splitting
     """
     # we've done something wrong if we hit this
-    n_times_max = len(raw.times)
+    n_times_max = raw.n_times
     if start >= stop or stop > n_times_max:
         raise RuntimeError('Cannot write raw file with no data: %s -> %s '
                            '(max: %s) requested' % (start, stop, n_times_max))
@@ -2086,7 +2758,6 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
 
     fid, cals = _start_writing_raw(use_fname, info, picks, data_type,
                                    reset_range, raw.annotations)
-    use_picks = slice(None) if picks is None else picks
 
     first_samp = raw.first_samp + start
     if first_samp != 0:
@@ -2109,57 +2780,76 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                          'value for split size: %s plus enough bytes for '
                          'the chosen buffer_size' % pos_prev)
     next_file_buffer = 2 ** 20  # extra cushion for last few post-data tags
-    for first in range(start, stop, buffer_size):
-        # Write blocks <= buffer_size in size
-        last = min(first + buffer_size, stop)
-        data, times = raw[use_picks, first:last]
-        assert len(times) == last - first
-
-        if projector is not None:
-            data = np.dot(projector, data)
-
-        if ((drop_small_buffer and (first > start) and
-             (len(times) < buffer_size))):
-            logger.info('Skipping data chunk due to small buffer ... '
-                        '[done]')
-            break
-        logger.info('Writing ...')
-        _write_raw_buffer(fid, data, cals, fmt)
-
-        pos = fid.tell()
-        this_buff_size_bytes = pos - pos_prev
-        overage = pos - split_size + next_file_buffer
-        if overage > 0:
-            # This should occur on the first buffer write of the file, so
-            # we should mention the space required for the meas info
-            raise ValueError(
-                'buffer size (%s) is too large for the given split size (%s) '
-                'by %s bytes after writing info (%s) and leaving enough space '
-                'for end tags (%s): decrease "buffer_size_sec" or increase '
-                '"split_size".' % (this_buff_size_bytes, split_size, overage,
-                                   pos_prev, next_file_buffer))
-
-        # Split files if necessary, leave some space for next file info
-        # make sure we check to make sure we actually *need* another buffer
-        # with the "and" check
-        if pos >= split_size - this_buff_size_bytes - next_file_buffer and \
-                first + buffer_size < stop:
-            next_fname, next_idx = _write_raw(
-                fname, raw, info, picks, fmt,
-                data_type, reset_range, first + buffer_size, stop, buffer_size,
-                projector, drop_small_buffer, split_size,
-                part_idx + 1, use_fname)
-
-            start_block(fid, FIFF.FIFFB_REF)
-            write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
-            write_string(fid, FIFF.FIFF_REF_FILE_NAME, op.basename(next_fname))
-            if info['meas_id'] is not None:
-                write_id(fid, FIFF.FIFF_REF_FILE_ID, info['meas_id'])
-            write_int(fid, FIFF.FIFF_REF_FILE_NUM, next_idx)
-            end_block(fid, FIFF.FIFFB_REF)
-            break
-
-        pos_prev = pos
+    # Write blocks <= buffer_size in size: the next one is read in the
+    # background while the current one is converted, and the converted data
+    # are written to disk in another background thread
+    bounds = [(first, min(first + buffer_size, stop))
+              for first in range(start, stop, buffer_size)]
+    chunks = raw._iter_chunks(picks, bounds, 1)
+    writer = _ThreadedWriter(fid)
+    t_start = time.time()
+    try:
+        for data, first, last in chunks:
+            if projector is not None:
+                data = np.dot(projector, data)
+
+            if ((drop_small_buffer and (first > start) and
+                 (last - first < buffer_size))):
+                logger.info('Skipping data chunk due to small buffer ... '
+                            '[done]')
+                break
+            logger.info('Writing ... samples %d - %d of %d'
+                        % (first, last, stop))
+            _write_raw_buffer(writer, data, cals, fmt)
+
+            pos = writer.tell()
+            this_buff_size_bytes = pos - pos_prev
+            overage = pos - split_size + next_file_buffer
+            if overage > 0:
+                # This should occur on the first buffer write of the file, so
+                # we should mention the space required for the meas info
+                raise ValueError(
+                    'buffer size (%s) is too large for the given split size '
+                    '(%s) by %s bytes after writing info (%s) and leaving '
+                    'enough space for end tags (%s): decrease '
+                    '"buffer_size_sec" or increase "split_size".'
+                    % (this_buff_size_bytes, split_size, overage, pos_prev,
+                       next_file_buffer))
+
+            # Split files if necessary, leave some space for next file info
+            # make sure we check to make sure we actually *need* another
+            # buffer with the "and" check
+            if pos >= split_size - this_buff_size_bytes - next_file_buffer \
+                    and first + buffer_size < stop:
+                chunks.close()
+                # the last buffers of this file are written meanwhile
+                next_fname, next_idx = _write_raw(
+                    fname, raw, info, picks, fmt,
+                    data_type, reset_range, first + buffer_size, stop,
+                    buffer_size, projector, drop_small_buffer, split_size,
+                    part_idx + 1, use_fname)
+                writer.finish()
+
+                start_block(fid, FIFF.FIFFB_REF)
+                write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
+                write_string(fid, FIFF.FIFF_REF_FILE_NAME,
+                             op.basename(next_fname))
+                if info['meas_id'] is not None:
+                    write_id(fid, FIFF.FIFF_REF_FILE_ID, info['meas_id'])
+                write_int(fid, FIFF.FIFF_REF_FILE_NUM, next_idx)
+                end_block(fid, FIFF.FIFFB_REF)
+                break
+
+            pos_prev = pos
+    finally:
+        # errors of the writer must not hide the error that got us here
+        chunks.close()
+        writer.join()
+    writer.finish()
+    duration = max(time.time() - t_start, 1e-6)
+    logger.info('Wrote %s of data in %0.1f sec (%s/sec)'
+                % (sizeof_fmt(writer.n_bytes), duration,
+                   sizeof_fmt(writer.n_bytes / duration)))
 
     logger.info('Closing %s [done]' % use_fname)
     if info.get('maxshield', False):
@@ -2350,7 +3040,7 @@ def _check_raw_compatibility(raw):
         raw[0].orig_format = 'unknown'
 
 
-def concatenate_raws(raws, preload=None, events_list=None):
+def concatenate_raws(raws, preload=None, events_list=None, copy_data=True):
     """Concatenate raw instances as if they were continuous. Note that raws[0]
     is modified in-place to achieve the concatenation.
 
@@ -2364,6 +3054,13 @@ def concatenate_raws(raws, preload=None, events_list=None):
         have or not have data preloaded.
     events_list : None | list
         The events to concatenate. Defaults to None.
+    copy_data : bool
+        If True (default), the data are copied into one new array. If False
+        and the data are preloaded, the data of each instance are kept as a
+        segment of the data of the concatenated instance, so they are shared
+        with ``raws[1:]`` (see :meth:`mne.io.Raw.append`).
+
+        .. versionadded:: 0.13
 
     Returns
     -------
@@ -2378,7 +3075,7 @@ def concatenate_raws(raws, preload=None, events_list=None):
                              'to be of the same length')
         first, last = zip(*[(r.first_samp, r.last_samp) for r in raws])
         events = concatenate_events(events_list, first, last)
-    raws[0].append(raws[1:], preload)
+    raws[0].append(raws[1:], preload, copy_data)
 
     if events_list is None:
         return raws[0]
@@ -0,0 +1,270 @@
+"""Seekable block-compressed gzip files
+
+Block-compressed files are standard multi-member gzip files (readable by
+``gzip`` and any other gzip reader) in which the data are split into blocks
+of a fixed uncompressed size, each compressed as its own gzip member. After
+the data, the compressed offsets of the blocks are stored in the extra fields
+of empty members, followed by a fixed-size empty trailer member that points
+to this index. This allows random access: a read only needs to decompress
+the blocks that contain the requested bytes.
+"""
+
+# License: BSD (3-clause)
+
+import os
+import os.path as op
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from ..fixes import OrderedDict
+from ..utils import logger
+
+_BLOCK_SIZE = 65536  # uncompressed bytes per block
+_HEADER = struct.Struct('<BBBBIBBH')  # gzip member header incl. XLEN
+_SUBFIELD = struct.Struct('<2sH')
+_TAIL = struct.Struct('<II')  # CRC32 and ISIZE
+_TRAILER_DATA = struct.Struct('<QQQQ')  # block size, n blocks, index, size
+_EMPTY_DEFLATE = b'\x03\x00'  # raw deflate stream of no data
+_TRAILER_SIZE = (_HEADER.size + _SUBFIELD.size + _TRAILER_DATA.size +
+                 len(_EMPTY_DEFLATE) + _TAIL.size)
+_MAX_INDEX = (65535 - _SUBFIELD.size) // 8  # offsets per index member
+_MAX_CACHED_INDICES = 32  # parsed block indices kept for reopening files
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def _member(deflated, crc, isize, extra_id, extra):
+    """Helper to assemble a gzip member with one extra subfield"""
+    extra = _SUBFIELD.pack(extra_id, len(extra)) + extra
+    # FLG.FEXTRA set, no mtime, OS unknown
+    return b''.join((_HEADER.pack(0x1f, 0x8b, 8, 4, 0, 0, 255, len(extra)),
+                     extra, deflated, _TAIL.pack(crc, isize)))
+
+
+def _empty_member(extra_id, extra):
+    """Helper to make an empty gzip member carrying extra data"""
+    return _member(_EMPTY_DEFLATE, 0, 0, extra_id, extra)
+
+
+def _is_block_gzip(fname):
+    """Check if a file is block-compressed"""
+    return _get_block_index(fname) is not None
+
+
+def _get_block_index(fname):
+    """Helper to get the parsed block index of a file (None if not blocked)
+
+    The index is cached by path, size and modification time, so that opening
+    the file again for each segment read does not parse it again.
+    """
+    stat = os.stat(fname)
+    key = (op.realpath(fname), stat.st_size, stat.st_mtime)
+    with _index_lock:
+        if key in _index_cache:
+            _index_cache[key] = _index_cache.pop(key)  # most recently used
+            return _index_cache[key]
+    index = _read_block_index(fname)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _MAX_CACHED_INDICES:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def _read_block_index(fname):
+    """Helper to read the block size, size and offsets (or None)"""
+    with open(fname, 'rb') as fid:
+        trailer = _read_trailer(fid)
+        if trailer is None:
+            return None
+        block_size, n_blocks, index_pos, size = trailer
+        # read the block offsets from the extra fields of the index members
+        fid.seek(index_pos)
+        offsets = list()
+        n_read = 0
+        while n_read < n_blocks:
+            header = fid.read(_HEADER.size + _SUBFIELD.size)
+            xlen = _HEADER.unpack_from(header)[-1]
+            extra_id, n_bytes = _SUBFIELD.unpack_from(header, _HEADER.size)
+            if extra_id != b'MI':
+                raise RuntimeError('Corrupt block-compressed file %s' % fname)
+            offsets.append(np.fromstring(fid.read(n_bytes), '<u8'))
+            n_read += len(offsets[-1])
+            fid.seek(xlen - _SUBFIELD.size - n_bytes +
+                     len(_EMPTY_DEFLATE) + _TAIL.size, 1)
+    offsets = np.concatenate(offsets + [[index_pos]]).astype(np.int64)
+    offsets.flags.writeable = False
+    return block_size, size, offsets
+
+
+def _read_trailer(fid):
+    """Helper to read the trailer of an open block-compressed file (or None)"""
+    fid.seek(0, os.SEEK_END)
+    if fid.tell() < _TRAILER_SIZE:
+        return None
+    fid.seek(-_TRAILER_SIZE, os.SEEK_END)
+    trailer = fid.read(_TRAILER_SIZE)
+    if trailer[:4] != b'\x1f\x8b\x08\x04':
+        return None
+    extra_id = _SUBFIELD.unpack_from(trailer, _HEADER.size)[0]
+    if extra_id != b'MT':
+        return None
+    return _TRAILER_DATA.unpack_from(trailer, _HEADER.size + _SUBFIELD.size)
+
+
+class _BlockGzipWriter(object):
+    """Write a block-compressed gzip file
+
+    Parameters
+    ----------
+    fname : str
+        The file to write.
+    compresslevel : int
+        The zlib compression level.
+    block_size : int
+        The uncompressed size of each block.
+    """
+
+    def __init__(self, fname, compresslevel=2, block_size=_BLOCK_SIZE):
+        self._fid = open(fname, 'wb')
+        self._level = compresslevel
+        self._block_size = int(block_size)
+        self._buf = bytearray()
+        self._pos = 0
+        self._offsets = list()
+        self.closed = False
+
+    def write(self, data):
+        """Write data"""
+        self._buf += data
+        self._pos += len(data)
+        n_full = len(self._buf) // self._block_size
+        for ii in range(n_full):
+            start = ii * self._block_size
+            self._write_block(bytes(
+                self._buf[start:start + self._block_size]))
+        if n_full > 0:
+            del self._buf[:n_full * self._block_size]
+
+    def _write_block(self, data):
+        """Compress and write one block"""
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED,
+                                      -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush()
+        self._offsets.append(self._fid.tell())
+        self._fid.write(_member(deflated, zlib.crc32(data) & 0xffffffff,
+                                len(data), b'MB',
+                                struct.pack('<I', len(data))))
+
+    def tell(self):
+        """Get the (uncompressed) position"""
+        return self._pos
+
+    def flush(self):
+        """Flush the underlying file (incomplete blocks stay buffered)"""
+        self._fid.flush()
+
+    def close(self):
+        """Write the pending data and the index, and close the file"""
+        if self.closed:
+            return
+        if len(self._buf) > 0 or len(self._offsets) == 0:
+            self._write_block(bytes(self._buf))
+            self._buf = bytearray()
+        index_pos = self._fid.tell()
+        offsets = np.array(self._offsets, '<u8')
+        for start in range(0, len(offsets), _MAX_INDEX):
+            self._fid.write(_empty_member(
+                b'MI', offsets[start:start + _MAX_INDEX].tostring()))
+        self._fid.write(_empty_member(b'MT', _TRAILER_DATA.pack(
+            self._block_size, len(offsets), index_pos, self._pos)))
+        self._fid.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _BlockGzipReader(object):
+    """Read a block-compressed gzip file with random access
+
+    Parameters
+    ----------
+    fname : str
+        The file to read.
+    index : tuple | None
+        The block index of the file from :func:`_get_block_index`. If None,
+        it is obtained from the file (or the cache).
+    """
+
+    def __init__(self, fname, index=None):
+        if index is None:
+            index = _get_block_index(fname)
+        if index is None:
+            raise ValueError('%s is not a block-compressed file' % fname)
+        self._block_size, self._size, self._offsets = index
+        self._fid = open(fname, 'rb')
+        self._pos = 0
+        self._block_idx = -1
+        self._block = b''
+        logger.debug('Using block-compressed I/O (%d blocks)'
+                     % (len(self._offsets) - 1))
+
+    @property
+    def closed(self):
+        return self._fid.closed
+
+    def _get_block(self, idx):
+        """Get the uncompressed data of a block"""
+        if idx != self._block_idx:
+            self._fid.seek(int(self._offsets[idx]))
+            member = self._fid.read(int(self._offsets[idx + 1] -
+                                        self._offsets[idx]))
+            self._block = zlib.decompress(member, 16 + zlib.MAX_WBITS)
+            self._block_idx = idx
+        return self._block
+
+    def read(self, size=-1):
+        """Read (uncompressed) data"""
+        if size is None or size < 0:
+            size = self._size - self._pos
+        size = max(min(size, self._size - self._pos), 0)
+        out = list()
+        while size > 0:
+            idx, start = divmod(self._pos, self._block_size)
+            data = self._get_block(idx)[start:start + size]
+            out.append(data)
+            self._pos += len(data)
+            size -= len(data)
+        return b''.join(out)
+
+    def seek(self, offset, whence=0):
+        """Seek to an (uncompressed) position"""
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        if offset < 0:
+            raise IOError('Invalid seek position %s' % offset)
+        self._pos = int(offset)
+        return self._pos
+
+    def tell(self):
+        """Get the (uncompressed) position"""
+        return self._pos
+
+    def close(self):
+        """Close the file"""
+        self._fid.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
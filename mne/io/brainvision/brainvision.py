@@ -133,6 +133,7 @@ class RawBrainVision(_BaseRaw):
         # update events
         self._event_ch = _synthesize_stim_channel(events, n_samp)
         self._events = events
+        self._clear_cache()
         if self.preload:
             self._data[-1] = self._event_ch
 
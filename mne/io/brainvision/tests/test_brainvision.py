@@ -17,7 +17,7 @@ from numpy.testing import (assert_array_almost_equal, assert_array_equal,
 from mne.utils import _TempDir, run_tests_if_main
 from mne import pick_types, find_events
 from mne.io.constants import FIFF
-from mne.io import Raw, read_raw_brainvision
+from mne.io import Raw, read_raw_brainvision, make_eeg_average_ref_proj
 from mne.io.tests.test_raw import _test_raw_reader
 
 FILE = inspect.getfile(inspect.currentframe())
@@ -99,6 +99,20 @@ def test_brainvision_data():
                          response_trig_shift=1000)
 
 
+def test_brainvision_proj():
+    """Test reading Brain Vision files with projections applied on the fly
+    """
+    with warnings.catch_warnings(record=True):  # event parsing
+        raw = read_raw_brainvision(vhdr_path, eog=eog, preload=True)
+        raw_proj = read_raw_brainvision(vhdr_path, eog=eog)
+    for inst in (raw, raw_proj):
+        inst.add_proj(make_eeg_average_ref_proj(inst.info, activate=False))
+        inst.apply_proj()
+    assert_true(raw_proj._projector is not None)
+    for sl in (slice(0, 10), slice(100, 2000)):
+        assert_allclose(raw_proj[:, sl][0], raw[:, sl][0], atol=1e-20)
+
+
 def test_events():
     """Test reading and modifying events"""
     tempdir = _TempDir()
@@ -22,6 +22,8 @@ from ..constants import FIFF
 from ...filter import resample
 from ...externals.six.moves import zip
 
+_CHUNK_SIZE = 1048576  # bytes of data records to decode at once
+
 
 class RawEDF(_BaseRaw):
     """Raw object from EDF, EDF+, BDF file
@@ -105,7 +107,6 @@ class RawEDF(_BaseRaw):
         n_samps = self._raw_extras[fi]['n_samps']
         buf_len = int(self._raw_extras[fi]['max_samp'])
         sfreq = self.info['sfreq']
-        n_chan = self.info['nchan']
         data_size = self._raw_extras[fi]['data_size']
         data_offset = self._raw_extras[fi]['data_offset']
         stim_channel = self._raw_extras[fi]['stim_channel']
@@ -131,52 +132,71 @@ class RawEDF(_BaseRaw):
 
         block_start_idx, r_lims, d_lims = _blk_read_lims(start, stop, buf_len)
         read_size = len(r_lims) * buf_len
-        with open(self._filenames[fi], 'rb', buffering=0) as fid:
-            # extract data
-            start_offset = (data_offset +
-                            block_start_idx * buf_len * n_chan * data_size)
-            ch_offsets = np.cumsum(np.concatenate([[0], n_samps * data_size]))
-            this_data = np.empty((len(sel), buf_len))
-            for bi in range(len(r_lims)):
-                block_offset = bi * ch_offsets[-1]
-                d_sidx, d_eidx = d_lims[bi]
-                r_sidx, r_eidx = r_lims[bi]
-                n_buf_samp = r_eidx - r_sidx
-                for ii, ci in enumerate(sel):
-                    n_samp = n_samps[ci]
-                    # bdf data: 24bit data
-                    fid.seek(start_offset + block_offset + ch_offsets[ci], 0)
-                    if n_samp == buf_len:
-                        # use faster version with skips built in
-                        fid.seek(r_sidx * data_size, 1)
-                        ch_data = _read_ch(fid, subtype, n_buf_samp, data_size)
-                    else:
-                        # read in all the data and triage appropriately
-                        ch_data = _read_ch(fid, subtype, n_samp, data_size)
-                        if ci == tal_channel:
-                            # don't resample tal_channel,
-                            # pad with zeros instead.
-                            n_missing = int(buf_len - n_samp)
-                            ch_data = np.hstack([ch_data, [0] * n_missing])
-                            ch_data = ch_data[r_sidx:r_eidx]
-                        elif ci == stim_channel:
-                            if annot and annotmap or tal_channel is not None:
-                                # don't bother with resampling the stim ch
-                                # because it gets overwritten later on.
-                                ch_data = np.zeros(n_buf_samp)
-                            else:
-                                # Stim channel will be interpolated
-                                oldrange = np.linspace(0, 1, n_samp + 1, True)
-                                newrange = np.linspace(0, 1, buf_len, False)
-                                newrange = newrange[r_sidx:r_eidx]
-                                ch_data = interp1d(
-                                    oldrange, np.append(ch_data, 0),
-                                    kind='zero')(newrange)
-                        else:
-                            ch_data = resample(ch_data, buf_len, n_samp,
-                                               npad=0)[r_sidx:r_eidx]
-                    this_data[ii, :n_buf_samp] = ch_data
-                data[:, d_sidx:d_eidx] = this_data[:, :n_buf_samp]
+        n_read = stop - start
+        first_samp = r_lims[0][0]
+        # map all the records we need at once (instead of seeking to and
+        # reading each channel of each record separately)
+        ch_offsets = np.cumsum(np.concatenate([[0], n_samps * data_size]))
+        rec_size = int(ch_offsets[-1])
+        records = np.memmap(self._filenames[fi], dtype=np.uint8, mode='r',
+                            offset=data_offset + block_start_idx * rec_size,
+                            shape=(len(r_lims), rec_size))
+
+        # channels at the full rate are decoded together for runs of
+        # channels that are adjacent both in the file and in the output
+        runs = list()
+        for ii, ci in enumerate(sel):
+            if n_samps[ci] != buf_len:
+                continue
+            if len(runs) > 0 and runs[-1][1] == ii and sel[ii - 1] == ci - 1:
+                runs[-1][1] += 1
+            else:
+                runs.append([ii, ii + 1])
+        for ii_start, ii_stop in runs:
+            n_run = ii_stop - ii_start
+            ch_start = ch_offsets[sel[ii_start]]
+            ch_stop = ch_offsets[sel[ii_start] + n_run]
+            # a few records at a time, to keep the temporaries small
+            n_rec = max(_CHUNK_SIZE // (ch_stop - ch_start), 1)
+            for rec_start in range(0, len(r_lims), n_rec):
+                ch_data = records[rec_start:rec_start + n_rec,
+                                  ch_start:ch_stop]
+                ch_data = _records_to_int(ch_data.reshape(
+                    len(ch_data), n_run, buf_len * data_size), subtype)
+                for bi in range(rec_start, rec_start + len(ch_data)):
+                    d_sidx, d_eidx = d_lims[bi]
+                    r_sidx, r_eidx = r_lims[bi]
+                    data[ii_start:ii_stop, d_sidx:d_eidx] = \
+                        ch_data[bi - rec_start, :, r_sidx:r_eidx]
+
+        # the others need to be brought to the full rate
+        for ii in np.where(n_samps[sel] != buf_len)[0]:
+            ci = sel[ii]
+            n_samp = n_samps[ci]
+            ch_data = _records_to_int(
+                records[:, ch_offsets[ci]:ch_offsets[ci + 1]], subtype)
+            if ci == tal_channel:
+                # don't resample tal_channel, pad with zeros instead.
+                ch_data = np.concatenate(
+                    [ch_data, np.zeros((len(ch_data), buf_len - n_samp))],
+                    axis=1)
+            elif ci == stim_channel:
+                if annot and annotmap or tal_channel is not None:
+                    # don't bother with resampling the stim ch
+                    # because it gets overwritten later on.
+                    ch_data = np.zeros((len(ch_data), buf_len))
+                else:
+                    # Stim channel will be interpolated
+                    oldrange = np.linspace(0, 1, n_samp + 1, True)
+                    newrange = np.linspace(0, 1, buf_len, False)
+                    ch_data = np.concatenate(
+                        [ch_data, np.zeros((len(ch_data), 1))], axis=1)
+                    ch_data = interp1d(oldrange, ch_data,
+                                       kind='zero')(newrange)
+            else:
+                ch_data = resample(ch_data, buf_len, n_samp, npad=0)
+            data[ii] = ch_data.ravel()[first_samp:first_samp + n_read]
+        del records
         data *= gains.T[sel]
         data += offsets[sel]
 
@@ -215,20 +235,22 @@ class RawEDF(_BaseRaw):
                 data[stim_channel_idx, :] = stim
 
 
-def _read_ch(fid, subtype, samp, data_size):
-    """Helper to read a number of samples for a single channel"""
+def _records_to_int(records, subtype):
+    """Helper to convert raw bytes of data records to integers
+
+    The last dimension of ``records`` holds the bytes of consecutive samples.
+    """
     if subtype in ('24BIT', 'bdf'):
-        ch_data = np.fromfile(fid, dtype=np.uint8,
-                              count=samp * data_size)
-        ch_data = ch_data.reshape(-1, 3).astype(np.int32)
-        ch_data = ((ch_data[:, 0]) +
-                   (ch_data[:, 1] << 8) +
-                   (ch_data[:, 2] << 16))
-        # 24th bit determines the sign
-        ch_data[ch_data >= (1 << 23)] -= (1 << 24)
+        # bdf data: 24bit data
+        records = records.reshape(records.shape[:-1] +
+                                  (records.shape[-1] // 3, 3))
+        # the most significant byte carries the sign
+        ch_data = records[..., 2].astype(np.int8).astype(np.int32) << 16
+        ch_data |= records[..., 1].astype(np.int32) << 8
+        ch_data |= records[..., 0]
     # edf data: 16bit data
     else:
-        ch_data = np.fromfile(fid, dtype='<i2', count=samp)
+        ch_data = np.ascontiguousarray(records).view('<i2')
     return ch_data
 
 
@@ -231,6 +231,28 @@ def test_edf_stim_channel():
     assert_array_almost_equal(true_data[0:-1] * 1e-6, edf_data[0:-1])
 
 
+def test_read_segment():
+    """Test reading segments across data records"""
+    # 24-bit decoding, including the sign
+    values = np.array([0, 1, -1, 2 ** 23 - 1, -2 ** 23, 123456, -654321])
+    records = values.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3]
+    assert_array_equal(edfmodule._records_to_int(records.ravel(), 'bdf'),
+                       values)
+    # including channels with different sampling rates
+    for path, kwargs in ((edf_uneven_path, dict()), (bdf_path, dict()),
+                         (edf_path, dict(stim_channel=None))):
+        with warnings.catch_warnings(record=True):  # interpolating stim
+            raw = read_raw_edf(path, **kwargs)
+            raw_preload = read_raw_edf(path, preload=True, **kwargs)
+        n_times = raw.n_times
+        for start, stop in ((0, 1), (1, n_times // 2),
+                            (n_times // 3, n_times)):
+            for picks in (None, [1, 0], [1]):
+                picks = slice(None) if picks is None else picks
+                assert_array_equal(raw[picks, start:stop][0],
+                                   raw_preload[picks, start:stop][0])
+
+
 @requires_pandas
 def test_to_data_frame():
     """Test edf Raw Pandas exporter"""
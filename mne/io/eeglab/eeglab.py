@@ -3,20 +3,22 @@
 #
 # License: BSD (3-clause)
 
+import os
 import os.path as op
 
 import numpy as np
 
 from ..utils import (_read_segments_file, _find_channels,
-                     _synthesize_stim_channel)
-from ..constants import FIFF
+                     _synthesize_stim_channel, _mult_cal_one)
+from ..constants import FIFF, Bunch
 from ..meas_info import _empty_info, create_info
 from ..base import _BaseRaw, _check_update_montage
-from ...utils import logger, verbose, check_version, warn
+from ...utils import (logger, verbose, check_version, warn,
+                      _check_h5py_installed)
 from ...channels.montage import Montage
 from ...epochs import _BaseEpochs
 from ...event import read_events
-from ...externals.six import string_types
+from ...externals.six import string_types, unichr
 
 # just fix the scaling for now, EEGLAB doesn't seem to provide this info
 CAL = 1e-6
@@ -50,6 +52,134 @@ def _check_mat_struct(fname):
         raise ValueError(msg)
 
 
+def _is_mat73(fname):
+    """Check if a .set file is in the MATLAB v7.3 (HDF5) format."""
+    with open(fname, 'rb') as fid:
+        return fid.read(19) == b'MATLAB 7.3 MAT-file'
+
+
+def _read_eeg_struct(fname, load_data=True):
+    """Read the EEG structure of a .set file.
+
+    If ``load_data`` is False, the data of MATLAB v7.3 files are not read
+    (``data`` is None unless it is the name of an .fdt file).
+    """
+    if _is_mat73(fname):
+        eeg = _read_mat73_eeg(fname, load_data)
+    else:
+        from scipy import io
+        _check_mat_struct(fname)
+        eeg = io.loadmat(fname, struct_as_record=False,
+                         squeeze_me=True)['EEG']
+    # these can be stored as floating point numbers
+    for key in ('nbchan', 'pnts', 'trials'):
+        if hasattr(eeg, key):
+            setattr(eeg, key, int(getattr(eeg, key)))
+    return eeg
+
+
+def _read_mat73_eeg(fname, load_data):
+    """Read the EEG structure of a MATLAB v7.3 (HDF5) file."""
+    h5py = _check_h5py_installed()
+    with h5py.File(fname, 'r') as fid:
+        if 'ALLEEG' in fid:
+            raise NotImplementedError(
+                'Loading an ALLEEG array is not supported. Please contact'
+                'mne-python developers for more information.')
+        elif 'EEG' not in fid:
+            raise ValueError('Unknown array in the .set file.')
+        eeg = Bunch()
+        for key, value in fid['EEG'].items():
+            if key == 'data' and not load_data and \
+                    _mat73_class(value) != 'char':
+                eeg[key] = None
+            else:
+                eeg[key] = _mat73_to_py(fid, value)
+    return eeg
+
+
+def _mat73_class(obj):
+    """Get the MATLAB class of an HDF5 object."""
+    matlab_class = obj.attrs.get('MATLAB_class', b'')
+    if not isinstance(matlab_class, string_types):
+        matlab_class = matlab_class.decode()
+    return matlab_class
+
+
+def _mat73_to_py(fid, obj):
+    """Convert a MATLAB v7.3 (HDF5) object the way scipy.io.loadmat does.
+
+    This is used with ``struct_as_record=False`` and ``squeeze_me=True``,
+    structs are returned as Bunch objects.
+    """
+    h5py = _check_h5py_installed()
+    matlab_class = _mat73_class(obj)
+    if isinstance(obj, h5py.Group):  # struct
+        fields = list(obj.items())
+        if len(fields) > 0 and all(
+                isinstance(value, h5py.Dataset) and
+                h5py.check_dtype(ref=value.dtype) is not None and
+                _mat73_class(value) == '' for _, value in fields):
+            # struct array, each field holds references to the values
+            values = [[_mat73_to_py(fid, fid[ref]) for ref in
+                       value[()].ravel()] for _, value in fields]
+            out = np.empty(len(values[0]), object)
+            for ii in range(len(out)):
+                out[ii] = Bunch(**dict((key, value[ii]) for (key, _), value
+                                       in zip(fields, values)))
+            return out[0] if len(out) == 1 else out
+        return Bunch(**dict((key, _mat73_to_py(fid, value))
+                            for key, value in fields))
+    if obj.attrs.get('MATLAB_empty', 0):
+        return u'' if matlab_class == 'char' else np.empty(0)
+    # MATLAB arrays are stored transposed
+    data = obj[()]
+    if h5py.check_dtype(ref=data.dtype) is not None:  # cell
+        out = np.empty(data.size, object)
+        for ii, ref in enumerate(data.ravel()):
+            out[ii] = _mat73_to_py(fid, fid[ref])
+        return out[0] if len(out) == 1 else out
+    if matlab_class == 'char':
+        return u''.join(unichr(c) for c in data.ravel())
+    data = np.squeeze(data.T)
+    if matlab_class == 'logical':
+        data = data.astype(bool)
+    return data[()] if data.ndim == 0 else data
+
+
+def _write_sidecar(input_fname, eeg):
+    """Write the data of a .set file to a separate .fdt file.
+
+    The header is written to a new .set file (without the data), which is
+    written last so that an interrupted conversion is not used. If the files
+    cannot be written, they are removed and the error is raised with the
+    EEG structure unchanged.
+    """
+    from scipy import io
+    set_fname = _sidecar_fname(input_fname)
+    fdt_fname = op.splitext(set_fname)[0] + '.fdt'
+    logger.info('Writing the data to %s' % fdt_fname)
+    data = eeg.data
+    try:
+        # .fdt files store single precision values of all channels for each
+        # time point
+        np.asarray(data, '<f4').T.tofile(fdt_fname)
+        eeg.data = op.basename(fdt_fname)
+        io.savemat(set_fname, {'EEG': eeg}, appendmat=False)
+    except EnvironmentError:
+        eeg.data = data
+        for fname in (fdt_fname, set_fname):
+            if op.isfile(fname):
+                os.remove(fname)
+        raise
+    return eeg
+
+
+def _sidecar_fname(input_fname):
+    """Get the name of the .set file converted to use a separate .fdt."""
+    return op.splitext(input_fname)[0] + '-mne.set'
+
+
 def _to_loc(ll):
     """Check if location exists."""
     if isinstance(ll, (int, float)) or len(ll) > 0:
@@ -107,7 +237,7 @@ def _get_info(eeg, montage, eog=()):
 
 def read_raw_eeglab(input_fname, montage=None, eog=(), event_id=None,
                     event_id_func='strip_to_integer', preload=False,
-                    verbose=None):
+                    sidecar=False, verbose=None):
     """Read an EEGLAB .set file
 
     Parameters
@@ -148,7 +278,20 @@ def read_raw_eeglab(input_fname, montage=None, eog=(), event_id=None,
         file name of a memory-mapped file which is used to store the data
         on the hard drive (slower, requires less memory). Note that
         preload=False will be effective only if the data is stored in a
-        separate binary file.
+        separate binary file, in a MATLAB v7.3 file or if ``sidecar`` is
+        True.
+    sidecar : bool
+        If True and the data is stored in a .set file in a MATLAB format
+        older than v7.3, it is converted once to a separate binary file
+        (``*-mne.fdt``, in single precision like EEGLAB) along with a .set
+        file without the data (``*-mne.set``) in the same folder. These files
+        are used instead of the original one afterward (unless it is
+        modified), so that ``preload=False`` does not need to load the data
+        into memory. If the files cannot be written (e.g., in a read-only
+        folder), a warning is emitted and the data are preloaded.
+        Defaults to False.
+
+        .. versionadded:: 0.13
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -167,7 +310,7 @@ def read_raw_eeglab(input_fname, montage=None, eog=(), event_id=None,
     """
     return RawEEGLAB(input_fname=input_fname, montage=montage, preload=preload,
                      eog=eog, event_id=event_id, event_id_func=event_id_func,
-                     verbose=verbose)
+                     sidecar=sidecar, verbose=verbose)
 
 
 def read_epochs_eeglab(input_fname, events=None, event_id=None, montage=None,
@@ -266,6 +409,18 @@ class RawEEGLAB(_BaseRaw):
         amount of memory). If preload is a string, preload is the file name of
         a memory-mapped file which is used to store the data on the hard
         drive (slower, requires less memory).
+    sidecar : bool
+        If True and the data is stored in a .set file in a MATLAB format
+        older than v7.3, it is converted once to a separate binary file
+        (``*-mne.fdt``, in single precision like EEGLAB) along with a .set
+        file without the data (``*-mne.set``) in the same folder. These files
+        are used instead of the original one afterward (unless it is
+        modified), so that ``preload=False`` does not need to load the data
+        into memory. If the files cannot be written (e.g., in a read-only
+        folder), a warning is emitted and the data are preloaded.
+        Defaults to False.
+
+        .. versionadded:: 0.13
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -285,14 +440,19 @@ class RawEEGLAB(_BaseRaw):
     @verbose
     def __init__(self, input_fname, montage, eog=(), event_id=None,
                  event_id_func='strip_to_integer', preload=False,
-                 verbose=None):
+                 sidecar=False, verbose=None):
         """Read EEGLAB .set file.
         """
-        from scipy import io
         basedir = op.dirname(input_fname)
-        _check_mat_struct(input_fname)
-        eeg = io.loadmat(input_fname, struct_as_record=False,
-                         squeeze_me=True)['EEG']
+        lazy = preload is False or isinstance(preload, string_types)
+        set_fname = input_fname
+        if sidecar and lazy:
+            sidecar_fname = _sidecar_fname(input_fname)
+            if op.isfile(sidecar_fname) and (op.getmtime(sidecar_fname) >=
+                                             op.getmtime(input_fname)):
+                logger.info('Using the converted file %s' % sidecar_fname)
+                set_fname = sidecar_fname
+        eeg = _read_eeg_struct(set_fname, load_data=False)
         if eeg.trials != 1:
             raise TypeError('The number of trials is %d. It must be 1 for raw'
                             ' files. Please use `mne.io.read_epochs_eeglab` if'
@@ -314,6 +474,14 @@ class RawEEGLAB(_BaseRaw):
         self._create_event_ch(events, n_samples=eeg.pnts)
 
         # read the data
+        if sidecar and lazy and eeg.data is not None and \
+                not isinstance(eeg.data, string_types):
+            try:
+                eeg = _write_sidecar(input_fname, eeg)
+            except EnvironmentError as exp:  # e.g., a read-only folder
+                warn('The converted data could not be written next to %s '
+                     '(%s), the data will be preloaded' % (input_fname, exp))
+                lazy = False
         if isinstance(eeg.data, string_types):
             data_fname = op.join(basedir, eeg.data)
             _check_fname(data_fname)
@@ -322,8 +490,13 @@ class RawEEGLAB(_BaseRaw):
             super(RawEEGLAB, self).__init__(
                 info, preload, filenames=[data_fname], last_samps=last_samps,
                 orig_format='double', verbose=verbose)
+        elif eeg.data is None:  # MATLAB v7.3 file, read the data when needed
+            super(RawEEGLAB, self).__init__(
+                info, preload, filenames=[op.abspath(input_fname)],
+                last_samps=last_samps, orig_format='double',
+                raw_extras=[dict(mat73=True)], verbose=verbose)
         else:
-            if preload is False or isinstance(preload, string_types):
+            if lazy:
                 warn('Data will be preloaded. preload=False or a string '
                      'preload is not supported when the data is stored in '
                      'the .set file')
@@ -347,12 +520,24 @@ class RawEEGLAB(_BaseRaw):
             raise ValueError("[n_events x 3] shaped array required")
         # update events
         self._event_ch = _synthesize_stim_channel(events, n_samples)
+        self._clear_cache()
 
     def _read_segment_file(self, data, idx, fi, start, stop, cals, mult):
         """Read a chunk of raw data"""
-        _read_segments_file(self, data, idx, fi, start, stop, cals, mult,
-                            dtype=np.float32, trigger_ch=self._event_ch,
-                            n_channels=self.info['nchan'] - 1)
+        if self._raw_extras[fi] is not None and \
+                self._raw_extras[fi].get('mat73', False):
+            h5py = _check_h5py_installed()
+            block = np.empty((self.info['nchan'], stop - start))
+            with h5py.File(self._filenames[fi], 'r') as fid:
+                # the data are stored transposed, so that each time point is
+                # contiguous
+                block[:-1] = fid['EEG/data'][start:stop].T
+            block[-1] = self._event_ch[start:stop]
+            _mult_cal_one(data, block, idx, cals, mult)
+        else:
+            _read_segments_file(self, data, idx, fi, start, stop, cals, mult,
+                                dtype=np.float32, trigger_ch=self._event_ch,
+                                n_channels=self.info['nchan'] - 1)
 
 
 class EpochsEEGLAB(_BaseEpochs):
@@ -432,10 +617,7 @@ class EpochsEEGLAB(_BaseEpochs):
     def __init__(self, input_fname, events=None, event_id=None, tmin=0,
                  baseline=None,  reject=None, flat=None, reject_tmin=None,
                  reject_tmax=None, montage=None, eog=(), verbose=None):
-        from scipy import io
-        _check_mat_struct(input_fname)
-        eeg = io.loadmat(input_fname, struct_as_record=False,
-                         squeeze_me=True)['EEG']
+        eeg = _read_eeg_struct(input_fname)
 
         if not ((events is None and event_id is None) or
                 (events is not None and event_id is not None)):
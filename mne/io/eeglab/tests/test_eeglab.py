@@ -2,19 +2,23 @@
 #
 # License: BSD (3-clause)
 
+import os
 import os.path as op
 import shutil
 
 import warnings
-from nose.tools import assert_raises, assert_equal
-from numpy.testing import assert_array_equal
+from nose.tools import assert_raises, assert_equal, assert_true, assert_false
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
 
 from mne import write_events, read_epochs_eeglab, Epochs, find_events
 from mne.io import read_raw_eeglab
 from mne.io.tests.test_raw import _test_raw_reader
 from mne.io.eeglab.eeglab import _read_eeglab_events
 from mne.datasets import testing
-from mne.utils import _TempDir, run_tests_if_main, requires_version
+from mne.externals.six import string_types
+from mne.utils import (_TempDir, run_tests_if_main, requires_version,
+                       requires_h5py)
 
 base_dir = op.join(testing.data_path(download=False), 'EEGLAB')
 raw_fname = op.join(base_dir, 'test_raw.set')
@@ -128,4 +132,97 @@ def test_io_set():
                       bad_epochs_fname)
     assert_equal(len(w), 3)
 
+
+def _write_mat73(fname, eeg):
+    """Write an EEG structure like MATLAB does in the v7.3 (HDF5) format"""
+    import h5py
+
+    def _write(group, key, value):
+        if isinstance(value, list):  # struct array, fields hold references
+            struct = group.create_group(key)
+            struct.attrs['MATLAB_class'] = b'struct'
+            for field in value[0]:
+                refs = list()
+                for ii, this_value in enumerate(value):
+                    name = '%s_%s_%d' % (key, field, ii)
+                    _write(fid['#refs#'], name, this_value[field])
+                    refs.append(fid['#refs#'][name].ref)
+                struct.create_dataset(field, data=np.array(
+                    refs, h5py.special_dtype(ref=h5py.Reference))[:, None])
+        elif isinstance(value, string_types):
+            data = np.array([ord(c) for c in value], np.uint16)[:, None]
+            group.create_dataset(key, data=data)
+            group[key].attrs['MATLAB_class'] = b'char'
+        else:
+            value = np.atleast_2d(value)
+            group.create_dataset(key, data=value.T)  # stored transposed
+            group[key].attrs['MATLAB_class'] = \
+                b'single' if value.dtype == np.float32 else b'double'
+
+    with h5py.File(fname, 'w', userblock_size=512) as fid:
+        fid.create_group('#refs#')
+        group = fid.create_group('EEG')
+        group.attrs['MATLAB_class'] = b'struct'
+        for key, value in eeg.items():
+            _write(group, key, value)
+    with open(fname, 'r+b') as fid:
+        fid.write(b'MATLAB 7.3 MAT-file, Platform: GLNXA64')
+
+
+@requires_h5py
+@requires_version('scipy', '0.12')
+def test_io_set_lazy():
+    """Test reading EEGLAB .set files with embedded data without preloading
+    """
+    from scipy import io
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    ch_names = ['EEG %02d' % ii for ii in range(24)]
+    data = rng.randn(24, 1000).astype(np.float32)
+    eeg = dict(trials=1., srate=250., nbchan=24., pnts=1000.,
+               chanlocs=[dict(labels=name, X=x, Y=y, Z=z) for name, x, y, z
+                         in zip(ch_names, *rng.randn(3, 24))],
+               event=[dict(type='3', latency=100.),
+                      dict(type='7', latency=500.)])
+
+    # MATLAB v7.3 files are read lazily
+    fname = op.join(tempdir, 'test_raw.set')
+    _write_mat73(fname, dict(eeg, data=data))
+    raw = read_raw_eeglab(fname)
+    assert_false(raw.preload)
+    assert_equal(raw.ch_names, ch_names + ['STI 014'])
+    assert_array_equal(raw[:24, 10:900][0],
+                       data[:, 10:900].astype(np.float64) * 1e-6)
+    assert_array_equal(find_events(raw), [[100, 0, 3], [500, 0, 7]])
+    _test_raw_reader(read_raw_eeglab, input_fname=fname, montage=None)
+    eeg['event'] = eeg['event'][:1]  # single struct
+    _write_mat73(fname, dict(eeg, data=data))
+    assert_array_equal(find_events(read_raw_eeglab(fname)), [[100, 0, 3]])
+
+    # older formats can be converted to use a separate .fdt file
+    fname = op.join(tempdir, 'test_onefile_raw.set')
+    io.savemat(fname, {'EEG': dict(eeg, data=data.astype(np.float64))},
+               appendmat=False)
+    raw = read_raw_eeglab(fname, preload=True, sidecar=True)
+    assert_false(op.isfile(op.join(tempdir, 'test_onefile_raw-mne.fdt')))
+    for _ in range(2):  # convert, then reuse
+        raw_lazy = read_raw_eeglab(fname, sidecar=True)
+        assert_false(raw_lazy.preload)
+        assert_true(raw_lazy._filenames[0].endswith('-mne.fdt'))
+        assert_allclose(raw_lazy[:][0], raw[:][0], rtol=1e-6, atol=1e-20)
+    assert_true(op.isfile(op.join(tempdir, 'test_onefile_raw-mne.set')))
+    # if the converted files cannot be written, the data are preloaded
+    fname = op.join(tempdir, 'test_nowrite_raw.set')
+    io.savemat(fname, {'EEG': dict(eeg, data=data.astype(np.float64))},
+               appendmat=False)
+    os.mkdir(op.join(tempdir, 'test_nowrite_raw-mne.fdt'))  # can't write
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        raw_lazy = read_raw_eeglab(fname, sidecar=True)
+    assert_true(any('could not be written' in str(ww.message) for ww in w))
+    assert_true(raw_lazy.preload)
+    assert_allclose(raw_lazy[:][0], raw[:][0], rtol=1e-6, atol=1e-20)
+    assert_false(op.isfile(op.join(tempdir, 'test_nowrite_raw-mne.set')))
+
+
 run_tests_if_main()
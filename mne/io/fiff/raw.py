@@ -13,10 +13,11 @@ import os.path as op
 import numpy as np
 
 from ..constants import FIFF
-from ..open import fiff_open, _fiff_get_fid, _get_next_fname
+from ..open import (fiff_open, _fiff_get_fid, _fiff_get_mmap,
+                    _get_next_fname)
 from ..meas_info import read_meas_info
 from ..tree import dir_tree_find
-from ..tag import read_tag, read_tag_info
+from ..tag import read_tag, read_tag_info, _read_tag_mmap
 from ..proj import make_eeg_average_ref_proj, _needs_eeg_average_ref_proj
 from ..base import _BaseRaw, _RawShell, _check_raw_compatibility
 from ..utils import _mult_cal_one
@@ -62,6 +63,13 @@ class Raw(_BaseRaw):
         present).
     fnames : list or str
         Deprecated.
+    dtype : None | np.float32 | np.float64
+        The precision used to store the data in memory when they are
+        (pre)loaded. Single precision (``np.float32``) halves the memory
+        needed. If None (default), double precision is used.
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -81,7 +89,7 @@ class Raw(_BaseRaw):
     @verbose
     def __init__(self, fname, allow_maxshield=False, preload=False,
                  proj=False, compensation=None, add_eeg_ref=True,
-                 fnames=None, verbose=None):
+                 fnames=None, dtype=None, verbose=None):
         dep = ('Supplying a list of filenames with "fnames" to the Raw class '
                'has been deprecated and will be removed in 0.13. Use multiple '
                'calls to read_raw_fif with the "fname" argument followed by '
@@ -153,6 +161,7 @@ class Raw(_BaseRaw):
                  'method and will be removed in 0.14',
                  DeprecationWarning)
             self.apply_gradient_compensation(compensation)
+        self._set_precision(dtype)
         if preload:
             self._preload_data(preload)
         else:
@@ -337,7 +346,7 @@ class Raw(_BaseRaw):
             cals[k] = info['chs'][k]['range'] * info['chs'][k]['cal']
 
         raw._cals = cals
-        raw._raw_extras = raw_extras
+        raw._raw_extras = _RawFifBuffers(raw_extras)
         logger.info('    Range : %d ... %d =  %9.3f ... %9.3f secs' % (
                     raw.first_samp, raw.last_samp,
                     float(raw.first_samp) / info['sfreq'],
@@ -386,50 +395,37 @@ class Raw(_BaseRaw):
         """Read a segment of data from a file"""
         stop -= 1
         offset = 0
+        bufs = self._raw_extras[fi]
         with _fiff_get_fid(self._filenames[fi]) as fid:
-            for this in self._raw_extras[fi]:
-                #  Do we need this buffer
-                if this['last'] >= start:
-                    #  The picking logic is a bit complicated
-                    if stop > this['last'] and start < this['first']:
-                        #    We need the whole buffer
-                        first_pick = 0
-                        last_pick = this['nsamp']
-                        logger.debug('W')
-
-                    elif start >= this['first']:
-                        first_pick = start - this['first']
-                        if stop <= this['last']:
-                            #   Something from the middle
-                            last_pick = this['nsamp'] + stop - this['last']
-                            logger.debug('M')
-                        else:
-                            #   From the middle to the end
-                            last_pick = this['nsamp']
-                            logger.debug('E')
+            mmap = _fiff_get_mmap(fid)
+            # seek directly to the buffers we need
+            for bi in range(*bufs._find_buffers(start, stop)):
+                this = bufs[bi]
+                first_pick = max(start - this['first'], 0)
+                last_pick = min(stop, this['last']) - this['first'] + 1
+                picksamp = last_pick - first_pick
+                # only read data if it exists
+                if this['ent'] is not None:
+                    shape = (this['nsamp'], self.info['nchan'])
+                    rlims = (first_pick, last_pick)
+                    if mmap is None:
+                        one = read_tag(fid, this['ent'].pos,
+                                       shape=shape, rlims=rlims).data
+                        one.shape = (picksamp, self.info['nchan'])
+                        one = one.T
+                        this_idx = idx
                     else:
-                        #    From the beginning to the middle
-                        first_pick = 0
-                        last_pick = stop - this['first'] + 1
-                        logger.debug('B')
-
-                    #   Now we are ready to pick
-                    picksamp = last_pick - first_pick
-                    if picksamp > 0:
-                        # only read data if it exists
-                        if this['ent'] is not None:
-                            one = read_tag(fid, this['ent'].pos,
-                                           shape=(this['nsamp'],
-                                                  self.info['nchan']),
-                                           rlims=(first_pick, last_pick)).data
-                            one.shape = (picksamp, self.info['nchan'])
-                            _mult_cal_one(data[:, offset:(offset + picksamp)],
-                                          one.T, idx, cals, mult)
-                        offset += picksamp
-
-                #   Done?
-                if this['last'] >= stop:
-                    break
+                        # Pick channels from the on-disk view before
+                        # converting, so only what we need is copied
+                        one = _read_tag_mmap(mmap, this['ent'], shape,
+                                             rlims).T
+                        if mult is None:
+                            one, this_idx = one[idx], slice(None)
+                        else:
+                            this_idx = idx
+                    _mult_cal_one(data[:, offset:(offset + picksamp)],
+                                  one, this_idx, cals, mult)
+                offset += picksamp
 
     def fix_mag_coil_types(self):
         """Fix Elekta magnetometer coil types
@@ -464,6 +460,25 @@ class Raw(_BaseRaw):
         return self
 
 
+class _RawFifBuffers(list):
+    """List of the data buffers (and skips) of a raw FIF file
+
+    Each entry is a dict with keys ``ent``, ``first``, ``last`` and
+    ``nsamp``. The sample ranges of the buffers are indexed once so that
+    the buffers needed for a read can be found with a binary search.
+    """
+
+    def __init__(self, bufs):
+        super(_RawFifBuffers, self).__init__(bufs)
+        self._starts = np.array([this['first'] for this in self], np.int64)
+
+    def _find_buffers(self, start, stop):
+        """Get the range of buffers needed for samples start...stop"""
+        first = max(np.searchsorted(self._starts, start, 'right') - 1, 0)
+        last = np.searchsorted(self._starts, stop, 'right')
+        return int(first), int(last)
+
+
 def _check_entry(first, nent):
     """Helper to sanity check entries"""
     if first >= nent:
@@ -472,7 +487,7 @@ def _check_entry(first, nent):
 
 def read_raw_fif(fname, allow_maxshield=False, preload=False,
                  proj=False, compensation=None, add_eeg_ref=True,
-                 fnames=None, verbose=None):
+                 fnames=None, dtype=None, verbose=None):
     """Reader function for Raw FIF data
 
     Parameters
@@ -507,6 +522,13 @@ def read_raw_fif(fname, allow_maxshield=False, preload=False,
         present).
     fnames : list or str
         Deprecated.
+    dtype : None | np.float32 | np.float64
+        The precision used to store the data in memory when they are
+        (pre)loaded. Single precision (``np.float32``) halves the memory
+        needed. If None (default), double precision is used.
+
+        .. versionadded:: 0.13
+
     verbose : bool, str, int, or None
         If not None, override default verbose level (see mne.verbose).
 
@@ -521,4 +543,5 @@ def read_raw_fif(fname, allow_maxshield=False, preload=False,
     """
     return Raw(fname=fname, allow_maxshield=allow_maxshield,
                preload=preload, proj=proj, compensation=compensation,
-               add_eeg_ref=add_eeg_ref, fnames=fnames, verbose=verbose)
+               add_eeg_ref=add_eeg_ref, fnames=fnames, dtype=dtype,
+               verbose=verbose)
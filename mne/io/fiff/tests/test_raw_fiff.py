@@ -9,6 +9,7 @@ import glob
 from copy import deepcopy
 import warnings
 import itertools as itt
+import threading
 
 import numpy as np
 from numpy.testing import (assert_array_almost_equal, assert_array_equal,
@@ -17,6 +18,7 @@ from nose.tools import assert_true, assert_raises, assert_not_equal
 
 from mne.datasets import testing
 from mne.io.constants import FIFF
+from mne.io.open import fiff_open
 from mne.io import Raw, RawArray, concatenate_raws, read_raw_fif
 from mne.io.tests.test_raw import _test_concat, _test_raw_reader
 from mne import (concatenate_events, find_events, equalize_channels,
@@ -26,6 +28,7 @@ from mne.utils import (_TempDir, requires_pandas, slow_test,
 from mne.externals.six.moves import zip, cPickle as pickle
 from mne.io.proc_history import _get_sss_rank
 from mne.io.pick import _picks_by_type
+from mne.io.utils import _SegmentedArray
 from mne.annotations import Annotations
 from mne.tests.common import assert_naming
 
@@ -84,6 +87,85 @@ def test_concat():
     _test_concat(read_raw_fif, test_name)
 
 
+def test_concat_segmented():
+    """Test concatenating preloaded raw instances without copying"""
+    tempdir = _TempDir()
+    raw = read_raw_fif(test_fif_fname, add_eeg_ref=False,
+                       preload=True).crop(0, 12., copy=False)
+    raws = [raw.copy() for _ in range(3)]
+    for ri, this_raw in enumerate(raws):
+        this_raw._data *= ri + 1
+    data = np.concatenate([r._data for r in raws], axis=1)
+    # by default, the data are copied into one array
+    raws_copy = [r.copy() for r in raws]
+    raw_cat = concatenate_raws(list(raws_copy))
+    assert_true(isinstance(raw_cat._data, np.ndarray))
+    assert_true(not any(np.may_share_memory(raw_cat._data, r._data)
+                        for r in raws_copy[1:]))
+    assert_array_equal(raw_cat._data, data)
+    raw_cat = concatenate_raws(list(raws), copy_data=False)
+    # the data are not copied
+    assert_true(all(any(np.may_share_memory(r._data, seg)
+                        for seg in raw_cat._data._segments)
+                    for r in raws[1:]))
+    assert_equal(raw_cat._data.shape, data.shape)
+    assert_array_equal(raw_cat[:, :][0], data)
+    n_times = raw.n_times
+    for sl in (slice(n_times - 10, n_times + 10), slice(5, 2 * n_times + 5),
+               slice(2 * n_times - 1, None)):
+        assert_array_equal(raw_cat[3:10, sl][0], data[3:10, sl])
+    picks = [0, 5, 10]
+    raw_cat[picks, n_times - 5:n_times + 5] = 0.
+    data[picks, n_times - 5:n_times + 5] = 0.
+    assert_array_equal(raw_cat[:, :][0], data)
+    # arithmetic
+    raw_cat._data *= 2.
+    raw_cat._data -= data
+    assert_array_equal(raw_cat[:, :][0], data)
+    raw_cat._data /= data[:, :1] + 1.
+    raw_cat._data *= data[:, :1] + 1.
+    assert_allclose(raw_cat[:, :][0], data, rtol=1e-12)
+    raw_cat._data[:, :] = data
+    assert_array_equal(raw_cat._data * 2., 2. * data)
+    assert_array_equal(data - raw_cat._data, np.zeros_like(data))
+    # appending an instance to itself copies its data
+    raw_self = raw.copy()
+    raw_self.append(raw_self.copy(), copy_data=False)
+    raw_self.append(raw_self, copy_data=False)
+    raw_self._data[0, 0] = 1.
+    for start in (n_times, 2 * n_times, 3 * n_times):
+        assert_equal(raw_self[0, start][0][0, 0], raw[0, 0][0][0, 0])
+    # filtering works across the segments
+    raw_want = RawArray(data, raw_cat.info.copy())
+    picks = pick_types(raw.info, meg=True, eeg=True, exclude=[])
+    raw_iir = raw_cat.copy().filter(1., 40., method='iir')
+    assert_true(isinstance(raw_iir._data, _SegmentedArray))
+    raw_want_iir = raw_want.copy().filter(1., 40., method='iir')
+    assert_allclose(raw_iir[picks][0], raw_want_iir[picks][0], rtol=1e-7,
+                    atol=1e-7 * np.abs(raw_want_iir[picks][0]).max())
+    filter_params = dict(filter_length='auto', l_trans_bandwidth='auto',
+                         h_trans_bandwidth='auto', phase='zero',
+                         fir_window='hamming')
+    raw_cat.filter(1., 40., **filter_params)
+    raw_want.filter(1., 40., **filter_params)
+    assert_allclose(raw_cat[picks][0], raw_want[picks][0], rtol=1e-5,
+                    atol=1e-5 * np.abs(raw_want[picks][0]).max())
+    assert_equal(raw_cat.info['lowpass'], 40.)
+    # the data are shared with the appended instances
+    assert_array_equal(raws[2][:, :][0], raw_cat[:, 2 * n_times:][0])
+    # saving and other operations work on the segments
+    fname = op.join(tempdir, 'test_raw.fif')
+    raw_cat.save(fname)
+    raw_read = read_raw_fif(fname, add_eeg_ref=False)
+    assert_allclose(raw_read[picks][0], raw_cat[picks][0], rtol=1e-6,
+                    atol=1e-6 * np.abs(raw_want[picks][0]).max())
+    raw_cat.pick_channels(raw.ch_names[:10])
+    assert_equal(raw_cat._data.shape, (10, 3 * n_times))
+    raw_crop = raw_cat.copy().crop(0, 1., copy=False)
+    assert_array_equal(raw_crop[:, :][0], raw_cat[:, :raw_crop.n_times][0])
+    assert_true(raw_cat._size > raw_cat._data.nbytes)
+
+
 @testing.requires_testing_data
 def test_hash_raw():
     """Test hashing raw objects"""
@@ -433,6 +515,66 @@ def test_split_files():
     assert_allclose(raw_crop[:][0], raw_read[:][0])
 
 
+def test_buffer_index():
+    """Test finding the buffers needed for a read"""
+    raw = Raw(test_fif_fname)
+    bufs = raw._raw_extras[0]
+    assert_true(len(bufs) > 2)
+    for start, stop in ((raw.first_samp, raw.first_samp),
+                        (raw.first_samp, raw.last_samp),
+                        (bufs[1]['first'], bufs[1]['last']),
+                        (bufs[1]['first'] - 1, bufs[1]['last'] + 1),
+                        (raw.last_samp - 1, raw.last_samp)):
+        # compare to a linear scan
+        want = [bi for bi, this in enumerate(bufs)
+                if this['last'] >= start and this['first'] <= stop]
+        first, last = bufs._find_buffers(start, stop)
+        assert_equal(list(range(first, last)), want)
+    # random reads must match a full read
+    data = raw[:, :][0]
+    rng = np.random.RandomState(0)
+    for start, stop in np.sort(rng.randint(0, raw.n_times, (10, 2)), 1):
+        assert_allclose(raw[:, start:stop + 1][0],
+                        data[:, start:stop + 1])
+
+
+def test_dir_cache():
+    """Test caching of FIF tag directories"""
+    tempdir = _TempDir()
+    cache_dir = op.join(tempdir, 'cache')
+    fname = op.join(tempdir, 'test_raw.fif')
+    raw = Raw(test_fif_fname, add_eeg_ref=False).crop(0, 2, copy=False)
+    raw.save(fname)
+    orig_cache = os.getenv('MNE_FIFF_DIR_CACHE', None)
+    os.environ['MNE_FIFF_DIR_CACHE'] = cache_dir
+    try:
+        os.utime(fname, (1e9, 1e9))
+        fid, tree, directory = fiff_open(fname)
+        fid.close()
+        assert_equal(len(os.listdir(cache_dir)), 1)
+        # corrupt the directory pointer without changing size or mtime
+        with open(fname, 'r+b') as fid:
+            fid.seek(36)
+            fid.write(b'\x00' * 16)
+        os.utime(fname, (1e9, 1e9))
+        # the file appears unchanged, so the cache is used
+        fid, tree_2, directory_2 = fiff_open(fname)
+        fid.close()
+        assert_equal(len(directory_2), len(directory))
+        assert_equal(tree_2['nchild'], tree['nchild'])
+        # once it changes, the file gets scanned again
+        os.utime(fname, (1e9, 1e9 + 10))
+        assert_raises(ValueError, fiff_open, fname)
+        raw.save(fname, overwrite=True)
+        assert_allclose(Raw(fname, add_eeg_ref=False)[:, :][0], raw[:, :][0])
+        assert_equal(len(os.listdir(cache_dir)), 1)
+    finally:
+        if orig_cache is not None:
+            os.environ['MNE_FIFF_DIR_CACHE'] = orig_cache
+        else:
+            del os.environ['MNE_FIFF_DIR_CACHE']
+
+
 def test_load_bad_channels():
     """Test reading/writing of bad channels"""
     tempdir = _TempDir()
@@ -650,6 +792,117 @@ def test_getitem():
                       (slice(-len(raw.ch_names) - 1), slice(None)))
 
 
+def test_memmap_reading():
+    """Test memory-mapped reading of raw data buffers"""
+    tempdir = _TempDir()
+    raw = Raw(test_fif_fname, add_eeg_ref=False).crop(0, 5, copy=False)
+    for fmt in ('short', 'int', 'single', 'double'):
+        raw.save(op.join(tempdir, 'test_raw.fif'), fmt=fmt, overwrite=True,
+                 buffer_size_sec=0.5)
+        raw.save(op.join(tempdir, 'test_raw.fif.gz'), fmt=fmt,
+                 overwrite=True, buffer_size_sec=0.5)
+        # .fif files are memory-mapped, .fif.gz ones go through read_tag
+        raw_mmap = Raw(op.join(tempdir, 'test_raw.fif'), add_eeg_ref=False)
+        raw_gz = Raw(op.join(tempdir, 'test_raw.fif.gz'), add_eeg_ref=False)
+        for picks in (slice(None), slice(10, 20), [0, 5, 300], [375]):
+            for start, stop in ((0, None), (100, 1000), (1500, 1501)):
+                assert_array_equal(raw_mmap[picks, start:stop][0],
+                                   raw_gz[picks, start:stop][0])
+        proj = np.eye(len(raw.ch_names))[::-1]
+        assert_array_equal(raw_mmap._read_segment(10, 900, projector=proj),
+                           raw_gz._read_segment(10, 900, projector=proj))
+
+
+def test_chunk_cache():
+    """Test caching of raw data chunks"""
+    raw = Raw(ctf_comp_fname, add_eeg_ref=False)
+    assert_true(raw.cache_info() is None)
+    # 241 samples in 11 chunks of 24 samples
+    raw_cache = raw.copy().set_cache('1M', chunk_duration=0.05)
+    for picks in (slice(None), [0, 5, 3, 300]):
+        for start, stop in ((0, 10), (5, 30), (0, None), (100, 101),
+                            (230, 241)):
+            assert_array_equal(raw_cache[picks, start:stop][0],
+                               raw[picks, start:stop][0])
+    info = raw_cache.cache_info()
+    assert_equal(info['misses'], 11)
+    assert_equal(info['n_chunks'], 11)
+    assert_true(info['hits'] > 0)
+    assert_true(0 < info['size'] <= info['max_size'])
+    # copies start empty
+    assert_equal(raw_cache.copy().cache_info()['n_chunks'], 0)
+    # chunks read with other calibrations are not used
+    raw_cal = raw_cache.copy()
+    raw_cal[:, :]
+    raw_cal._cals = raw_cal._cals * 2
+    assert_equal(raw_cal.cache_info()['n_chunks'], 0)
+    assert_allclose(raw_cal[:, :][0], 2 * raw[:, :][0], rtol=1e-12)
+    # least recently used chunks are evicted
+    chunk_bytes = len(raw.ch_names) * 24 * 8
+    raw_small = raw.copy().set_cache(2 * chunk_bytes + 1,
+                                     chunk_duration=0.05)
+    assert_array_equal(raw_small[:, :][0], raw[:, :][0])
+    info = raw_small.cache_info()
+    assert_equal(info['n_chunks'], 2)
+    assert_true(info['size'] <= info['max_size'])
+    raw_small[:, 0:10]
+    assert_equal(raw_small.cache_info()['misses'], 12)
+    # compensation and projection are applied to the cached data
+    projs = compute_proj_raw(raw, duration=0.2, n_grad=0, n_mag=1, n_eeg=0)
+    for inst in (raw, raw_cache):
+        inst.apply_gradient_compensation(0)
+        inst.add_proj(projs).apply_proj()
+    assert_allclose(raw_cache[:, 20:200][0], raw[:, 20:200][0],
+                    rtol=1e-6, atol=1e-20)
+    assert_true(raw_cache.set_cache(None).cache_info() is None)
+    raw_cache.set_cache('1M')
+    raw_cache.load_data()
+    assert_true(raw_cache.cache_info() is None)
+    assert_raises(ValueError, raw.set_cache, '10X')
+    assert_raises(ValueError, raw.set_cache, -1)
+
+
+def test_iter_chunks():
+    """Test iterating over chunks of raw data with read-ahead"""
+    raw = Raw(ctf_comp_fname, add_eeg_ref=False)
+    raw_concat = concatenate_raws([raw.copy(), raw.copy()])
+    raw_preload = raw.copy().load_data()
+    n_threads = threading.active_count()
+    for inst in (raw, raw_concat, raw_preload):
+        for picks in (None, [0, 5, 3, 300]):
+            for prefetch in (0, 1, 3):
+                stop = 0
+                for data, times in inst.iter_chunks(0.1, picks=picks,
+                                                    overlap=0.02,
+                                                    prefetch=prefetch):
+                    start = inst.time_as_index(times[0])[0]
+                    assert_equal(start, max(stop - 10, 0))
+                    stop = start + len(times)
+                    assert_true(len(times) <= 48)
+                    use_picks = slice(None) if picks is None else picks
+                    want_data, want_times = inst[use_picks, start:stop]
+                    assert_array_equal(data, want_data)
+                    assert_array_equal(times, want_times)
+                assert_equal(stop, inst.n_times)
+    chunks = list(data.copy() for data, _ in
+                  raw.iter_chunks(0.1, tmin=0.1, tmax=0.2))
+    assert_array_equal(np.concatenate(chunks, axis=1), raw[:, 48:97][0])
+    # stopping early stops reading
+    chunks = raw.iter_chunks(0.01)
+    next(chunks)
+    chunks.close()
+    assert_equal(threading.active_count(), n_threads)
+    # errors while reading are raised
+    raw_bad = raw.copy()
+    raw_bad._read_segment_file = None
+    assert_raises(TypeError, list, raw_bad.iter_chunks(0.1))
+    assert_equal(threading.active_count(), n_threads)
+    assert_raises(ValueError, list, raw.iter_chunks(0.))
+    assert_raises(ValueError, list, raw.iter_chunks(0.1, overlap=0.1))
+    assert_raises(ValueError, list, raw.iter_chunks(0.1, prefetch=-1))
+    assert_raises(ValueError, list, raw.iter_chunks(0.1, tmin=1.))
+
+
 @testing.requires_testing_data
 def test_proj():
     """Test SSP proj operations"""
@@ -884,6 +1137,125 @@ def test_filter_picks():
         assert_raises(RuntimeError, raw_.filter, 10, 30)
 
 
+def test_single_precision():
+    """Test storing raw data in single precision"""
+    raw = read_raw_fif(test_fif_fname, add_eeg_ref=False)
+    raw.crop(0, 5, copy=False)
+    raw_64 = raw.copy().load_data()
+    for raw_32 in (read_raw_fif(test_fif_fname, add_eeg_ref=False,
+                                preload=True,
+                                dtype=np.float32).crop(0, 5, copy=False),
+                   raw.copy().load_data(dtype=np.float32),
+                   raw_64.copy().load_data(dtype=np.float32)):
+        assert_equal(raw_32._data.dtype, np.float32)
+        assert_allclose(raw_32._data, raw_64._data, rtol=1e-6, atol=0)
+    assert_equal(raw_64._data.dtype, np.float64)
+    raw_32 = raw.copy()
+    raw_32.load_data(dtype=np.float32)
+    assert_equal(raw_32[:, :10][0].dtype, np.float32)
+
+    # processing keeps the precision
+    filter_params = dict(filter_length='auto', l_trans_bandwidth='auto',
+                         h_trans_bandwidth='auto', phase='zero',
+                         fir_window='hamming')
+    picks = pick_types(raw.info, meg=True, eeg=True, exclude='bads')
+    for method in ('fir', 'iir'):
+        raw_32_filt = raw_32.copy().filter(1., 40., method=method,
+                                           **filter_params)
+        raw_64_filt = raw_64.copy().filter(1., 40., method=method,
+                                           **filter_params)
+        assert_equal(raw_32_filt._data.dtype, np.float32)
+        data_64 = raw_64_filt._data[picks]
+        scale = np.abs(data_64).max(axis=1)[:, np.newaxis]
+        assert_allclose(raw_32_filt._data[picks] / scale, data_64 / scale,
+                        atol=1e-4)
+    raw_32.add_proj(compute_proj_raw(raw_64, n_grad=1, n_mag=1, n_eeg=0))
+    raw_32.apply_proj()
+    assert_equal(raw_32._data.dtype, np.float32)
+    assert_raises(ValueError, raw.copy().load_data, dtype=np.int16)
+
+
+@slow_test
+def test_filter_stream():
+    """Test filtering and resampling non-preloaded data into a new file"""
+    tempdir = _TempDir()
+    out_fname = op.join(tempdir, 'test_raw.fif')
+    raw = Raw(test_fif_fname, add_eeg_ref=False).crop(0, 20, copy=False)
+    raw_fname = op.join(tempdir, 'test_in_raw.fif')
+    raw.save(raw_fname)
+    raw = Raw(raw_fname, add_eeg_ref=False)
+    raw_preload = raw.copy().load_data()
+    picks = pick_types(raw.info, meg=True, eeg=True, exclude=[])
+    tols = dict(rtol=1e-5, atol=1e-5 * np.abs(raw_preload[picks][0]).max())
+    filter_params = dict(filter_length='auto', l_trans_bandwidth='auto',
+                         h_trans_bandwidth='auto', phase='zero',
+                         fir_window='hamming')
+    for l_freq, h_freq in ((None, 40.), (1., None), (1., 40.), (40., 1.)):
+        raw_filt = raw.filter(l_freq, h_freq, fname=out_fname,
+                              overwrite=True, **filter_params)
+        raw_want = raw_preload.copy().filter(l_freq, h_freq, **filter_params)
+        assert_true(not raw_filt.preload)
+        assert_allclose(raw_filt[picks][0], raw_want[picks][0], **tols)
+        assert_equal(raw_filt.info['lowpass'], raw_want.info['lowpass'])
+        assert_equal(raw_filt.info['highpass'], raw_want.info['highpass'])
+    assert_array_equal(raw[:][0], raw_preload[:][0])  # untouched
+    raw_filt = raw.filter(1., 40., method='iir', fname=out_fname,
+                          overwrite=True)
+    raw_want = raw_preload.copy().filter(1., 40., method='iir')
+    assert_allclose(raw_filt[picks][0], raw_want[picks][0], rtol=1e-3,
+                    atol=1e-3 * np.abs(raw_want[picks][0]).max())
+    notch_params = dict(filter_length='auto', phase='zero',
+                        fir_window='hamming')
+    raw_filt = raw.notch_filter([60., 120.], fname=out_fname,
+                                overwrite=True, **notch_params)
+    raw_want = raw_preload.copy().notch_filter([60., 120.], **notch_params)
+    assert_allclose(raw_filt[picks][0], raw_want[picks][0], **tols)
+    assert_raises(ValueError, raw.notch_filter, None, fname=out_fname,
+                  method='spectrum_fit', overwrite=True)
+    raw_filt = raw.filter(None, 40., fname=out_fname, overwrite=True,
+                          fmt='double', split_size='25MB', **filter_params)
+    assert_equal(raw_filt.orig_format, 'double')
+    assert_true(len(raw_filt._filenames) > 1)
+    raw_want = raw_preload.copy().filter(None, 40., **filter_params)
+    assert_allclose(raw_filt[picks][0], raw_want[picks][0], rtol=1e-10,
+                    atol=1e-10 * np.abs(raw_want[picks][0]).max())
+    assert_raises(ValueError, raw.filter, 1., 40., fname=out_fname,
+                  overwrite=True, fmt='foo')
+    assert_raises(IOError, raw.filter, 1., 40., fname=out_fname)
+    assert_raises(ValueError, raw.filter, 1., 40., fname=raw_fname,
+                  overwrite=True)
+
+    # resampling, also of concatenated files
+    sfreq = raw.info['sfreq'] / 4.
+    raw_concat = concatenate_raws([raw.copy(), raw.copy()])
+    for inst in (raw, raw_concat):
+        inst_res = inst.resample(sfreq, npad=0, fname=out_fname,
+                                 overwrite=True)
+        inst_want = inst.copy().load_data().resample(sfreq, npad=0)
+        assert_equal(inst_res.first_samp, inst_want.first_samp)
+        assert_equal(inst_res.n_times, inst_want.n_times)
+        assert_equal(inst_res.info['sfreq'], sfreq)
+        assert_equal(inst_res.info['lowpass'], inst_want.info['lowpass'])
+        # away from the edges of the files, the results are the same
+        data_res = inst_res[picks, 200:1800][0]
+        data_want = inst_want[picks, 200:1800][0]
+        assert_allclose(data_res, data_want, rtol=1e-3,
+                        atol=1e-3 * np.abs(data_want).max())
+        stim_picks = pick_types(inst.info, meg=False, stim=True)
+        assert_array_equal(inst_res[stim_picks][0], inst_want[stim_picks][0])
+        # the blocks of the polyphase method give the same results
+        inst_res = inst.resample(sfreq, fname=out_fname, overwrite=True,
+                                 method='polyphase')
+        inst_want = inst.copy().load_data().resample(sfreq,
+                                                     method='polyphase')
+        assert_equal(inst_res.n_times, inst_want.n_times)
+        assert_allclose(inst_res[picks][0], inst_want[picks][0], **tols)
+    assert_raises(ValueError, raw.resample, np.pi * 100, fname=out_fname,
+                  overwrite=True)
+    assert_raises(ValueError, raw.copy().load_data().resample, np.pi * 100,
+                  method='polyphase')
+
+
 @testing.requires_testing_data
 def test_crop():
     """Test cropping raw files"""
@@ -5,15 +5,20 @@
 # License: BSD (3-clause)
 
 from ..externals.six import string_types
+import gzip
+from hashlib import sha1
 import numpy as np
+import os
 import os.path as op
 from io import BytesIO
 
+from .block_gzip import _BlockGzipReader, _get_block_index
 from .tag import read_tag_info, read_tag, read_big, Tag
 from .tree import make_dir_tree, dir_tree_find
 from .constants import FIFF
-from ..utils import logger, verbose
+from ..utils import logger, verbose, get_config
 from ..externals import six
+from ..externals.six.moves import cPickle as pickle
 from ..fixes import gzip_open
 
 
@@ -21,8 +26,13 @@ def _fiff_get_fid(fname):
     """Helper to open a FIF file with no additional parsing"""
     if isinstance(fname, string_types):
         if op.splitext(fname)[1].lower() == '.gz':
-            logger.debug('Using gzip')
-            fid = gzip_open(fname, "rb")  # Open in binary mode
+            index = _get_block_index(fname)  # parsed once per file
+            if index is not None:
+                # seekable without decompressing everything up to a tag
+                fid = _BlockGzipReader(fname, index)
+            else:
+                logger.debug('Using gzip')
+                fid = gzip_open(fname, "rb")  # Open in binary mode
         else:
             logger.debug('Using normal I/O')
             fid = open(fname, "rb")  # Open in binary mode
@@ -32,6 +42,73 @@ def _fiff_get_fid(fname):
     return fid
 
 
+def _fiff_get_mmap(fid):
+    """Helper to memory-map an open FIF file (None if not possible)"""
+    if isinstance(fid, gzip.GzipFile) or not hasattr(fid, 'fileno'):
+        return None
+    try:
+        return np.memmap(fid, dtype=np.uint8, mode='r')
+    except (ValueError, EnvironmentError):  # e.g., empty or unmappable file
+        logger.debug('Could not memory-map file, using normal I/O')
+        return None
+
+
+def _get_dir_cache_fname(fname):
+    """Helper to get the cache file of a FIF file (None if not caching)"""
+    cache_dir = get_config('MNE_FIFF_DIR_CACHE', None)
+    if cache_dir is None or not isinstance(fname, string_types):
+        return None
+    key = sha1(op.realpath(fname).encode('utf-8')).hexdigest()
+    return op.join(cache_dir, key + '.pkl')
+
+
+def _read_dir_cache(fname):
+    """Helper to read a cached tag directory and tree if it is up to date"""
+    cache_fname = _get_dir_cache_fname(fname)
+    if cache_fname is None or not op.isfile(cache_fname):
+        return None
+    stat = os.stat(fname)
+    try:
+        with open(cache_fname, 'rb') as fid:
+            cache = pickle.load(fid)
+    except Exception:  # corrupt or incompatible cache, just rebuild it
+        logger.debug('    Could not read tag directory cache %s'
+                     % cache_fname)
+        return None
+    if (cache.get('fname') != op.realpath(fname) or
+            cache.get('size') != stat.st_size or
+            cache.get('mtime') != stat.st_mtime):
+        logger.debug('    Tag directory cache for %s is out of date' % fname)
+        return None
+    logger.debug('    Using tag directory cache %s' % cache_fname)
+    return cache['tree'], cache['directory']
+
+
+def _write_dir_cache(fname, tree, directory):
+    """Helper to cache the tag directory and tree of a file"""
+    cache_fname = _get_dir_cache_fname(fname)
+    if cache_fname is None:
+        return
+    stat = os.stat(fname)
+    cache = dict(fname=op.realpath(fname), size=stat.st_size,
+                 mtime=stat.st_mtime, tree=tree, directory=directory)
+    # write to a temporary file first so readers never see a partial cache
+    tmp_fname = '%s.%d.tmp' % (cache_fname, os.getpid())
+    try:
+        if not op.isdir(op.dirname(cache_fname)):
+            os.makedirs(op.dirname(cache_fname))
+        with open(tmp_fname, 'wb') as fid:
+            pickle.dump(cache, fid, pickle.HIGHEST_PROTOCOL)
+        if op.isfile(cache_fname):
+            os.remove(cache_fname)  # needed on Windows
+        os.rename(tmp_fname, cache_fname)
+    except EnvironmentError:
+        logger.debug('    Could not write tag directory cache %s'
+                     % cache_fname)
+        if op.isfile(tmp_fname):
+            os.remove(tmp_fname)
+
+
 def _get_next_fname(fid, fname, tree):
     """Auxiliary function to get the next filename in split files."""
     nodes_list = dir_tree_find(tree, FIFF.FIFFB_REF)
@@ -97,6 +174,14 @@ def fiff_open(fname, preload=False, verbose=None):
         lists and tags.
     directory : list
         A list of tags.
+
+    Notes
+    -----
+    If the ``MNE_FIFF_DIR_CACHE`` config value (see :func:`mne.set_config`)
+    is set to a directory, the tag directory and tree of files opened by name
+    are cached there. The cache is used on subsequent opens as long as the
+    size and modification time of the file are unchanged, which avoids
+    scanning large files again.
     """
     fid = _fiff_get_fid(fname)
     # do preloading of entire file
@@ -107,6 +192,11 @@ def fiff_open(fname, preload=False, verbose=None):
         fid = BytesIO(read_big(fid_old))
         fid_old.close()
 
+    cache = _read_dir_cache(fname)
+    if cache is not None:
+        tree, directory = cache
+        return fid, tree, directory
+
     tag = read_tag_info(fid)
 
     #   Check that this looks like a fif file
@@ -144,6 +234,7 @@ def fiff_open(fname, preload=False, verbose=None):
                 directory.append(tag)
 
     tree, _ = make_dir_tree(fid, directory)
+    _write_dir_cache(fname, tree, directory)
 
     logger.debug('[done]')
 
@@ -169,7 +169,9 @@ class ProjMixin(object):
         self._projector, self.info = _projector, info
         if isinstance(self, _BaseRaw):
             if self.preload:
-                self._data = np.dot(self._projector, self._data)
+                # keep the precision of the data (e.g., single precision)
+                self._data = np.dot(self._projector.astype(self._data.dtype),
+                                    self._data)
         elif isinstance(self, _BaseEpochs):
             if self.preload:
                 for ii, e in enumerate(self._data):
@@ -9,6 +9,7 @@ import struct
 
 import numpy as np
 
+from .block_gzip import _BlockGzipReader
 from .constants import FIFF
 from ..fixes import partial
 from ..externals.six import text_type
@@ -110,7 +111,9 @@ def read_big(fid, size=None):
     buf_size = 16777216
     if size is None:
         # it's not possible to get .gz uncompressed file size
-        if not isinstance(fid, gzip.GzipFile):
+        if isinstance(fid, _BlockGzipReader):
+            size = fid._size - fid.tell()
+        elif not isinstance(fid, gzip.GzipFile):
             size = os.fstat(fid.fileno()).st_size - fid.tell()
 
     if size is not None:
@@ -367,27 +370,78 @@ def _read_id_struct(fid, tag, shape, rlims):
         usecs=int(np.fromstring(fid.read(4), dtype=">i4")))
 
 
+# Structured dtypes of the fixed-size structs, so that each record (or many
+# records) can be parsed with a single read
+_dig_point_dtype = np.dtype([
+    ('kind', '>i4'), ('ident', '>i4'), ('r', '>f4', (3,))])
+_coord_trans_dtype = np.dtype([
+    ('from', '>i4'), ('to', '>i4'), ('rot', '>f4', (3, 3)),
+    ('move', '>f4', (3,)), ('invrot', '>f4', (3, 3)),
+    ('invmove', '>f4', (3,))])
+_ch_info_dtype = np.dtype([
+    ('scanno', '>i4'), ('logno', '>i4'), ('kind', '>i4'), ('range', '>f4'),
+    ('cal', '>f4'), ('coil_type', '>i4'), ('loc', '>f4', (12,)),
+    ('unit', '>i4'), ('unit_mul', '>i4'), ('ch_name', 'S16')])
+_tag_header_dtype = np.dtype([
+    ('kind', '>i4'), ('type', '>u4'), ('size', '>i4'), ('next', '>i4')])
+
+
+def _read_struct_records(fid, ents, dtype):
+    """Read the data of many tags of the same struct type at once
+
+    Tags that are stored one after the other (the usual case) are read
+    with a single call; otherwise each record is read separately.
+    """
+    n_ent = len(ents)
+    pos = np.array([ent.pos for ent in ents], np.int64)
+    rec_dtype = np.dtype([('header', _tag_header_dtype), ('data', dtype)])
+    if n_ent > 0 and np.all(np.diff(pos) == rec_dtype.itemsize):
+        fid.seek(int(pos[0]), 0)
+        recs = np.fromstring(read_big(fid, n_ent * rec_dtype.itemsize),
+                             rec_dtype)
+        # make sure these really are what we think they are
+        if (np.all(recs['header']['size'] == dtype.itemsize) and
+                np.all(recs['header']['next'] == FIFF.FIFFV_NEXT_SEQ)):
+            return recs['data']
+    recs = np.empty(n_ent, dtype)
+    for ii, this_pos in enumerate(pos):
+        fid.seek(int(this_pos) + 16, 0)  # skip the header
+        recs[ii] = np.fromstring(fid.read(dtype.itemsize), dtype)[0]
+    return recs
+
+
+def _dig_points_from_records(recs):
+    """Convert dig point struct records to dicts"""
+    return [dict(kind=kind, ident=ident, r=r,
+                 coord_frame=FIFF.FIFFV_COORD_UNKNOWN)
+            for kind, ident, r in zip(recs['kind'].tolist(),
+                                      recs['ident'].tolist(),
+                                      list(recs['r'].copy()))]
+
+
+def _read_dig_point_structs(fid, ents):
+    """Read the dig points from many FIFF_DIG_POINT directory entries"""
+    if any(ent.type != FIFF.FIFFT_DIG_POINT_STRUCT for ent in ents):
+        return [read_tag(fid, ent.pos).data for ent in ents]
+    return _dig_points_from_records(
+        _read_struct_records(fid, ents, _dig_point_dtype))
+
+
 def _read_dig_point_struct(fid, tag, shape, rlims):
     """Read dig point struct tag"""
-    return dict(
-        kind=int(np.fromstring(fid.read(4), dtype=">i4")),
-        ident=int(np.fromstring(fid.read(4), dtype=">i4")),
-        r=np.fromstring(fid.read(12), dtype=">f4"),
-        coord_frame=FIFF.FIFFV_COORD_UNKNOWN)
+    recs = np.fromstring(fid.read(_dig_point_dtype.itemsize),
+                         _dig_point_dtype)
+    return _dig_points_from_records(recs)[0]
 
 
 def _read_coord_trans_struct(fid, tag, shape, rlims):
     """Read coord trans struct tag"""
     from ..transforms import Transform
-    fro = int(np.fromstring(fid.read(4), dtype=">i4"))
-    to = int(np.fromstring(fid.read(4), dtype=">i4"))
-    rot = np.fromstring(fid.read(36), dtype=">f4").reshape(3, 3)
-    move = np.fromstring(fid.read(12), dtype=">f4")
-    trans = np.r_[np.c_[rot, move],
+    rec = np.fromstring(fid.read(_coord_trans_dtype.itemsize),
+                        _coord_trans_dtype)[0]
+    trans = np.r_[np.c_[rec['rot'], rec['move']],
                   np.array([[0], [0], [0], [1]]).T]
-    data = Transform(fro, to, trans)
-    fid.seek(48, 1)  # Skip over the inverse transformation
-    return data
+    return Transform(int(rec['from']), int(rec['to']), trans)
 
 
 _coord_dict = {
@@ -397,28 +451,38 @@ _coord_dict = {
 }
 
 
+def _ch_infos_from_records(recs):
+    """Convert channel info struct records to dicts"""
+    # deal with really old OSX Anaconda bug by casting to float64
+    locs = recs['loc'].astype(np.float64)
+    chs = list()
+    for ii, (scanno, logno, kind, range_, cal, coil_type, unit, unit_mul,
+             ch_name) in enumerate(zip(*[recs[key].tolist() for key in (
+                 'scanno', 'logno', 'kind', 'range', 'cal', 'coil_type',
+                 'unit', 'unit_mul', 'ch_name')])):
+        chs.append(dict(
+            scanno=scanno, logno=logno, kind=kind, range=range_, cal=cal,
+            coil_type=coil_type, loc=locs[ii].copy(), unit=unit,
+            unit_mul=unit_mul,
+            # channel name is terminated by the first null byte
+            ch_name=ch_name.split(b'\0', 1)[0].decode(),
+            # coil coordinate system definition
+            coord_frame=_coord_dict.get(kind, FIFF.FIFFV_COORD_UNKNOWN)))
+    return chs
+
+
+def _read_ch_info_structs(fid, ents):
+    """Read the channel infos from many FIFF_CH_INFO directory entries"""
+    if any(ent.type != FIFF.FIFFT_CH_INFO_STRUCT for ent in ents):
+        return [read_tag(fid, ent.pos).data for ent in ents]
+    return _ch_infos_from_records(
+        _read_struct_records(fid, ents, _ch_info_dtype))
+
+
 def _read_ch_info_struct(fid, tag, shape, rlims):
     """Read channel info struct tag"""
-    d = dict(
-        scanno=int(np.fromstring(fid.read(4), dtype=">i4")),
-        logno=int(np.fromstring(fid.read(4), dtype=">i4")),
-        kind=int(np.fromstring(fid.read(4), dtype=">i4")),
-        range=float(np.fromstring(fid.read(4), dtype=">f4")),
-        cal=float(np.fromstring(fid.read(4), dtype=">f4")),
-        coil_type=int(np.fromstring(fid.read(4), dtype=">i4")),
-        # deal with really old OSX Anaconda bug by casting to float64
-        loc=np.fromstring(fid.read(48), dtype=">f4").astype(np.float64),
-        # unit and exponent
-        unit=int(np.fromstring(fid.read(4), dtype=">i4")),
-        unit_mul=int(np.fromstring(fid.read(4), dtype=">i4")),
-    )
-    # channel name
-    ch_name = np.fromstring(fid.read(16), dtype=">c")
-    ch_name = ch_name[:np.argmax(ch_name == b'')].tostring()
-    d['ch_name'] = ch_name.decode()
-    # coil coordinate system definition
-    d['coord_frame'] = _coord_dict.get(d['kind'], FIFF.FIFFV_COORD_UNKNOWN)
-    return d
+    recs = np.fromstring(fid.read(_ch_info_dtype.itemsize), _ch_info_dtype)
+    return _ch_infos_from_records(recs)[0]
 
 
 def _read_old_pack(fid, tag, shape, rlims):
@@ -468,6 +532,46 @@ _simple_dict = {
 for key, dtype in _simple_dict.items():
     _call_dict[key] = partial(_read_simple, dtype=dtype)
 
+# Types that can be viewed directly in a memory-mapped file
+_mmap_dict = dict(_simple_dict)
+_mmap_dict.update({
+    FIFF.FIFFT_COMPLEX_FLOAT: '>c8',
+    FIFF.FIFFT_COMPLEX_DOUBLE: '>c16',
+})
+
+
+def _read_tag_mmap(mmap, tag, shape, rlims):
+    """Get a read-only view of rows of a data tag in a memory-mapped file
+
+    Parameters
+    ----------
+    mmap : instance of np.memmap
+        The whole file mapped as bytes (see ``_fiff_get_mmap``).
+    tag : instance of Tag
+        The directory entry of the tag (its data must be a simple type).
+    shape : tuple
+        The (row-major) 2D shape of the stored data.
+    rlims : tuple
+        The first (inclusive) and last (exclusive) rows to retrieve.
+
+    Returns
+    -------
+    data : array, shape (rlims[1] - rlims[0], shape[1])
+        View of the data; nothing is read from disk until it is accessed.
+    """
+    dtype = np.dtype(_mmap_dict[tag.type])
+    row_size = dtype.itemsize * shape[1]
+    if shape[0] * row_size != tag.size:
+        raise ValueError('Wrong shape specified, requested %s have %s'
+                         % (shape[0] * row_size, tag.size))
+    n_row_out = rlims[1] - rlims[0]
+    # skip the 16-byte tag header
+    offset = int(tag.pos + 16 + rlims[0] * row_size)
+    data = np.frombuffer(mmap, dtype, count=n_row_out * shape[1],
+                         offset=offset)
+    data.shape = (n_row_out, shape[1])
+    return data
+
 
 def read_tag(fid, pos=None, shape=None, rlims=None):
     """Read a Tag from a file at a given position
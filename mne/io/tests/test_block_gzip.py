@@ -0,0 +1,83 @@
+import os.path as op
+
+from nose.tools import assert_equal, assert_true, assert_false, assert_raises
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from mne import create_info
+from mne.fixes import gzip_open
+from mne.io import RawArray, read_raw_fif
+from mne.io.block_gzip import (_BlockGzipReader, _BlockGzipWriter,
+                               _is_block_gzip, _get_block_index)
+from mne.io.open import _fiff_get_fid
+from mne.utils import _TempDir, run_tests_if_main
+
+
+def test_block_gzip_io():
+    """Test reading and writing block-compressed gzip files"""
+    tempdir = _TempDir()
+    fname = op.join(tempdir, 'test.gz')
+    rng = np.random.RandomState(0)
+    # the index needs more than one member for 9000 blocks
+    for n_bytes, block_size in ((0, 64), (1, 64), (64, 64), (65, 64),
+                                (1000, 64), (9000 * 64 + 1, 64)):
+        data = rng.randint(0, 3, n_bytes).astype(np.uint8).tostring()
+        with _BlockGzipWriter(fname, block_size=block_size) as fid:
+            start = 0
+            while start < n_bytes:  # write in uneven pieces
+                stop = start + rng.randint(1, 300)
+                fid.write(data[start:stop])
+                start = stop
+            assert_equal(fid.tell(), n_bytes)
+        assert_true(_is_block_gzip(fname))
+        # still a valid gzip file
+        with gzip_open(fname, 'rb') as fid:
+            assert_equal(fid.read(), data)
+        with _BlockGzipReader(fname) as fid:
+            assert_equal(fid.read(), data)
+            for start in rng.randint(0, n_bytes + 1, 20):
+                fid.seek(start)
+                assert_equal(fid.read(100), data[start:start + 100])
+                assert_equal(fid.tell(), min(start + 100, n_bytes))
+            fid.seek(0)
+            fid.seek(n_bytes // 2, 1)
+            assert_equal(fid.read(), data[n_bytes // 2:])
+            fid.seek(-min(n_bytes, 10), 2)
+            assert_equal(fid.read(), data[-min(n_bytes, 10):])
+            assert_raises(IOError, fid.seek, -1)
+    # normal gzip files are not block-compressed
+    with gzip_open(fname, 'wb') as fid:
+        fid.write(data)
+    assert_false(_is_block_gzip(fname))
+    assert_raises(ValueError, _BlockGzipReader, fname)
+
+
+def test_block_gzip_raw():
+    """Test random access to compressed raw FIF files"""
+    tempdir = _TempDir()
+    rng = np.random.RandomState(0)
+    info = create_info(10, 1000., 'eeg')
+    raw = RawArray(rng.randn(10, 20000), info)
+    fname = op.join(tempdir, 'test_raw.fif.gz')
+    raw.save(fname, fmt='double')
+    assert_true(_is_block_gzip(fname))
+    with _fiff_get_fid(fname) as fid:
+        assert_true(isinstance(fid, _BlockGzipReader))
+    # the index is parsed once, not for every segment read
+    assert_true(_get_block_index(fname) is _get_block_index(fname))
+    for preload in (False, True):
+        raw_read = read_raw_fif(fname, preload=preload, add_eeg_ref=False)
+        for start, stop in ((0, 10), (12345, 12400), (19990, 20000)):
+            assert_array_equal(raw_read[:, start:stop][0],
+                               raw[:, start:stop][0])
+    # the same file compressed the standard way can still be read
+    with gzip_open(fname, 'rb') as fid:
+        data = fid.read()
+    with gzip_open(fname, 'wb') as fid:
+        fid.write(data)
+    assert_false(_is_block_gzip(fname))
+    raw_read = read_raw_fif(fname, add_eeg_ref=False)
+    assert_array_equal(raw_read[:, 12345:12400][0], raw[:, 12345:12400][0])
+
+
+run_tests_if_main()
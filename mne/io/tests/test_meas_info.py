@@ -11,10 +11,13 @@ from mne.io import (read_fiducials, write_fiducials, _coil_trans_to_loc,
                     _loc_to_coil_trans, Raw, read_info, write_info,
                     anonymize_info)
 from mne.io.constants import FIFF
+from mne.io.open import fiff_open
+from mne.io.tag import (read_tag, _read_ch_info_structs,
+                        _read_dig_point_structs)
 from mne.io.meas_info import (Info, create_info, _write_dig_points,
                               _read_dig_points, _make_dig_points, _merge_info,
                               _force_update_info, RAW_INFO_FIELDS)
-from mne.utils import _TempDir, run_tests_if_main
+from mne.utils import _TempDir, run_tests_if_main, object_diff
 from mne.channels.montage import read_montage, read_dig_montage
 
 base_dir = op.join(op.dirname(__file__), 'data')
@@ -190,6 +193,32 @@ def test_read_write_info():
     assert_equal(info['subject_info']['his_id'], creator)
 
 
+def test_read_structs():
+    """Test reading many channel info and dig point structs at once"""
+    for fname in (raw_fname, chpi_fname):
+        fid, tree, _ = fiff_open(fname)
+        with fid:
+            for kind, read_structs in (
+                    (FIFF.FIFF_CH_INFO, _read_ch_info_structs),
+                    (FIFF.FIFF_DIG_POINT, _read_dig_point_structs)):
+                ents = [ent for ent in _get_directory(tree)
+                        if ent.kind == kind]
+                assert_true(len(ents) > 1)
+                # contiguous tags and (with every other one) scattered tags
+                for these_ents in (ents, ents[::2]):
+                    want = [read_tag(fid, ent.pos).data for ent in these_ents]
+                    got = read_structs(fid, these_ents)
+                    assert_equal(object_diff(want, got), '')
+
+
+def _get_directory(tree):
+    """Helper to get all directory entries of a tree"""
+    ents = list(tree['directory']) if tree['nent'] > 0 else []
+    for child in tree['children']:
+        ents += _get_directory(child)
+    return ents
+
+
 def test_io_dig_points():
     """Test Writing for dig files"""
     tempdir = _TempDir()
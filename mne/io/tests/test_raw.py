@@ -47,13 +47,20 @@ def _test_raw_reader(reader, test_preloading=True, **kwargs):
             slices += [slice(bnd, 2 * bnd), slice(bnd, bnd + 1),
                        slice(0, bnd + 100)]
         other_raws = [reader(preload=buffer_fname, **kwargs),
-                      reader(preload=False, **kwargs)]
+                      reader(preload=False, **kwargs),
+                      reader(preload=False, **kwargs).set_cache(
+                          '10M', chunk_duration=0.3)]
         for sl_time in slices:
             for other_raw in other_raws:
                 data1, times1 = raw[picks, sl_time]
                 data2, times2 = other_raw[picks, sl_time]
                 assert_allclose(data1, data2)
                 assert_allclose(times1, times2)
+        assert_true(other_raws[2].cache_info()['hits'] > 0)
+        # chunks read ahead in the background make up the data
+        chunks = [data.copy() for data, _ in
+                  other_raws[1].iter_chunks(0.3, picks=picks, prefetch=2)]
+        assert_allclose(np.concatenate(chunks, axis=1), raw[picks][0])
     else:
         raw = reader(**kwargs)
 
@@ -0,0 +1,47 @@
+# License: BSD (3-clause)
+
+import threading
+
+from nose.tools import assert_equal, assert_raises
+import numpy as np
+
+from mne.io.write import _ThreadedWriter
+from mne.externals.six import BytesIO
+from mne.utils import run_tests_if_main
+
+
+class _BadFile(BytesIO):
+    """A file that fails after a few writes"""
+
+    def write(self, data):
+        if self.tell() > 10:
+            raise IOError('disk full')
+        return BytesIO.write(self, data)
+
+
+def test_threaded_writer():
+    """Test writing files in a background thread"""
+    n_threads = threading.active_count()
+    rng = np.random.RandomState(0)
+    pieces = [rng.randint(0, 255, n).astype(np.uint8).tostring()
+              for n in rng.randint(0, 1000, 100)]
+    fid = BytesIO()
+    fid.write(b'head')
+    writer = _ThreadedWriter(fid, max_pending=2)
+    for piece in pieces:
+        writer.write(piece)
+    assert_equal(writer.tell(), 4 + sum(len(piece) for piece in pieces))
+    assert_equal(writer.n_bytes, sum(len(piece) for piece in pieces))
+    writer.finish()
+    writer.finish()
+    assert_equal(fid.getvalue(), b'head' + b''.join(pieces))
+    assert_equal(threading.active_count(), n_threads)
+    # errors are raised by the next write or when finishing
+    writer = _ThreadedWriter(_BadFile())
+    assert_raises(IOError, lambda: [writer.write(piece) for piece in pieces])
+    writer.join()  # only waits
+    assert_raises(IOError, writer.finish)
+    assert_equal(threading.active_count(), n_threads)
+
+
+run_tests_if_main()
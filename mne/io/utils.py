@@ -8,9 +8,13 @@
 #
 # License: BSD (3-clause)
 
+import operator
+import threading
+
 import numpy as np
 
-from ..externals.six import b
+from ..externals.six import b, string_types
+from ..fixes import OrderedDict
 from .constants import FIFF
 
 
@@ -42,6 +46,286 @@ def _mult_cal_one(data_view, one, idx, cals, mult):
             data_view *= cals
 
 
+class _ChunkCache(object):
+    """Size-bounded LRU cache of chunks of raw data
+
+    Parameters
+    ----------
+    max_size : int | str
+        The maximum size of the cached data in bytes, or a string with a
+        unit ('K', 'M' or 'G', e.g. '100M').
+    chunk_size : int
+        The number of samples of each chunk.
+    """
+
+    def __init__(self, max_size, chunk_size):
+        self._lock = threading.Lock()  # shared with the prefetch threads
+        if isinstance(max_size, string_types):
+            units = dict(K=1024, M=1024 ** 2, G=1024 ** 3)
+            if max_size[-1:].upper() not in units:
+                raise ValueError('max_size must end with K, M or G, got %s'
+                                 % max_size)
+            max_size = float(max_size[:-1]) * units[max_size[-1:].upper()]
+        self.max_size = int(max_size)
+        self.chunk_size = int(chunk_size)
+        if self.max_size < 0 or self.chunk_size < 1:
+            raise ValueError('max_size must be positive and chunk_size at '
+                             'least 1, got %s and %s'
+                             % (max_size, chunk_size))
+        self._chunks = OrderedDict()
+        self.clear()
+
+    def clear(self):
+        """Remove all chunks and reset the counters"""
+        with self._lock:
+            self._chunks.clear()
+            self.size = self.hits = self.misses = 0
+
+    def get(self, key, start, stop):
+        """Get a chunk that has the samples from start to stop (or None)"""
+        with self._lock:
+            chunk = self._chunks.pop(key, None)
+            if chunk is not None:
+                self._chunks[key] = chunk  # most recently used
+                if chunk[0] <= start and chunk[0] + chunk[1].shape[1] >= stop:
+                    self.hits += 1
+                    return chunk
+            self.misses += 1
+            return None
+
+    def add(self, key, first, data):
+        """Add a chunk starting at sample first"""
+        data.flags.writeable = False
+        with self._lock:
+            old = self._chunks.pop(key, None)
+            if old is not None:
+                self.size -= old[1].nbytes
+            if data.nbytes > self.max_size:
+                return
+            self._chunks[key] = (first, data)
+            self.size += data.nbytes
+            while self.size > self.max_size:  # evict the least recently used
+                self.size -= self._chunks.popitem(last=False)[1][1].nbytes
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def __deepcopy__(self, memo):
+        # copies start with an empty cache
+        return _ChunkCache(self.max_size, self.chunk_size)
+
+    def __reduce__(self):
+        # locks cannot be pickled, unpickled caches also start empty
+        return _ChunkCache, (self.max_size, self.chunk_size)
+
+
+class _SegmentedArray(object):
+    """Two-dimensional array stored as a list of segments along time
+
+    This is used for the data of concatenated raw instances, so that the
+    data of the individual instances do not have to be copied into one
+    array. Indexing gathers the samples from the segments they are stored
+    in (it always returns a copy), and assigning to a selection and in-place
+    arithmetic write to the segments. Other arithmetic and NumPy operations
+    work on a contiguous copy of the data (see ``__array__``).
+
+    Parameters
+    ----------
+    segments : list of ndarray, shape (n_channels, n_times)
+        The arrays to concatenate along the last axis. They are not copied.
+    """
+
+    ndim = 2
+
+    def __init__(self, segments):
+        flat = list()
+        for seg in segments:
+            flat.extend(seg._segments if isinstance(seg, _SegmentedArray)
+                        else [seg])
+        if len(flat) == 0:
+            raise ValueError('At least one segment is required')
+        if any(seg.ndim != 2 or seg.shape[0] != flat[0].shape[0] or
+               seg.dtype != flat[0].dtype for seg in flat):
+            raise ValueError('All segments must be 2D arrays with the same '
+                             'number of channels and dtype')
+        self._segments = flat
+        self._offsets = np.cumsum([0] + [seg.shape[1] for seg in flat])
+
+    @property
+    def shape(self):
+        return (self._segments[0].shape[0], int(self._offsets[-1]))
+
+    @property
+    def dtype(self):
+        return self._segments[0].dtype
+
+    @property
+    def size(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def nbytes(self):
+        return sum(seg.nbytes for seg in self._segments)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        data = np.concatenate(self._segments, axis=1)
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def _split_key(self, key):
+        """Get the channel and time parts of an index"""
+        key = key if isinstance(key, tuple) else (key,)
+        for ki, k in enumerate(key):
+            if k is Ellipsis:
+                key = (key[:ki] + (slice(None),) * (3 - len(key)) +
+                       key[ki + 1:])
+                break
+        key = key + (slice(None),) * (2 - len(key))
+        if len(key) != 2:
+            raise IndexError('too many indices for array')
+        idx, times = key
+        # times as a contiguous range (start, stop) or as sample indices
+        n_times = self.shape[1]
+        if isinstance(times, slice) and times.step in (None, 1):
+            return idx, times.indices(n_times)[:2], False
+        if isinstance(times, (int, np.integer)):
+            if not -n_times <= times < n_times:
+                raise IndexError('index %s is out of bounds for axis 1 with '
+                                 'size %s' % (times, n_times))
+            times = int(times) % n_times
+            return idx, (times, times + 1), True
+        if isinstance(times, tuple):
+            times = list(times)
+        return idx, np.arange(n_times)[times], False
+
+    def _locate(self, start, stop):
+        """Get the (segment, start, stop, offset) of a range of samples"""
+        for si, seg in enumerate(self._segments):
+            first, last = self._offsets[si], self._offsets[si + 1]
+            if first < stop and last > start:
+                yield (seg, max(start, first) - first,
+                       min(stop, last) - first, max(start, first) - start)
+
+    def __getitem__(self, key):
+        idx, times, squeeze = self._split_key(key)
+        if isinstance(times, tuple):
+            start, stop = times
+            stop = max(start, stop)
+            pieces = [seg[idx, a:b] for seg, a, b, _ in
+                      self._locate(start, stop)]
+            if len(pieces) == 0:
+                pieces = [self._segments[0][idx, :0]]
+            data = (pieces[0].copy() if len(pieces) == 1 else
+                    np.concatenate(pieces, axis=-1))
+            return data[..., 0] if squeeze else data
+        if not isinstance(idx, (slice, int, np.integer)):
+            # two sets of indices are combined element by element
+            return np.asarray(self)[idx, times]
+        data = np.empty(self._segments[0][idx, :0].shape[:-1] + times.shape,
+                        self.dtype)
+        for si, seg in enumerate(self._segments):
+            mask = ((times >= self._offsets[si]) &
+                    (times < self._offsets[si + 1]))
+            data[..., mask] = seg[idx][..., times[mask] - self._offsets[si]]
+        return data
+
+    def __setitem__(self, key, value):
+        idx, times, squeeze = self._split_key(key)
+        value = np.asarray(value)
+        if isinstance(times, tuple):
+            start, stop = times
+            n_sel = max(stop - start, 0)
+            for seg, a, b, offset in self._locate(start, stop):
+                if squeeze:
+                    seg[idx, a] = value
+                elif value.ndim > 0 and value.shape[-1] == n_sel:
+                    seg[idx, a:b] = value[..., offset:offset + b - a]
+                else:
+                    seg[idx, a:b] = value
+            return
+        if not isinstance(idx, (slice, int, np.integer)):
+            raise IndexError('Channel and time indices cannot both be '
+                             'arrays for segmented data')
+        for si, seg in enumerate(self._segments):
+            mask = ((times >= self._offsets[si]) &
+                    (times < self._offsets[si + 1]))
+            this_value = value
+            if value.ndim > 0 and value.shape[-1] == len(times):
+                this_value = value[..., mask]
+            seg_view = seg[idx]
+            seg_view[..., times[mask] - self._offsets[si]] = this_value
+
+    def copy(self):
+        return _SegmentedArray([seg.copy() for seg in self._segments])
+
+    def astype(self, dtype, copy=True):
+        if not copy and np.dtype(dtype) == self.dtype:
+            return self
+        return _SegmentedArray([seg.astype(dtype) for seg in self._segments])
+
+    def take(self, indices, axis=None):
+        if axis == 0:
+            return _SegmentedArray([seg.take(indices, axis=0)
+                                    for seg in self._segments])
+        return np.asarray(self).take(indices, axis=axis)
+
+    def _inplace(self, func, value):
+        """Apply an in-place operator to the segments"""
+        value = np.asarray(value)
+        n_times = self.shape[1]
+        for seg, a, b, offset in self._locate(0, n_times):
+            if value.ndim > 0 and value.shape[-1] == n_times:
+                func(seg, value[..., offset:offset + b - a])
+            else:
+                func(seg, value)
+        return self
+
+    def __iadd__(self, value):
+        return self._inplace(operator.iadd, value)
+
+    def __isub__(self, value):
+        return self._inplace(operator.isub, value)
+
+    def __imul__(self, value):
+        return self._inplace(operator.imul, value)
+
+    def __itruediv__(self, value):
+        return self._inplace(operator.itruediv, value)
+
+    __idiv__ = __itruediv__
+
+    def __neg__(self):
+        return -np.asarray(self)
+
+    def __add__(self, other):
+        return np.asarray(self) + other
+
+    def __radd__(self, other):
+        return other + np.asarray(self)
+
+    def __sub__(self, other):
+        return np.asarray(self) - other
+
+    def __rsub__(self, other):
+        return other - np.asarray(self)
+
+    def __mul__(self, other):
+        return np.asarray(self) * other
+
+    def __rmul__(self, other):
+        return other * np.asarray(self)
+
+    def __truediv__(self, other):
+        return np.asarray(self) / other
+
+    def __rtruediv__(self, other):
+        return other / np.asarray(self)
+
+    __div__, __rdiv__ = __truediv__, __rtruediv__
+
+
 def _blk_read_lims(start, stop, buf_len):
     """Helper to deal with indexing in the middle of a data block
 
@@ -148,28 +432,44 @@ def _read_segments_file(raw, data, idx, fi, start, stop, cals, mult,
     if n_channels is None:
         n_channels = raw.info['nchan']
     n_bytes = np.dtype(dtype).itemsize
-    # data_offset and data_left count data samples (channels x time points),
-    # not bytes.
+    # data_offset counts bytes, the data are multiplexed (all channels of
+    # each time point are stored together)
     data_offset = n_channels * start * n_bytes + offset
-    data_left = (stop - start) * n_channels
-
-    # Read up to 100 MB of data at a time, block_size is in data samples
-    block_size = ((int(100e6) // n_bytes) // n_channels) * n_channels
-    block_size = min(data_left, block_size)
-    with open(raw._filenames[fi], 'rb', buffering=0) as fid:
-        fid.seek(data_offset)
-        # extract data in chunks
-        for sample_start in np.arange(0, data_left, block_size) // n_channels:
-            count = min(block_size, data_left - sample_start * n_channels)
-            block = np.fromfile(fid, dtype, count)
-            block = block.reshape(n_channels, -1, order='F')
-            n_samples = block.shape[1]  # = count // n_channels
-            sample_stop = sample_start + n_samples
+    n_read = stop - start
+    # map only the requested time points, so that reading a short window (or
+    # a few channels) only touches the bytes that are needed
+    mmap = np.memmap(raw._filenames[fi], dtype=dtype, mode='r',
+                     offset=data_offset, shape=(n_read, n_channels))
+    n_total = n_channels if trigger_ch is None else n_channels + 1
+    if mult is None:
+        sel = np.arange(n_total)[idx]
+        data_picks = np.where(sel < n_channels)[0]
+        stim_picks = np.where(sel >= n_channels)[0]
+        sel = sel[data_picks]
+
+    # Copy about 1 MB of data at a time (small enough for the temporaries to
+    # stay in the cache), block_size is in time points
+    block_size = max(int(1e6) // n_bytes // n_channels, 1)
+    for sample_start in range(0, n_read, block_size):
+        sample_stop = min(sample_start + block_size, n_read)
+        block = mmap[sample_start:sample_stop]
+        data_view = data[:, sample_start:sample_stop]
+        if trigger_ch is not None:
+            stim_ch = trigger_ch[start + sample_start:start + sample_stop]
+        if mult is None:
+            # write the channels (and the stim channel) directly to the output
+            data_view[data_picks] = block[:, sel].T
+            if trigger_ch is not None:
+                data_view[stim_picks] = stim_ch
+            if cals is not None:
+                data_view *= cals
+        else:
+            one = np.empty((n_total, sample_stop - sample_start), data.dtype)
+            one[:n_channels] = block.T
             if trigger_ch is not None:
-                stim_ch = trigger_ch[start:stop][sample_start:sample_stop]
-                block = np.vstack((block, stim_ch))
-            data_view = data[:, sample_start:sample_stop]
-            _mult_cal_one(data_view, block, idx, cals, mult)
+                one[n_channels] = stim_ch
+            _mult_cal_one(data_view, one, idx, cals, mult)
+    del mmap
 
 
 def read_str(fid, count=1):
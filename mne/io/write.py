@@ -4,6 +4,8 @@
 # License: BSD (3-clause)
 
 from ..externals.six import string_types, b
+from ..externals.six.moves import queue
+import threading
 import time
 import numpy as np
 from scipy import linalg
@@ -11,10 +13,10 @@ import os.path as op
 import re
 import uuid
 
+from .block_gzip import _BlockGzipWriter
 from .constants import FIFF
 from ..utils import logger
 from ..externals.jdcal import jcal2jd
-from ..fixes import gzip_open
 
 
 def _write(fid, data, kind, data_size, FIFFT_TYPE, dtype):
@@ -31,6 +33,73 @@ def _write(fid, data, kind, data_size, FIFFT_TYPE, dtype):
     fid.write(np.array(data, dtype=dtype).tostring())
 
 
+class _ThreadedWriter(object):
+    """Write to a file in a background thread
+
+    The data to write are queued and written by a background thread, so
+    the next data can be prepared meanwhile. The position in the file is
+    tracked without waiting for the writes.
+
+    Parameters
+    ----------
+    fid : file-like
+        The open file to write to. It must not be used directly before
+        :meth:`finish` is called.
+    max_pending : int
+        The maximum number of writes to queue before ``write`` blocks.
+    """
+
+    def __init__(self, fid, max_pending=16):
+        self._fid = fid
+        self._pos = fid.tell()
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self.n_bytes = 0
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        """Write the queued data until None is queued"""
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            if self._error is None:  # after an error, only empty the queue
+                try:
+                    self._fid.write(data)
+                except Exception as exp:
+                    self._error = exp
+
+    def _check_error(self):
+        """Raise the error that occurred while writing, if any"""
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data):
+        """Queue data to write"""
+        self._check_error()
+        self._queue.put(data)
+        self._pos += len(data)
+        self.n_bytes += len(data)
+
+    def tell(self):
+        """Get the position after the queued data"""
+        return self._pos
+
+    def join(self):
+        """Wait until the queued data are written, without raising errors"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def finish(self):
+        """Wait until the queued data are written (the file stays open)"""
+        self.join()
+        self._check_error()
+
+
 def _get_split_size(split_size):
     """Convert human-readable bytes to machine-readable bytes."""
     if isinstance(split_size, string_types):
@@ -244,10 +313,11 @@ def start_file(fname, id_=None):
     """
     if isinstance(fname, string_types):
         if op.splitext(fname)[1].lower() == '.gz':
-            logger.debug('Writing using gzip')
+            logger.debug('Writing using block-compressed gzip')
             # defaults to compression level 9, which is barely smaller but much
-            # slower. 2 offers a good compromise.
-            fid = gzip_open(fname, "wb", compresslevel=2)
+            # slower. 2 offers a good compromise. Independently compressed
+            # blocks allow random access when reading (still valid gzip).
+            fid = _BlockGzipWriter(fname, compresslevel=2)
         else:
             logger.debug('Writing using normal I/O')
             fid = open(fname, "wb")
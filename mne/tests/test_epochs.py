@@ -31,7 +31,7 @@ from mne.utils import (_TempDir, requires_pandas, slow_test,
                        requires_version)
 from mne.chpi import read_head_pos, head_pos_to_trans_rot_t
 
-from mne.io import RawArray, Raw
+from mne.io import RawArray, Raw, concatenate_raws
 from mne.io.proj import _has_eeg_average_ref_proj
 from mne.event import merge_events
 from mne.io.constants import FIFF
@@ -2136,4 +2136,271 @@ def test_default_values():
     assert_equal(hash(epoch_1), hash(epoch_2))
 
 
+def test_single_precision():
+    """Test storing epochs in single precision"""
+    tempdir = _TempDir()
+    raw, events = _get_data()[:2]
+    picks = pick_types(raw.info, meg='mag', exclude='bads')
+    raw_32 = raw.copy().load_data(dtype=np.float32)
+    epochs_64 = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                       preload=True)
+    evoked_64 = epochs_64.average()
+    tols = dict(rtol=1e-4, atol=1e-4 * np.abs(epochs_64.get_data()).max())
+    for epochs_32 in (Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                             preload=True, dtype=np.float32),
+                      Epochs(raw_32, events, event_id, tmin, tmax,
+                             picks=picks, preload=True),
+                      Epochs(raw_32, events, event_id, tmin, tmax,
+                             picks=picks)):
+        assert_equal(epochs_32.get_data().dtype, np.float32)
+        assert_allclose(epochs_32.get_data(), epochs_64.get_data(), **tols)
+        for evoked_32 in (epochs_32.average(), epochs_32.standard_error()):
+            assert_equal(evoked_32.data.dtype, np.float32)
+        assert_allclose(epochs_32.average().data, evoked_64.data, **tols)
+    # the precision of the raw data is used by default
+    epochs = Epochs(raw_32, events, event_id, tmin, tmax, picks=picks,
+                    preload=True, dtype=np.float64)
+    assert_equal(epochs.get_data().dtype, np.float64)
+    assert_equal(epochs_64.average().data.dtype, np.float64)
+    assert_raises(ValueError, Epochs, raw, events, event_id, tmin, tmax,
+                  dtype=np.int32)
+
+    # reading
+    epochs_fname = op.join(tempdir, 'test-epo.fif')
+    epochs_64.save(epochs_fname)
+    for preload in (True, False):
+        epochs_read = read_epochs(epochs_fname, preload=preload,
+                                  dtype=np.float32)
+        data_read = epochs_read.get_data()
+        assert_equal(data_read.dtype, np.float32)
+        assert_allclose(data_read, read_epochs(epochs_fname).get_data(),
+                        rtol=1e-6, atol=0)
+
+
+def test_epochs_from_preloaded_raw():
+    """Test getting all epochs at once from preloaded raw data"""
+    raw, events, picks = _get_data()
+    # events too close to the edges of the data and on a bad segment
+    events = np.concatenate([[[raw.first_samp + 10, 0, event_id]], events,
+                             [[raw.last_samp - 10, 0, event_id]]])
+    bad_idx = np.where(events[:, 2] == event_id)[0][2]
+    raw.annotations = Annotations([events[bad_idx][0] / raw.info['sfreq']],
+                                  [0.5], ['BAD_blink'])
+    raw_preload = raw.copy().load_data()
+    # concatenated data, with an epoch across the segments
+    raw_cat = concatenate_raws([raw_preload.copy(), raw_preload.copy()])
+    raw_cont = concatenate_raws([raw.copy(), raw.copy()])
+    events_cat = np.concatenate([events[1:-1], events[1:-1] + raw.n_times,
+                                 [[raw.last_samp - 50, 0, event_id]]])
+    events_cat = events_cat[np.argsort(events_cat[:, 0])]
+    for kwargs in (dict(), dict(detrend=1, decim=3),
+                   dict(baseline=None, proj='delayed', reject=reject),
+                   dict(proj=False, reject_by_annotation=False)):
+        epochs_want = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                             **kwargs)
+        data_want = epochs_want.get_data()
+        for preload in (True, False):
+            epochs = Epochs(raw_preload, events, event_id, tmin, tmax,
+                            picks=picks, preload=preload, **kwargs)
+            assert_allclose(epochs.get_data(), data_want, rtol=1e-7,
+                            atol=1e-20)
+            assert_equal(epochs.drop_log, epochs_want.drop_log)
+            assert_allclose(epochs.get_data(), data_want, rtol=1e-7,
+                            atol=1e-20)
+        if not kwargs:
+            assert_equal(epochs.drop_log[0], ['NO_DATA'])
+            assert_equal(epochs.drop_log[bad_idx], ['BAD_blink'])
+            assert_equal(epochs.drop_log[-1], ['TOO_SHORT'])
+        epochs_want = Epochs(raw_cont, events_cat, event_id, tmin, tmax,
+                             picks=picks, **kwargs)
+        epochs = Epochs(raw_cat, events_cat, event_id, tmin, tmax,
+                        picks=picks, **kwargs)
+        assert_allclose(epochs.get_data(), epochs_want.get_data(),
+                        rtol=1e-7, atol=1e-20)
+        assert_equal(epochs.drop_log, epochs_want.drop_log)
+
+
+def test_reject_all_at_once():
+    """Test rejecting epochs in memory all at once"""
+    raw, events, picks = _get_data()
+    raw_preload = raw.copy().load_data()
+    events = events[events[:, 2] == event_id]
+    reject_tight = dict(grad=500e-12, mag=2e-12, eeg=50e-6, eog=100e-6)
+    flat_tight = dict(grad=1e-10, eeg=5e-6)
+    for kwargs in (dict(reject=reject_tight), dict(flat=flat_tight),
+                   dict(reject=reject_tight, flat=flat, reject_tmin=0.,
+                        reject_tmax=0.2),
+                   dict(reject=reject_tight, proj='delayed', baseline=None)):
+        # per epoch, from disk
+        epochs_want = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                             **kwargs)
+        epochs_want.drop_bad()
+        assert_true(0 < len(epochs_want) < len(events))
+        for preload in (True, False):
+            epochs = Epochs(raw_preload, events, event_id, tmin, tmax,
+                            picks=picks, preload=preload, **kwargs)
+            epochs.drop_bad()
+            assert_equal(epochs.drop_log, epochs_want.drop_log)
+            assert_allclose(epochs.get_data(), epochs_want.get_data(),
+                            rtol=1e-7, atol=1e-20)
+        # against the per-epoch check
+        epochs = Epochs(raw_preload, events, event_id, tmin, tmax,
+                        picks=picks, preload=True,
+                        **dict(kwargs, reject=None, flat=None))
+        data = epochs.get_data()
+        epochs._reject_setup(kwargs.get('reject'), kwargs.get('flat'))
+        checks = epochs._is_good_epochs(data)
+        assert_equal(len(checks), len(data))
+        for epoch, check in zip(data, checks):
+            if epochs._do_delayed_proj:
+                epoch = epochs._project_epoch(epoch)
+            assert_equal(check, epochs._is_good_epoch(epoch))
+        # rejecting again with other thresholds
+        epochs.drop_bad(reject=kwargs.get('reject'), flat=kwargs.get('flat'))
+        assert_equal(epochs.drop_log, epochs_want.drop_log)
+
+
+def test_load_data_parallel():
+    """Test reading and processing epochs in parallel jobs"""
+    tempdir = _TempDir()
+    raw, events, picks = _get_data()
+    # some epochs are rejected or at the end of the data
+    events = np.concatenate([events, [[raw.last_samp - 10, 0, event_id]]])
+    kwargs = dict(picks=picks, reject=reject, flat=flat, decim=2)
+    epochs_want = Epochs(raw, events, event_id, tmin, tmax, preload=True,
+                         **kwargs)
+    assert_true(0 < len(epochs_want) < (events[:, 2] == event_id).sum())
+    for n_jobs in (2, 3):
+        epochs = Epochs(raw, events, event_id, tmin, tmax, preload=True,
+                        n_jobs=n_jobs, **kwargs)
+        assert_equal(epochs.drop_log, epochs_want.drop_log)
+        assert_array_equal(epochs.get_data(), epochs_want.get_data())
+        epochs = Epochs(raw, events, event_id, tmin, tmax, **kwargs)
+        epochs.load_data(n_jobs=n_jobs)
+        assert_equal(epochs.drop_log, epochs_want.drop_log)
+        assert_array_equal(epochs.get_data(), epochs_want.get_data())
+    # epochs read from a file on demand
+    epochs_fname = op.join(tempdir, 'test-epo.fif')
+    epochs_want.save(epochs_fname)
+    epochs = read_epochs(epochs_fname, preload=False)
+    pickle.loads(pickle.dumps(epochs._raw))  # opens the file again
+    epochs.load_data(n_jobs=2)
+    assert_array_equal(epochs.get_data(),
+                       read_epochs(epochs_fname).get_data())
+
+
+def test_preload_memmap():
+    """Test storing the data of epochs in a memory-mapped file"""
+    tempdir = _TempDir()
+    raw, events, picks = _get_data()
+    kwargs = dict(picks=picks, reject=reject, flat=flat)
+    epochs_want = Epochs(raw, events, event_id, tmin, tmax, preload=True,
+                         **kwargs)
+    data_fname = op.join(tempdir, 'epochs.dat')
+    epochs = Epochs(raw, events, event_id, tmin, tmax, preload=data_fname,
+                    **kwargs)
+    assert_true(isinstance(epochs._data, np.memmap))
+    assert_equal(epochs.drop_log, epochs_want.drop_log)
+    assert_array_equal(epochs.get_data(), epochs_want.get_data())
+    # averaging works blockwise on the file
+    assert_allclose(epochs.average().data, epochs_want.average().data)
+    assert_allclose(epochs.standard_error().data,
+                    epochs_want.standard_error().data)
+    # selections and copies get their own files
+    for select in (slice(None, None, 2), [0, 2, 3]):
+        epochs_sel = epochs[select]
+        assert_true(isinstance(epochs_sel._data, np.memmap))
+        assert_true(epochs_sel._data.filename != epochs._data.filename)
+        assert_array_equal(epochs_sel.get_data(),
+                           epochs_want[select].get_data())
+    epochs_copy = epochs.copy()
+    epochs_copy.drop([0, 3])
+    assert_true(isinstance(epochs_copy._data, np.memmap))
+    assert_array_equal(epochs_copy.get_data(),
+                       epochs_want.copy().drop([0, 3]).get_data())
+    assert_array_equal(epochs.get_data(), epochs_want.get_data())
+    copy_fname = epochs_copy._data_tempfile
+    assert_true(op.isfile(copy_fname))
+    assert_true(op.dirname(copy_fname) != tempdir)
+    del epochs_copy
+    assert_true(not op.isfile(copy_fname))
+    # picking channels loads the data in memory
+    ch_names = epochs.ch_names[:3]
+    epochs_pick = epochs.copy().pick_channels(ch_names)
+    epochs_pick_want = epochs_want.copy().pick_channels(ch_names)
+    assert_array_equal(epochs_pick.copy()[[0, 2]].get_data(),
+                       epochs_pick_want[[0, 2]].get_data())
+    # decimation and cropping keep the data on disk
+    epochs.decimate(2)
+    epochs.crop(0., 0.2)
+    assert_true(isinstance(epochs._data, np.memmap))
+    assert_array_equal(epochs.get_data(),
+                       epochs_want.decimate(2).crop(0., 0.2).get_data())
+    # epochs read from a file
+    epochs_fname = op.join(tempdir, 'test-epo.fif')
+    epochs_want.save(epochs_fname)
+    epochs_read = read_epochs(epochs_fname, preload=data_fname + '2')
+    assert_true(isinstance(epochs_read._data, np.memmap))
+    assert_array_equal(epochs_read.get_data(), epochs_want.get_data())
+    del epochs_read
+    assert_true(op.isfile(data_fname + '2'))  # the file given is kept
+    # memory maps given to EpochsArray are used as is
+    data = np.memmap(op.join(tempdir, 'array.dat'), mode='w+',
+                     shape=epochs_want._data.shape)
+    data[:] = epochs_want.get_data()
+    epochs_array = EpochsArray(data, epochs_want.info, epochs_want.events,
+                               tmin, epochs_want.event_id)
+    assert_true(isinstance(epochs_array._data, np.memmap))
+    assert_allclose(epochs_array.average().data, epochs_want.average().data)
+
+
+def test_read_epochs_on_demand():
+    """Test reading epochs from uncompressed and compressed files on demand"""
+    tempdir = _TempDir()
+    raw, events, picks = _get_data()
+    epochs = Epochs(raw, events, event_id, tmin, tmax, picks=picks,
+                    preload=True)
+    for ext, memmap in (('-epo.fif', True), ('-epo.fif.gz', False)):
+        epochs_fname = op.join(tempdir, 'test' + ext)
+        epochs.save(epochs_fname)
+        epochs_want = read_epochs(epochs_fname)
+        for dtype in (np.float64, np.float32):
+            epochs_read = read_epochs(epochs_fname, preload=False,
+                                      dtype=dtype)
+            assert_equal(isinstance(epochs_read._raw[0].data, np.memmap),
+                         memmap)
+            for idx in (0, 3, -1):
+                data = epochs_read[idx].get_data()
+                assert_equal(data.dtype, dtype)
+                assert_allclose(data, epochs_want[idx].get_data(),
+                                rtol=1e-6)
+            for epoch, epoch_want in zip(epochs_read, epochs_want):
+                assert_allclose(epoch, epoch_want, rtol=1e-6)
+            # the memory map is opened again in parallel jobs
+            raw_read = pickle.loads(pickle.dumps(epochs_read._raw[0]))
+            assert_equal(isinstance(raw_read.data, np.memmap), memmap)
+
+
+def test_average_by():
+    """Test averaging the epochs of all conditions at once"""
+    raw, events, picks = _get_data()
+    event_ids = {'a/x': 1, 'a/y': 2, 'b/x': 3, 'b/y': 4}
+    for preload in (True, False):
+        epochs = Epochs(raw, events, event_ids, tmin, tmax, picks=picks,
+                        reject=reject, preload=preload)
+        evokeds = epochs.average_by()
+        assert_equal(sorted(evokeds.keys()), sorted(event_ids.keys()))
+        evokeds, stderrs = epochs.average_by(['a', 'x', 'b/y'],
+                                             with_stderr=True)
+        for name in ('a', 'x', 'b/y'):
+            assert_equal(evokeds[name].comment, name)
+            assert_equal(evokeds[name].nave, len(epochs[name]))
+            assert_allclose(evokeds[name].data,
+                            epochs[name].average().data, rtol=1e-7)
+            assert_allclose(stderrs[name].data,
+                            epochs[name].standard_error().data, rtol=1e-5)
+        assert_raises(KeyError, epochs.average_by, ['c'])
+        assert_raises(KeyError, epochs.average_by, 'a/z')
+
+
 run_tests_if_main()
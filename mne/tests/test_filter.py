@@ -1,5 +1,7 @@
+import os
 import os.path as op
 import warnings
+from multiprocessing import cpu_count
 
 import numpy as np
 from numpy.testing import (assert_array_almost_equal, assert_almost_equal,
@@ -7,17 +9,21 @@ from numpy.testing import (assert_array_almost_equal, assert_almost_equal,
 from nose.tools import assert_equal, assert_true, assert_raises
 from scipy.signal import resample as sp_resample, butter
 
-from mne import create_info
+from mne import create_info, get_fft_backend, set_fft_backend
 from mne.io import RawArray, read_raw_fif
 from mne.filter import (band_pass_filter, high_pass_filter, low_pass_filter,
                         band_stop_filter, resample, _resample_stim_channels,
                         construct_iir_filter, notch_filter, detrend,
                         _overlap_add_filter, _smart_pad, design_mne_c_filter,
-                        estimate_ringing_samples, filter_data)
+                        estimate_ringing_samples, filter_data,
+                        StreamingFilter, filter_cache_info,
+                        clear_filter_cache, StreamingResampler,
+                        _get_up_down)
 
+from mne.fixes import get_filtfilt, get_sosfiltfilt, sosfilt
 from mne.utils import (sum_squared, run_tests_if_main, slow_test,
                        catch_logging, requires_version, _TempDir,
-                       requires_mne, run_subprocess)
+                       requires_mne, run_subprocess, check_version)
 
 warnings.simplefilter('always')  # enable b/c these tests throw warnings
 rng = np.random.RandomState(0)
@@ -138,6 +144,44 @@ def test_1d_filter():
                             assert_allclose(x_filtered, x_expected, atol=1e-13)
 
 
+def test_overlap_add_blocks():
+    """Test overlap-add filtering of blocks of channels in threads"""
+    import mne.filter
+    x = rng.randn(7, 3000)
+    h = rng.randn(101)
+    picks = [0, 2, 3, 6]
+    n_fft = 512
+    orig_size = mne.filter._MAX_FFT_BLOCK_SIZE
+    try:
+        for phase, n_times in (('zero', 3000), ('zero-double', 3000),
+                               ('linear', 3000), ('zero-double', 60)):
+            # direct convolution of the padded rows
+            n_edge = min(len(h), n_times) - 1
+            h_use = np.convolve(h, h[::-1]) if phase == 'zero-double' else h
+            shift = n_edge + ((len(h_use) - 1) // 2
+                              if phase.startswith('zero') else 0)
+            want = x[:, :n_times].copy()
+            for p in picks:
+                x_ext = _smart_pad(want[p], np.array([n_edge, n_edge]))
+                want[p] = np.convolve(x_ext, h_use)[shift:shift + n_times]
+            atol = np.abs(want).max()
+            # all rows and segments at once, the segments of one row in
+            # groups of 3 or 1, and one segment of one row at a time
+            for max_size in (orig_size, 3 * n_fft * 16, n_fft * 16, 1):
+                mne.filter._MAX_FFT_BLOCK_SIZE = max_size
+                for n_jobs in (1, 2):
+                    out = _overlap_add_filter(x[:, :n_times].copy(), h,
+                                              n_fft, phase, picks, n_jobs)
+                    assert_allclose(out, want, rtol=1e-10, atol=1e-10 * atol)
+                    out = _overlap_add_filter(
+                        x[:, :n_times].astype(np.float32), h, n_fft, phase,
+                        picks, n_jobs)
+                    assert_equal(out.dtype, np.float32)
+                    assert_allclose(out, want, rtol=1e-4, atol=1e-5 * atol)
+    finally:
+        mne.filter._MAX_FFT_BLOCK_SIZE = orig_size
+
+
 @requires_version('scipy', '0.16')
 def test_iir_stability():
     """Test IIR filter stability check"""
@@ -252,6 +296,64 @@ def test_resample():
     assert_array_equal(resample([0, 0], 2, 1), [0., 0., 0., 0.])
 
 
+def test_resample_polyphase():
+    """Test polyphase resampling, also of consecutive chunks"""
+    from scipy.signal import firwin
+    sfreq = 5000.
+    t = np.arange(int(2 * sfreq)) / sfreq
+    x = np.array([np.sin(2 * np.pi * 10 * t), np.cos(2 * np.pi * 35 * t)])
+    x += rng.randn(1, 1)
+    for new_sfreq in (500., 1280., 7500.):
+        x_rs = resample(x, new_sfreq, sfreq, method='polyphase')
+        assert_equal(x_rs.shape, (2, int(round(len(t) * new_sfreq / sfreq))))
+        t_rs = np.arange(x_rs.shape[1]) / new_sfreq
+        want = np.array([np.sin(2 * np.pi * 10 * t_rs),
+                         np.cos(2 * np.pi * 35 * t_rs) - 1]) + x[:, :1]
+        n_edge = int(0.05 * new_sfreq)  # the filters are shorter than this
+        assert_allclose(x_rs[:, n_edge:-n_edge], want[:, n_edge:-n_edge],
+                        atol=1e-3)
+        # the same along another axis and with parallel jobs
+        assert_allclose(resample(x.T, new_sfreq, sfreq, axis=0,
+                                 method='polyphase', n_jobs=2), x_rs.T)
+        # chunks of any size give the same result
+        resampler = StreamingResampler(new_sfreq, sfreq)
+        assert_true(resampler.delay > 0)
+        assert_raises(RuntimeError, resampler.flush)
+        bounds = np.unique(np.r_[0, rng.randint(0, len(t), 20), 1, 2,
+                                 len(t)])
+        out = [resampler.process(x[:, start:stop])
+               for start, stop in zip(bounds[:-1], bounds[1:])]
+        out.append(resampler.flush())
+        assert_allclose(np.concatenate(out, axis=1), x_rs, rtol=1e-12,
+                        atol=1e-12)
+        assert_equal(resampler.process(x[:, :0]).dtype, x.dtype)
+
+    # away from the edges, this is upfirdn with a Kaiser-windowed filter
+    up, down = 8, 125  # 1280 / 5000
+    h = firwin(20 * down + 1, 1. / down, window=('kaiser', 5.0)) * up
+    x_up = np.zeros((2, len(t) * up))
+    x_up[:, ::up] = x
+    want = np.array([np.convolve(x_, h)[len(h) // 2::down] for x_ in x_up])
+    x_rs = resample(x, up, down, method='polyphase')
+    assert_allclose(x_rs[:, 40:-40], want[:, 40:x_rs.shape[1] - 40],
+                    rtol=1e-10, atol=1e-10)
+
+    # short signals, float32 data, and no resampling
+    for n_times in (1, 2, 5):
+        x_short = x[:, :n_times].astype(np.float32)
+        x_rs = resample(x_short, 1, 2, method='polyphase')
+        assert_equal(x_rs.dtype, np.float32)
+        assert_equal(x_rs.shape, (2, int(round(n_times / 2.))))
+    assert_allclose(resample(x, 3, 3, method='polyphase'), x)
+    assert_raises(ValueError, resample, x, np.pi, 1, method='polyphase')
+    assert_equal(_get_up_down(256. / 1000.), (32, 125))
+    assert_equal(_get_up_down(np.float64(3)), (3, 1))
+    assert_raises(ValueError, resample, x, 1, 2, method='foo')
+    assert_raises(TypeError, StreamingResampler(1, 2).process,
+                  x.astype(int))
+    assert_raises(ValueError, StreamingResampler(1, 2).process, x[0])
+
+
 def test_resample_stim_channel():
     """Test resampling of stim channels"""
 
@@ -481,4 +583,149 @@ def test_detrend():
     assert_array_almost_equal(detrend(x, 0), np.zeros_like(x))
 
 
+def test_streaming_filter():
+    """Test filtering data in consecutive chunks"""
+    from scipy.signal import lfilter
+    sfreq = 500.
+    x = rng.randn(3, 5000)
+    chunks = np.cumsum([0, 1, 700, 3, 1500, 1000])  # last chunk until end
+    for l_freq, h_freq in ((None, 40.), (1., None), (1., 40.), (45., 55.)):
+        for phase in ('zero', 'zero-double', 'linear'):
+            kwargs = dict(l_freq=l_freq, h_freq=h_freq, phase=phase)
+            want = filter_data(x, sfreq, **kwargs)
+            for dtype in (np.float64, np.float32):
+                filt = StreamingFilter(sfreq, **kwargs)
+                out = [filt.process(x[:, start:stop].astype(dtype))
+                       for start, stop in zip(chunks, np.append(chunks[1:],
+                                                                x.shape[1]))]
+                out = np.concatenate(out + [filt.flush()], axis=1)
+                assert_equal(out.dtype, dtype)
+                assert_allclose(out, want, rtol=1e-5 if dtype == np.float32
+                                else 1e-7, atol=1e-6)
+    # signals shorter than the filter are filtered at once
+    filt = StreamingFilter(sfreq, None, 40.)
+    assert_equal(filt.process(x[:, :10]).shape, (3, 0))
+    assert_allclose(filt.flush(), filter_data(x[:, :10], sfreq, None, 40.))
+    # the delay of zero-phase filters is bounded
+    filt = StreamingFilter(sfreq, None, 40.)
+    out = filt.process(x)
+    assert_equal(out.shape[1], x.shape[1] - filt.delay)
+    assert_equal(filt.delay, (filt._stages[0].h.size - 1) // 2)
+    # causal IIR filters match filtering at once, zero-phase IIR filters are
+    # close to forward-backward filtering
+    for output in ('ba', 'sos'):
+        iir_params = dict(order=4, ftype='butter', output=output)
+        for phase in ('causal', 'zero'):
+            filt = StreamingFilter(sfreq, None, 40., method='iir',
+                                   iir_params=iir_params, phase=phase)
+            out = np.concatenate([filt.process(x[:, :1000]),
+                                  filt.process(x[:, 1000:]), filt.flush()],
+                                 axis=1)
+            design = filt._stages[0].filt
+            if phase == 'causal':
+                assert_equal(filt.delay, 0)
+                if output == 'ba':
+                    want = lfilter(design['b'], design['a'], x)
+                else:
+                    want = sosfilt(design['sos'], x)
+                assert_allclose(out, want, rtol=1e-7, atol=1e-10)
+            else:
+                assert_equal(filt.delay, design['padlen'])
+                if output == 'ba':
+                    want = get_filtfilt()(design['b'], design['a'], x,
+                                          padlen=design['padlen'])
+                else:
+                    want = get_sosfiltfilt()(design['sos'], x,
+                                             padlen=design['padlen'])
+                assert_allclose(out, want, atol=1e-2 * np.abs(want).max())
+                # the end of the data is filtered exactly
+                assert_allclose(out[:, -filt.delay:], want[:, -filt.delay:],
+                                rtol=1e-7, atol=1e-10)
+    assert_raises(ValueError, StreamingFilter, sfreq, 1., 40., phase='causal')
+    assert_raises(ValueError, StreamingFilter, sfreq, 1., 40., method='iir',
+                  phase='linear')
+    filt = StreamingFilter(sfreq, 1., 40.)
+    assert_raises(RuntimeError, filt.flush)
+    assert_raises(TypeError, filt.process, x.astype(int))
+
+
+def test_filter_cache():
+    """Test caching of designed FIR filters and their spectra"""
+    sfreq = 500.
+    x = rng.randn(2, 4000)
+    clear_filter_cache()
+    want = filter_data(x, sfreq, 5., 40.)
+    info = filter_cache_info()
+    assert_equal((info['hits'], info['misses'], info['n_entries']), (0, 2, 2))
+    assert_true(0 < info['size'] <= info['max_size'])
+    assert_array_equal(filter_data(x, sfreq, 5., 40.), want)
+    info = filter_cache_info()
+    assert_equal((info['hits'], info['misses']), (2, 2))
+    # other parameters or signal lengths use other entries
+    filter_data(x, sfreq, 5., 40., fir_window='hann')
+    filter_data(x[:, :2000], sfreq, 5., 40.)
+    info = filter_cache_info()
+    assert_equal((info['hits'], info['misses'], info['n_entries']), (3, 5, 5))
+    clear_filter_cache()
+    assert_equal(filter_cache_info()['n_entries'], 0)
+    # the size of the cache is bounded
+    orig_size = os.getenv('MNE_FILTER_CACHE_SIZE', None)
+    os.environ['MNE_FILTER_CACHE_SIZE'] = '0'
+    try:
+        clear_filter_cache()
+        assert_array_equal(filter_data(x, sfreq, 5., 40.), want)
+        info = filter_cache_info()
+        assert_equal((info['n_entries'], info['size'], info['max_size']),
+                     (0, 0, 0))
+    finally:
+        if orig_size is not None:
+            os.environ['MNE_FILTER_CACHE_SIZE'] = orig_size
+        else:
+            del os.environ['MNE_FILTER_CACHE_SIZE']
+        clear_filter_cache()
+
+
+def test_fft_backend():
+    """Test filtering and spectral transforms with the FFT backends"""
+    from mne.time_frequency import stft, cwt_morlet
+    from mne.time_frequency.multitaper import _mt_spectra, dpss_windows
+    from mne.time_frequency._stockwell import _precompute_st_windows, _st
+    sfreq = 500.
+    x = rng.randn(5, 2000)
+    dpss = dpss_windows(x.shape[1], 4., 7)[0]
+    windows = _precompute_st_windows(256, 1, 30, sfreq, 1.)
+
+    def _transforms():
+        clear_filter_cache()  # the spectra of the filters are cached
+        return [filter_data(x, sfreq, 5., 40.), resample(x, 3, 2),
+                stft(x, 64, verbose=False), cwt_morlet(x, sfreq, [10., 20.]),
+                _mt_spectra(x, dpss, sfreq)[0], _st(x[:, :256], 1, windows)]
+
+    orig_backend = get_fft_backend()
+    want = _transforms()
+    try:
+        for backend, workers in (('numpy', 1), ('numpy', 2), ('scipy', 3)):
+            set_fft_backend(backend, workers)
+            assert_equal(get_fft_backend(),
+                         dict(backend=backend, workers=workers,
+                              plan_cache=False))
+            for got, expected in zip(_transforms(), want):
+                assert_allclose(got, expected, rtol=1e-7, atol=1e-10)
+        if check_version('pyfftw', '0.9'):
+            set_fft_backend('pyfftw', 2, plan_cache=True)
+            assert_true(get_fft_backend()['plan_cache'])
+            for got, expected in zip(_transforms(), want):
+                assert_allclose(got, expected, rtol=1e-7, atol=1e-10)
+        else:
+            assert_raises(ImportError, set_fft_backend, 'pyfftw')
+        assert_raises(ValueError, set_fft_backend, 'foo')
+        assert_raises(ValueError, set_fft_backend, 'numpy', 'two')
+        assert_raises(ValueError, set_fft_backend, 'numpy', 0)
+        set_fft_backend('numpy', -1)  # independent of MNE_FORCE_SERIAL
+        assert_equal(get_fft_backend()['workers'], cpu_count())
+    finally:
+        set_fft_backend(**orig_backend)
+        clear_filter_cache()
+
+
 run_tests_if_main()
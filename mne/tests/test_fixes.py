@@ -12,7 +12,7 @@ from scipy import signal, sparse
 
 from mne.utils import run_tests_if_main
 from mne.fixes import (_in1d, _tril_indices, _copysign, _unravel_index,
-                       _Counter, _unique, _bincount, _digitize,
+                       _Counter, _OrderedDict, _unique, _bincount, _digitize,
                        _sparse_block_diag, _matrix_rank, _meshgrid,
                        _isclose,
                        _firwin2 as mne_firwin2,
@@ -39,6 +39,27 @@ def test_counter():
             assert_equal(a[key], c[key])
 
 
+def test_ordered_dict():
+    """Test OrderedDict replacement"""
+    d = _OrderedDict()
+    for key in (3, 1, 2):
+        d[key] = -key
+    d[3] = 3  # updating keeps the order
+    assert_equal(d.keys(), [3, 1, 2])
+    assert_equal(d.items(), [(3, 3), (1, -1), (2, -2)])
+    d[1] = d.pop(1)  # moved to the end
+    assert_equal(list(d), [3, 2, 1])
+    assert_equal(d.popitem(last=False), (3, 3))
+    assert_equal(d.popitem(), (1, -1))
+    assert_equal(d.pop(5, None), None)
+    del d[2]
+    assert_equal(len(d), 0)
+    assert_raises(KeyError, d.popitem)
+    d[4] = 4
+    d.clear()
+    assert_equal(d.keys(), [])
+
+
 def test_unique():
     """Test unique() replacement
     """
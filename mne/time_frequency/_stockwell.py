@@ -9,6 +9,7 @@ import numpy as np
 from scipy import fftpack
 # XXX explore cuda optimazation at some point.
 
+from ..cuda import _fft, _ifft
 from ..io.pick import pick_types, pick_info
 from ..utils import verbose, warn
 from ..parallel import parallel_func, check_n_jobs
@@ -54,7 +55,7 @@ def _precompute_st_windows(n_samp, start_f, stop_f, sfreq, width):
             window = ((f / (np.sqrt(2. * np.pi) * k)) *
                       np.exp(-0.5 * (1. / k ** 2.) * (f ** 2.) * tw ** 2.))
         window /= window.sum()  # normalisation
-        windows[i_f] = fftpack.fft(window)
+        windows[i_f] = _fft(window)
     return windows
 
 
@@ -63,11 +64,11 @@ def _st(x, start_f, windows):
     n_samp = x.shape[-1]
     ST = np.empty(x.shape[:-1] + (len(windows), n_samp), dtype=np.complex)
     # do the work
-    Fx = fftpack.fft(x)
+    Fx = _fft(x)
     XF = np.concatenate([Fx, Fx], axis=-1)
     for i_f, window in enumerate(windows):
         f = start_f + i_f
-        ST[..., i_f, :] = fftpack.ifft(XF[..., f:f + n_samp] * window)
+        ST[..., i_f, :] = _ifft(XF[..., f:f + n_samp] * window)
     return ST
 
 
@@ -78,11 +79,11 @@ def _st_power_itc(x, start_f, compute_itc, zero_pad, decim, W):
     n_out = n_out // decim + bool(n_out % decim)
     psd = np.empty((len(W), n_out))
     itc = np.empty_like(psd) if compute_itc else None
-    X = fftpack.fft(x)
+    X = _fft(x)
     XX = np.concatenate([X, X], axis=-1)
     for i_f, window in enumerate(W):
         f = start_f + i_f
-        ST = fftpack.ifft(XX[:, f:f + n_samp] * window)
+        ST = _ifft(XX[:, f:f + n_samp] * window)
         TFR = ST[:, :-zero_pad:decim]
         TFR_abs = np.abs(TFR)
         if compute_itc:
@@ -6,6 +6,7 @@
 import numpy as np
 from scipy import fftpack, linalg
 
+from ..cuda import _fft, _ifft
 from ..parallel import parallel_func
 from ..utils import sum_squared, warn
 
@@ -230,8 +231,8 @@ def dpss_windows(N, half_nbw, Kmax, low_bias=True, interp_from=None,
     # compute autocorr using FFT (same as nitime.utils.autocorr(dpss) * N)
     rxx_size = 2 * N - 1
     n_fft = 2 ** int(np.ceil(np.log2(rxx_size)))
-    dpss_fft = fftpack.fft(dpss, n_fft)
-    dpss_rxx = np.real(fftpack.ifft(dpss_fft * dpss_fft.conj()))
+    dpss_fft = _fft(dpss, n_fft)
+    dpss_rxx = np.real(_ifft(dpss_fft * dpss_fft.conj()))
     dpss_rxx = dpss_rxx[:, :N]
 
     r = 4 * W * np.sinc(2 * W * nidx)
@@ -449,8 +450,7 @@ def _mt_spectra(x, dpss, sfreq, n_fft=None):
     n_tapers = dpss.shape[0] if dpss.ndim > 1 else 1
     x_mt = np.zeros((len(x), n_tapers, freq_mask.sum()), dtype=np.complex128)
     for idx, sig in enumerate(x):
-        x_mt[idx] = fftpack.fft(sig[np.newaxis, :] * dpss,
-                                n=n_fft)[:, freq_mask]
+        x_mt[idx] = _fft(sig[np.newaxis, :] * dpss, n=n_fft)[:, freq_mask]
     return x_mt, freqs
 
 
@@ -1,7 +1,8 @@
 from math import ceil
 import numpy as np
-from scipy.fftpack import fft, ifft, fftfreq
+from scipy.fftpack import fftfreq
 
+from ..cuda import _fft, _ifft
 from ..utils import logger, verbose
 
 
@@ -96,7 +97,7 @@ def stft(x, wsize, tstep=None, verbose=None):
         wwin = win / swin[t * tstep: t * tstep + wsize]
         frame = x[:, t * tstep: t * tstep + wsize] * wwin[None, :]
         # FFT
-        fframe = fft(frame)
+        fframe = _fft(frame)
         X[:, :, t] = fframe[:, :n_freq]
 
     return X
@@ -174,7 +175,7 @@ def istft(X, tstep=None, Tx=None):
         # IFFT
         fframe[:, :n_win] = X[:, :, t]
         fframe[:, n_win:] = np.conj(X[:, wsize // 2 - 1: 0: -1, t])
-        frame = ifft(fframe)
+        frame = _ifft(fframe)
         wwin = win / swin[t * tstep:t * tstep + wsize]
         # Overlap-add
         x[:, t * tstep: t * tstep + wsize] += np.real(np.conj(frame) * wwin)
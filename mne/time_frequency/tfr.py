@@ -14,10 +14,10 @@ from math import sqrt
 
 import numpy as np
 from scipy import linalg
-from scipy.fftpack import fft, ifft
 
 from ..fixes import partial
 from ..baseline import rescale
+from ..cuda import _fft, _ifft
 from ..parallel import parallel_func
 from ..utils import (logger, verbose, _time_mask, check_fname, deprecated,
                      sizeof_fmt)
@@ -216,18 +216,18 @@ def _cwt(X, Ws, mode="same", decim=1, use_fft=True):
                              'signal. Use a longer signal or shorter '
                              'wavelets.')
         if use_fft:
-            fft_Ws[i] = fft(W, fsize)
+            fft_Ws[i] = _fft(W, fsize)
 
     # Make generator looping across signals
     tfr = np.zeros((n_freqs, n_times_out), dtype=np.complex128)
     for x in X:
         if use_fft:
-            fft_x = fft(x, fsize)
+            fft_x = _fft(x, fsize)
 
         # Loop across wavelets
         for ii, W in enumerate(Ws):
             if use_fft:
-                ret = ifft(fft_x * fft_Ws[ii])[:n_times + W.size - 1]
+                ret = _ifft(fft_x * fft_Ws[ii])[:n_times + W.size - 1]
             else:
                 ret = np.convolve(x, W, mode=mode)
 
@@ -381,6 +381,10 @@ def _compute_tfr(epoch_data, frequencies, sfreq=1.0, method='morlet',
         # avg_power_itc is stored as power + 1i * itc to keep a
         # simple dimensionality
         dtype = np.complex
+    if epoch_data.dtype in (np.float32, np.complex64):
+        # keep single precision data in single precision (the transforms
+        # and averages are computed in double precision)
+        dtype = np.float32 if dtype is np.float else np.complex64
 
     if ('avg_' in output) or ('itc' in output):
         out = np.empty((n_chans, n_freqs, n_times), dtype)
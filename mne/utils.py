@@ -182,6 +182,8 @@ def object_size(x):
             size += object_size(value)
     elif isinstance(x, (list, tuple)):
         size = sys.getsizeof(x) + sum(object_size(xx) for xx in x)
+    elif hasattr(x, '_segments'):  # data of concatenated raw instances
+        size = sys.getsizeof(x) + object_size(x._segments)
     else:
         raise RuntimeError('unsupported type: %s (%s)' % (type(x), x))
     return size
@@ -1256,6 +1258,10 @@ known_config_types = (
     'MNE_DATASETS_SPM_FACE_DATASETS_TESTS',
     'MNE_DATASETS_SPM_FACE_PATH',
     'MNE_DATASETS_TESTING_PATH',
+    'MNE_FFT_BACKEND',
+    'MNE_FFT_WORKERS',
+    'MNE_FIFF_DIR_CACHE',
+    'MNE_FILTER_CACHE_SIZE',
     'MNE_FORCE_SERIAL',
     'MNE_LOGGING_LEVEL',
     'MNE_MEMMAP_MIN_SIZE',
@@ -1762,7 +1768,8 @@ class SizeMixin(object):
             if not self.preload:
                 raise RuntimeError('Cannot hash %s unless data are loaded'
                                    % self.__class__.__name__)
-            return object_hash(dict(info=self.info, data=self._data))
+            return object_hash(dict(info=self.info,
+                                    data=np.asarray(self._data)))
         else:
             raise RuntimeError('Hashing unknown object type: %s' % type(self))
 
@@ -1843,6 +1850,27 @@ def _check_fname(fname, overwrite=False, must_exist=False):
             logger.info('Overwriting existing file.')
 
 
+def _check_float_dtype(dtype):
+    """Helper to check the dtype used to store data (None, float32, float64)
+    """
+    if dtype is None:
+        return dtype
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError('dtype must be None, np.float32 or np.float64, got '
+                         '%s' % dtype)
+    return dtype
+
+
+def _match_precision(dtype, like):
+    """Helper to get the (real or complex) dtype of like with the precision
+    of the float dtype"""
+    if np.dtype(like).kind == 'c':
+        return np.dtype(np.complex64 if dtype == np.float32 else
+                        np.complex128)
+    return np.dtype(dtype)
+
+
 def _check_subject(class_subject, input_subject, raise_error=True):
     """Helper to get subject name from class"""
     if input_subject is not None:
@@ -1873,6 +1901,16 @@ def _check_pandas_installed():
                            ' required.')
 
 
+def _check_h5py_installed():
+    """Aux function"""
+    try:
+        import h5py
+        return h5py
+    except ImportError:
+        raise ImportError('For this method to work the h5py library is '
+                          'required.')
+
+
 def _check_pandas_index_arguments(index, defaults):
     """ Helper function to check pandas index arguments """
     if not any(isinstance(index, k) for k in (list, tuple)):